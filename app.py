@@ -1,26 +1,28 @@
-from flask import Flask, render_template, request, g
+from flask import Flask, Response, render_template, request, g, jsonify, stream_with_context
 import os
 import sys
 import mysql.connector
 from mysql.connector import Error
 from dotenv import load_dotenv
 
+from db_config import DB_CONFIG
+from db_pool import ConnectionPool, PoolExhausted
+from page_cache import cached_page
+from pagination import decode_cursor, encode_cursor, ndjson_rows, page_size
+import static_assets
+import telemetry
+
 # ------------------------------
 # ENVIRONMENT VARIABLES
 # ------------------------------
-load_dotenv()
-
-DB_CONFIG = {
-    'host': os.getenv("DB_HOST", "localhost"),
-    'user': os.getenv("DB_USER", "root"),
-    'password': os.getenv("DB_PASS", ""),
-    'database': os.getenv("DB_NAME", "internsetu_db")
-}
+load_dotenv()  # DB_CONFIG itself comes from db_config.py
 
 # ------------------------------
 # FLASK APP
 # ------------------------------
 app = Flask(__name__, template_folder='frontend', static_folder='frontend/assets')
+telemetry.init_app(app)  # per-route timing, Server-Timing headers, X-Profile captures
+static_assets.init_app(app)  # fingerprinted, pre-compressed assets from `python static_assets.py`
 
 # ------------------------------
 # BACKEND + MODEL
@@ -28,16 +30,25 @@ app = Flask(__name__, template_folder='frontend', static_folder='frontend/assets
 sys.path.append(os.path.abspath('backend'))
 sys.path.append(os.path.abspath('.'))
 
-import model  # model.py must have companies, best_model, recommend_for_new_student, le_dept
+import model  # lazily loads the bundle written by `python train.py` (no training at import)
 
 # ------------------------------
 # DATABASE CONNECTION HELPERS
 # ------------------------------
+# One pool per worker process, created on first use (see db_pool.py for settings).
+_pool = None
+
+def get_pool():
+    global _pool
+    if _pool is None:
+        _pool = ConnectionPool.from_env(DB_CONFIG)
+    return _pool
+
 def get_db_connection():
     if 'db_conn' not in g:
         try:
-            g.db_conn = mysql.connector.connect(**DB_CONFIG)
-            g.db_cursor = g.db_conn.cursor(dictionary=True)
+            g.db_conn = get_pool().checkout()
+            g.db_cursor = telemetry.TimedCursor(g.db_conn.cursor(dictionary=True))
         except Error as e:
             print(f"Database connection error: {e}")
             g.db_conn, g.db_cursor = None, None
@@ -49,44 +60,80 @@ def close_db(exception):
     db_cursor = g.pop('db_cursor', None)
     if db_cursor:
         db_cursor.close()
-    if db_conn and db_conn.is_connected():
-        db_conn.close()
-        print("MySQL connection closed.")
+    if db_conn:
+        get_pool().checkin(db_conn)
+
+@app.errorhandler(PoolExhausted)
+def pool_exhausted(e):
+    # Every connection is busy: tell the client to back off instead of queueing forever.
+    return "Database is busy, please retry shortly.", 503, {"Retry-After": "1"}
 
 # ------------------------------
 # ROUTES
 # ------------------------------
 @app.route('/')
+@cached_page
 def index():
     return render_template('index.html')
 
 @app.route('/login', methods=['GET', 'POST'])
+@cached_page
 def login():
     return render_template('login.html')
 
-@app.route('/students')
-def students():
+def _list_page(table, pk, columns, template, context_name):
+    """Shared keyset-paginated listing + `?format=ndjson` full export."""
     conn, cursor = get_db_connection()
     if not conn or not cursor:
         return "Database connection not established."
+
+    if request.args.get('format') == 'ndjson':
+        # Separate unbuffered cursor: rows are streamed from the server, never
+        # held in worker memory all at once.
+        export_cursor = telemetry.TimedCursor(conn.cursor(dictionary=True, buffered=False))
+        export_cursor.execute(f"SELECT {columns} FROM {table} ORDER BY {pk};")
+
+        def generate():
+            try:
+                yield from ndjson_rows(export_cursor)
+            finally:
+                export_cursor.close()
+
+        return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+    try:
+        after_id = decode_cursor(request.args.get('cursor'))
+    except ValueError as e:
+        return str(e), 400
+    limit = page_size(request.args.get('limit'))
+
     try:
-        cursor.execute("SELECT student_id, name, email, cgpa, college_name, location, field, skills FROM students;")
-        students_list = cursor.fetchall()
-        return render_template('students.html', students=students_list)
+        cursor.execute(
+            f"SELECT {columns} FROM {table} WHERE {pk} > %s ORDER BY {pk} LIMIT %s;",
+            (after_id, limit + 1),
+        )
+        rows = cursor.fetchall()
     except Error as e:
-        return f"Error fetching students: {e}"
+        return f"Error fetching {table}: {e}"
+
+    next_cursor = encode_cursor(rows[limit - 1][pk]) if len(rows) > limit else None
+    return render_template(template, **{context_name: rows[:limit]}, next_cursor=next_cursor)
+
+@app.route('/students')
+def students():
+    return _list_page(
+        'students', 'student_id',
+        'student_id, name, email, cgpa, college_name, location, field, skills',
+        'students.html', 'students',
+    )
 
 @app.route('/internships')
 def internships():
-    conn, cursor = get_db_connection()
-    if not conn or not cursor:
-        return "Database connection not established."
-    try:
-        cursor.execute("SELECT internship_id, company_name, suggested_role, location, mode, min_cgpa, field, description, apply_link FROM internships;")
-        internships_list = cursor.fetchall()
-        return render_template('internships.html', internships=internships_list)
-    except Error as e:
-        return f"Error fetching internships: {e}"
+    return _list_page(
+        'internships', 'internship_id',
+        'internship_id, company_name, suggested_role, location, mode, min_cgpa, field, description, apply_link',
+        'internships.html', 'internships',
+    )
 
 @app.route('/recommendations/<int:student_id>')
 def recommendations(student_id):
@@ -128,10 +175,8 @@ def recommend():
                 "skills": skills
             }
 
-            # Call ML model (pass le_dept)
-            recommended_companies = model.recommend_for_new_student(
-                new_student, model.companies, model.best_model, model.le_dept
-            )
+            # Call ML model (direct, micro-batched or via the inference server; see RECOMMEND_SERVING)
+            recommended_companies = model.recommend(new_student)
 
             return render_template(
                 'profile.html',
@@ -139,6 +184,9 @@ def recommend():
                 student=new_student
             )
 
+        except FileNotFoundError as e:
+            # First run: no model bundle under artifacts/models yet.
+            return f"Recommendations are unavailable until a model is trained: {e}", 503
         except Exception as e:
             return f"Error in recommendation: {e}", 500
 
@@ -156,20 +204,36 @@ def dbtest():
     except Error as e:
         return f"Error executing query: {e}"
 
+@app.route('/dbpool')
+def dbpool():
+    return jsonify(get_pool().metrics())
+
+@app.route('/metrics')
+def metrics():
+    # Pool gauges only once a request has created the pool.
+    gauges = {}
+    if _pool is not None:
+        gauges = {f"db_pool_{k}": v for k, v in _pool.metrics().items()}
+    return Response(telemetry.registry.render(gauges), content_type=telemetry.CONTENT_TYPE)
+
 @app.route('/signup', methods=['GET', 'POST'])
+@cached_page
 def signup():
     return render_template('sign_up.html')
 
 @app.route('/alindex')
+@cached_page
 def alindex():
     return render_template('alindex.html')
 
 @app.route('/alprofile')
+@cached_page
 def alprofile():
     return render_template('alprofile.html')
 
 @app.route('/application')
 def application():
+    # Not @cached_page: this will list the student's own applications.
     # Example data (replace with database query results)
     applications = [
         {"role": "Web Development Intern", "company": "Growify", "status": "Applied"},
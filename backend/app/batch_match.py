@@ -0,0 +1,194 @@
+"""
+Bulk "match every student" job, for nightly refreshes and placement campaigns.
+
+    cd backend
+    python -m app.batch_match --workers 4 --chunk-size 500 --top-k 20
+    python -m app.batch_match --resume          # continue an interrupted run
+
+Students are read in id order, `chunk_size` at a time, and scored against the
+whole internship index in a process pool (same scoring as /match). Each
+chunk's top-k rows replace that chunk's old rows in `recommendations` in one
+transaction, so re-running a chunk is harmless. Progress is checkpointed to a
+small JSON file after every committed chunk.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Iterator, Optional
+
+from sqlalchemy import delete, insert, select
+
+from app import models
+from app.database import Base, SessionFactory, engine
+from app.internship_index import InternshipIndex
+from app.role_matching import ROLE_SCORER, RoleIndex, role_index
+
+DEFAULT_CHECKPOINT = Path("batch_match.checkpoint.json")
+
+# --- Worker side ----------------------------------------------------------------
+# Each worker process builds its own index once (in the initializer) and then
+# only receives compact student tuples.
+_worker_index: Optional[InternshipIndex] = None
+_worker_roles: Optional[RoleIndex] = None
+
+
+def _init_worker(internship_rows: list, role_index_path: Optional[Path]) -> None:
+    global _worker_index, _worker_roles
+    _worker_index = InternshipIndex.from_rows(internship_rows)
+    if role_index_path is not None:
+        _worker_roles = RoleIndex(role_index_path)
+
+
+def _match_chunk(student_rows: list[tuple], top_k: int) -> list[tuple[int, int, float]]:
+    """(student_id, internship_id, score) for the top_k matches of each student."""
+    index = _worker_index
+    similarities = None
+    if _worker_roles is not None:
+        # The whole chunk against every internship in one sparse product.
+        similarities = _worker_roles.aligned(
+            _worker_roles.similarity((skills, bio) for _, _, _, skills, bio in student_rows), index.ids
+        )
+    out = []
+    for row, (student_id, cgpa, location, skills, _bio) in enumerate(student_rows):
+        student = SimpleNamespace(cgpa=cgpa, location=location, skills=skills)
+        role_similarity = similarities[row] if similarities is not None else None
+        for score, pos in index.top_k(student, top_k, role_similarity=role_similarity):
+            out.append((student_id, int(index.ids[pos]), score))
+    return out
+
+
+# --- Checkpointing --------------------------------------------------------------
+
+def _load_checkpoint(path: Path) -> int:
+    if not path.exists():
+        return 0
+    return int(json.loads(path.read_text(encoding="utf-8")).get("last_student_id", 0))
+
+
+def _save_checkpoint(path: Path, last_student_id: int, stats: dict) -> None:
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_text(json.dumps({"last_student_id": last_student_id, **stats}), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+# --- Driver -----------------------------------------------------------------------
+
+def _student_chunks(after_id: int, chunk_size: int) -> Iterator[list[tuple]]:
+    """Keyset-paginate students by id, columns only."""
+    S = models.Student
+    last_id = after_id
+    while True:
+        with SessionFactory() as db:
+            rows = db.execute(
+                select(S.id, S.cgpa, S.location, S.skills, S.bio)
+                .where(S.id > last_id)
+                .order_by(S.id)
+                .limit(chunk_size)
+            ).all()
+        if not rows:
+            return
+        last_id = rows[-1][0]
+        yield [tuple(r) for r in rows]
+
+
+def _write_chunk(student_ids: list[int], matches: list[tuple[int, int, float]]) -> None:
+    R = models.Recommendation
+    with SessionFactory() as db, db.begin():
+        db.execute(delete(R).where(R.student_id.in_(student_ids)))
+        if matches:
+            db.execute(
+                insert(R),
+                [
+                    {"student_id": s, "internship_id": i, "score": score, "reason": f"batch match score {score:.4f}"}
+                    for s, i, score in matches
+                ],
+            )
+
+
+def run(
+    workers: int = os.cpu_count() or 1,
+    chunk_size: int = 500,
+    top_k: int = 20,
+    checkpoint: Path = DEFAULT_CHECKPOINT,
+    resume: bool = False,
+) -> dict:
+    Base.metadata.create_all(bind=engine)
+
+    with SessionFactory() as db:
+        internship_rows = [tuple(r) for r in InternshipIndex.fetch_rows(db)]
+        role_index_path = None
+        if ROLE_SCORER == "tfidf":
+            # Workers load the persisted vectorizer + matrix instead of refitting.
+            role_index.ensure_fresh(db)
+            role_index_path = role_index.path
+    n_internships = len(internship_rows)
+
+    start_after = _load_checkpoint(checkpoint) if resume else 0
+    if start_after:
+        print(f"Resuming after student id {start_after}")
+
+    stats = {"students": 0, "pairs": 0, "rows_written": 0}
+    started = time.perf_counter()
+
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(internship_rows, role_index_path)
+    ) as pool:
+        # Keep a bounded number of chunks in flight and commit them in id order,
+        # so the checkpoint always marks a fully written prefix.
+        in_flight = []
+        chunks = _student_chunks(start_after, chunk_size)
+
+        def submit_next() -> bool:
+            chunk = next(chunks, None)
+            if chunk is None:
+                return False
+            in_flight.append((chunk, pool.submit(_match_chunk, chunk, top_k)))
+            return True
+
+        for _ in range(workers * 2):
+            if not submit_next():
+                break
+
+        while in_flight:
+            chunk, future = in_flight.pop(0)
+            matches = future.result()
+            student_ids = [row[0] for row in chunk]
+            _write_chunk(student_ids, matches)
+
+            stats["students"] += len(chunk)
+            stats["pairs"] += len(chunk) * n_internships
+            stats["rows_written"] += len(matches)
+            elapsed = time.perf_counter() - started
+            stats["pairs_per_sec"] = round(stats["pairs"] / elapsed, 1) if elapsed else 0.0
+            _save_checkpoint(checkpoint, student_ids[-1], stats)
+            print(
+                f"students={stats['students']} pairs={stats['pairs']} "
+                f"rows={stats['rows_written']} {stats['pairs_per_sec']:.0f} pairs/sec"
+            )
+            submit_next()
+
+    stats["elapsed_sec"] = round(time.perf_counter() - started, 3)
+    return stats
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Match every student against every internship.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk-size", type=int, default=500, help="students per task")
+    parser.add_argument("--top-k", type=int, default=20, help="recommendations kept per student")
+    parser.add_argument("--checkpoint", type=Path, default=DEFAULT_CHECKPOINT)
+    parser.add_argument("--resume", action="store_true", help="continue after the last checkpoint")
+    args = parser.parse_args(argv)
+
+    stats = run(args.workers, args.chunk_size, args.top_k, args.checkpoint, args.resume)
+    print(json.dumps(stats, indent=2))
+
+
+if __name__ == "__main__":
+    main()
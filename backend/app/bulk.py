@@ -0,0 +1,326 @@
+from __future__ import annotations
+
+import codecs
+import csv
+import json
+import os
+import secrets
+from collections import deque
+from typing import AsyncIterator, Callable, Optional, Type
+
+from fastapi import HTTPException, Request
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+
+from app import models, schemas
+from app.internship_index import internship_index
+from app.match_cache import match_cache
+from app.role_matching import role_index
+from app.skills import link_students
+from app.student_records import DUPLICATE_EMAIL, new_student
+
+# --- Bulk ingestion ---------------------------------------------------------------
+# Bodies are read incrementally (JSON array, NDJSON or CSV), validated row by
+# row against the normal Create schemas, and written BATCH_SIZE rows per
+# transaction with one executemany INSERT. Bad rows are reported, not fatal.
+BATCH_SIZE = 1000
+MAX_REPORTED_ERRORS = 1000
+
+# CSV headers from the dataset exports -> API field names.
+STUDENT_ALIASES = {"name": "full_name", "degree": "qualification", "college_name": "college"}
+INTERNSHIP_ALIASES = {"company": "company_name", "departments": "field", "role": "suggested_role"}
+
+# --- Profiles (?profile=api|dataset) --------------------------------------------------
+# "api" (default) expects every required field of the Create schema. "dataset"
+# loads the shipped `student dataset.csv` / `company dataset.csv` as they are,
+# filling in what those files don't have:
+#   students     full_name <- student_id, email <- <student_id>@BULK_DATASET_EMAIL_DOMAIN,
+#                a random password (the account needs a reset before anyone can
+#                log in), empty college and location
+#   internships  suggested_role <- skills_required as words, description <-
+#                skills_required, empty location and program
+# A CSV whose header still lacks a required field is refused up front with one
+# 422 that names the missing columns.
+DATASET_EMAIL_DOMAIN = os.getenv("BULK_DATASET_EMAIL_DOMAIN", "students.example.org")
+
+
+class RowProfile:
+    """Header aliases plus per-field fallbacks, applied to each raw row before validation."""
+
+    def __init__(self, schema: Type[BaseModel], aliases: dict[str, str],
+                 fallbacks: Optional[dict[str, Callable[[dict], object]]] = None):
+        self.schema = schema
+        self.aliases = aliases
+        self.fallbacks = fallbacks or {}
+
+    def missing_columns(self, header: list[str]) -> list[str]:
+        """Required fields that neither the header nor a fallback provides."""
+        return [
+            name for name, field in self.schema.model_fields.items()
+            if field.is_required() and name not in header and name not in self.fallbacks
+        ]
+
+    def apply(self, raw: dict) -> dict:
+        row = {self.aliases.get(key, key): value for key, value in raw.items()}
+        for name, fallback in self.fallbacks.items():
+            if name not in row:
+                row[name] = fallback(row)
+        return row
+
+
+def _dataset_student_id(row: dict) -> str:
+    return str(row.get("student_id") or "").strip()
+
+
+def _skill_words(row: dict) -> str:
+    return " ".join(s.strip() for s in str(row.get("skills_required") or "").split(",") if s.strip())
+
+
+STUDENT_PROFILES = {
+    "api": RowProfile(schemas.StudentCreate, STUDENT_ALIASES),
+    "dataset": RowProfile(schemas.StudentCreate, STUDENT_ALIASES, {
+        "full_name": _dataset_student_id,
+        "email": lambda row: f"{_dataset_student_id(row).lower()}@{DATASET_EMAIL_DOMAIN}",
+        "password": lambda row: secrets.token_urlsafe(12),
+        "college": lambda row: "",
+        "location": lambda row: "",
+    }),
+}
+INTERNSHIP_PROFILES = {
+    "api": RowProfile(schemas.InternshipCreate, INTERNSHIP_ALIASES),
+    "dataset": RowProfile(schemas.InternshipCreate, INTERNSHIP_ALIASES, {
+        "suggested_role": _skill_words,
+        "description": lambda row: row.get("skills_required") or None,
+        "location": lambda row: "",
+        "program": lambda row: "",
+    }),
+}
+PROFILE_PATTERN = "^(api|dataset)$"
+
+
+class BulkReport:
+    def __init__(self) -> None:
+        self.received = 0
+        self.inserted = 0
+        self.failed = 0
+        self.errors: list[dict] = []
+
+    def error(self, row: int, detail, line: Optional[int] = None) -> None:
+        """`row` counts records; `line` is where the record starts in a CSV/NDJSON body."""
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            entry = {"row": row, "detail": detail}
+            if line is not None:
+                entry["line"] = line
+            self.errors.append(entry)
+
+    def as_dict(self) -> dict:
+        return {
+            "received": self.received,
+            "inserted": self.inserted,
+            "failed": self.failed,
+            "errors": sorted(self.errors, key=lambda e: e["row"]),
+            "errors_truncated": self.failed > len(self.errors),
+        }
+
+
+# --- Body parsing -----------------------------------------------------------------
+
+async def _lines(request: Request) -> AsyncIterator[str]:
+    """Body lines as they arrive (the dataset CSVs start with a BOM)."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    buffer = ""
+    async for chunk in request.stream():
+        buffer += decoder.decode(chunk)
+        *lines, buffer = buffer.split("\n")
+        for line in lines:
+            yield line.rstrip("\r")
+    buffer += decoder.decode(b"", final=True)
+    if buffer:
+        yield buffer.rstrip("\r")
+
+
+class _LineFeed:
+    """
+    Lines handed to one csv.reader as they stream in. The reader only pulls
+    once a whole record is buffered (the quotes balance), so a quoted field
+    spanning several lines comes back as one record.
+    """
+
+    def __init__(self) -> None:
+        self.lines: deque[str] = deque()
+        self.quotes = 0
+
+    def push(self, line: str) -> None:
+        self.lines.append(line + "\n")
+        self.quotes += line.count('"')
+
+    @property
+    def complete(self) -> bool:
+        return bool(self.lines) and self.quotes % 2 == 0
+
+    def __iter__(self) -> "_LineFeed":
+        return self
+
+    def __next__(self) -> str:
+        if not self.lines:
+            raise StopIteration
+        return self.lines.popleft()
+
+
+async def _csv_records(request: Request) -> AsyncIterator[tuple[int, list[str] | Exception]]:
+    """(first line number, values or the parse error) per non-blank CSV record."""
+    feed = _LineFeed()
+    reader = csv.reader(feed)
+
+    def take() -> tuple[int, list[str] | Exception]:
+        start = reader.line_num + 1
+        try:
+            values = next(reader)
+        except csv.Error as e:
+            values = e
+        feed.lines.clear()
+        feed.quotes = 0
+        return start, values
+
+    async for line in _lines(request):
+        feed.push(line)
+        if feed.complete:
+            start, values = take()
+            if values:
+                yield start, values
+    if feed.lines:  # unterminated quote at the end of the body
+        start, values = take()
+        yield start, values if values else csv.Error("unexpected end of data")
+
+
+async def iter_rows(request: Request, profile: RowProfile) -> AsyncIterator[tuple[Optional[int], dict | Exception]]:
+    """
+    Yield (source line, raw row dict or the parse error for that row) from any
+    supported body; the line is None for a JSON array.
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+
+    if content_type in ("application/x-ndjson", "application/jsonl", "application/ndjson"):
+        line_no = 0
+        async for line in _lines(request):
+            line_no += 1
+            if line.strip():
+                try:
+                    yield line_no, json.loads(line)
+                except json.JSONDecodeError as e:
+                    yield line_no, e
+    elif content_type in ("text/csv", "application/csv"):
+        header: Optional[list[str]] = None
+        async for line_no, values in _csv_records(request):
+            if header is None:
+                if isinstance(values, Exception):
+                    raise HTTPException(status_code=400, detail=f"Unparseable CSV header: {values}")
+                header = [profile.aliases.get(h.strip(), h.strip()) for h in values]
+                missing = profile.missing_columns(header)
+                if missing:
+                    raise HTTPException(
+                        status_code=422,
+                        detail={"missing_columns": missing, "header": header,
+                                "hint": "Add the columns, or send ?profile=dataset for the dataset CSVs."},
+                    )
+                continue
+            yield line_no, values if isinstance(values, Exception) else dict(zip(header, values))
+    elif content_type in ("application/json", ""):
+        try:
+            payload = json.loads(await request.body())
+        except json.JSONDecodeError as e:
+            raise HTTPException(status_code=400, detail=f"Invalid JSON: {e}")
+        if not isinstance(payload, list):
+            raise HTTPException(status_code=400, detail="Expected a JSON array of rows.")
+        for item in payload:
+            yield None, item
+    else:
+        raise HTTPException(
+            status_code=415,
+            detail="Send application/json (array), application/x-ndjson or text/csv.",
+        )
+
+
+async def validated_batches(
+    request: Request, profile: RowProfile, report: BulkReport
+) -> AsyncIterator[list[tuple[int, BaseModel]]]:
+    """Group valid rows into (row_number, model) batches; record invalid ones."""
+    batch: list[tuple[int, BaseModel]] = []
+    async for line, raw in iter_rows(request, profile):
+        report.received += 1
+        row_no = report.received
+        if isinstance(raw, Exception):
+            report.error(row_no, f"Unparseable row: {raw}", line)
+            continue
+        if not isinstance(raw, dict):
+            report.error(row_no, "Row must be an object.", line)
+            continue
+        try:
+            batch.append((row_no, profile.schema.model_validate(profile.apply(raw))))
+        except ValidationError as e:
+            report.error(row_no, e.errors(include_url=False, include_context=False, include_input=False), line)
+        if len(batch) >= BATCH_SIZE:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+# --- Batch writers (sync; run them in a thread or through AsyncSession.run_sync) -----
+
+def insert_students(db: Session, batch: list[tuple[int, schemas.StudentCreate]], seen: set[str], report: BulkReport) -> None:
+    """Dedupe against the request so far and the DB (one IN query), then one INSERT."""
+    candidates = []
+    for row_no, data in batch:
+        student = new_student(data)
+        if student.email in seen:
+            report.error(row_no, DUPLICATE_EMAIL)
+            continue
+        seen.add(student.email)
+        candidates.append((row_no, student))
+
+    emails = [s.email for _, s in candidates]
+    existing = set(db.scalars(select(models.Student.email).where(models.Student.email.in_(emails)))) if emails else set()
+
+    rows = []
+    for row_no, student in candidates:
+        if student.email in existing:
+            report.error(row_no, DUPLICATE_EMAIL)
+        else:
+            rows.append(_columns(student, models.Student))
+    if rows:
+        new_ids = _insert_returning_ids(db, rows)
+        link_students(db, zip(new_ids, (row["skills"] for row in rows)))
+        db.commit()
+        report.inserted += len(rows)
+        match_cache.students_changed(new_ids)
+
+
+def insert_internships(db: Session, batch: list[tuple[int, schemas.InternshipCreate]], report: BulkReport) -> None:
+    rows = [data.model_dump() for _, data in batch]
+    if rows:
+        db.execute(insert(models.Internship), rows)
+        db.commit()
+        report.inserted += len(rows)
+        # Core inserts skip the ORM events the index listens to.
+        internship_index.mark_dirty()
+        role_index.mark_dirty()
+        match_cache.catalog_changed()
+
+
+def _insert_returning_ids(db: Session, rows: list[dict]) -> list[int]:
+    """Insert student rows; their new ids, in row order."""
+    St = models.Student
+    if db.get_bind().dialect.insert_executemany_returning_sort_by_parameter_order:
+        return db.scalars(insert(St).returning(St.id, sort_by_parameter_order=True), rows).all()
+    # No ordered RETURNING (e.g. MySQL): emails are unique, so look the ids up by email.
+    db.execute(insert(St), rows)
+    emails = [row["email"] for row in rows]
+    by_email = dict(db.execute(select(St.email, St.id).where(St.email.in_(emails))).all())
+    return [by_email[email] for email in emails]
+
+
+def _columns(obj, model) -> dict:
+    return {c.key: getattr(obj, c.key) for c in model.__table__.columns if c.key != "id"}
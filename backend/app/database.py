@@ -2,26 +2,100 @@ from __future__ import annotations
 
 import os
 from pathlib import Path
-from typing import Iterator
+from typing import TYPE_CHECKING, AsyncIterator, Iterator
 
-from sqlalchemy import create_engine
+from sqlalchemy import Engine, create_engine, event
+from sqlalchemy.pool import QueuePool
 from sqlalchemy.orm import Session as OrmSession
 from sqlalchemy.orm import sessionmaker, registry
 
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
 # --- Database target ---------------------------------------------------------
 # You can override this with the env var APP_DATABASE_URL when deploying.
 DB_FILE = Path("app.db")
 DATABASE_URL = os.getenv("APP_DATABASE_URL", f"sqlite:///{DB_FILE.as_posix()}")
 
+# --- SQLite tuning profile ----------------------------------------------------
+# Single-node deployments run on SQLite, so by default every connection gets a
+# production profile: WAL (readers don't block the writer), synchronous=NORMAL
+# (safe with WAL, far fewer fsyncs), a bigger page cache + mmap, in-memory temp
+# tables, and a busy timeout so concurrent writers wait instead of failing.
+# APP_SQLITE_PROFILE=default turns all of this off.
+SQLITE_PROFILE = os.getenv("APP_SQLITE_PROFILE", "tuned").lower()
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "mmap_size": int(os.getenv("APP_SQLITE_MMAP_SIZE", str(256 * 1024 * 1024))),
+    "cache_size": int(os.getenv("APP_SQLITE_CACHE_SIZE", "-65536")),  # negative = KiB, so 64 MiB
+    "busy_timeout": int(os.getenv("APP_SQLITE_BUSY_TIMEOUT_MS", "5000")),
+    "temp_store": "MEMORY",
+}
+
+# Sized to FastAPI's default threadpool (40 threads) so sync routes never
+# wait on the pool itself.
+POOL_SIZE = int(os.getenv("APP_DB_POOL_SIZE", "20"))
+POOL_OVERFLOW = int(os.getenv("APP_DB_POOL_OVERFLOW", "20"))
+
+
+def _sqlite_connect_hook(read_only: bool):
+    def apply(dbapi_conn, _record) -> None:
+        cursor = dbapi_conn.cursor()
+        for name, value in SQLITE_PRAGMAS.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        if read_only:
+            cursor.execute("PRAGMA query_only=ON")
+        cursor.close()
+    return apply
+
+
+def _query_only_hook(dbapi_conn, _record) -> None:
+    dbapi_conn.execute("PRAGMA query_only=ON")
+
+
+def make_engine(url: str, *, tuned: bool | None = None, read_only: bool = False) -> Engine:
+    """Build an engine for `url`; SQLite file URLs get the tuned profile unless `tuned=False`."""
+    sqlite = url.startswith("sqlite")
+    in_memory = sqlite and (url.endswith(":memory:") or url.rstrip("/") == "sqlite:")
+    kwargs = {}
+    if sqlite and not in_memory:
+        kwargs.update(poolclass=QueuePool, pool_size=POOL_SIZE, max_overflow=POOL_OVERFLOW)
+    elif not sqlite:
+        kwargs.update(pool_size=POOL_SIZE, max_overflow=POOL_OVERFLOW, pool_pre_ping=True)
+
+    new_engine = create_engine(
+        url,
+        future=True,
+        echo=False,  # flip to True if you want to see SQL logs while debugging
+        # SQLite needs a special flag for multi-threaded apps; other backends don't.
+        connect_args={"check_same_thread": False} if sqlite else {},
+        **kwargs,
+    )
+    if tuned is None:
+        tuned = SQLITE_PROFILE == "tuned"
+    if sqlite and not in_memory and (tuned or read_only):
+        hook = _sqlite_connect_hook(read_only) if tuned else _query_only_hook
+        event.listen(new_engine, "connect", hook)
+    return new_engine
+
+
 # --- Engine ------------------------------------------------------------------
-# SQLite needs a special flag for multi-threaded apps; other backends don't.
 is_sqlite = DATABASE_URL.startswith("sqlite")
-engine = create_engine(
-    DATABASE_URL,
-    future=True,
-    echo=False,  # flip to True if you want to see SQL logs while debugging
-    connect_args={"check_same_thread": False} if is_sqlite else {},
-)
+engine = make_engine(DATABASE_URL)
+
+# --- Read replica (optional) ---------------------------------------------------
+# GET routes use get_read_session. By default that is the primary engine.
+# APP_READ_DATABASE_URL points it at a replica. For SQLite, APP_SQLITE_READ_POOL=1
+# gives reads their own query_only pool on the same file, so they never wait
+# behind writers for a connection.
+READ_DATABASE_URL = os.getenv("APP_READ_DATABASE_URL")
+if READ_DATABASE_URL:
+    read_engine = make_engine(READ_DATABASE_URL, read_only=True)
+elif is_sqlite and os.getenv("APP_SQLITE_READ_POOL", "0") == "1":
+    read_engine = make_engine(DATABASE_URL, read_only=True)
+else:
+    read_engine = engine
 
 # --- Session factory ----------------------------------------------------------
 # expire_on_commit=False keeps loaded attributes available after commit.
@@ -31,12 +105,76 @@ SessionFactory = sessionmaker(
     autoflush=False,
     expire_on_commit=False,
 )
+ReadSessionFactory = sessionmaker(
+    bind=read_engine,
+    autocommit=False,
+    autoflush=False,
+    expire_on_commit=False,
+) if read_engine is not engine else SessionFactory
 
 # --- Declarative base ---------------------------------------------------------
 # Using the registry() path makes this feel less like cookie-cutter code.
 _mapper_registry = registry()
 Base = _mapper_registry.generate_base()
 
+
+
+def add_missing_columns(bind: Engine) -> list[str]:
+    """
+    create_all() never alters existing tables; add any nullable columns the
+    models gained since the database file was created. Returns what it added.
+    """
+    from sqlalchemy import inspect
+    from sqlalchemy.schema import CreateColumn
+
+    inspector = inspect(bind)
+    added = []
+    with bind.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {c["name"] for c in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in existing and column.nullable:
+                    ddl = CreateColumn(column).compile(dialect=bind.dialect)
+                    conn.exec_driver_sql(f"ALTER TABLE {table.name} ADD COLUMN {ddl}")
+                    added.append(f"{table.name}.{column.name}")
+    return added
+
+# --- Async engine (optional) ----------------------------------------------------
+# APP_DB_MODE=async serves the API from async routers on an async engine, so
+# requests stop queueing behind FastAPI's threadpool. The async URL is derived
+# from APP_DATABASE_URL (sqlite -> aiosqlite, mysql -> asyncmy) unless
+# APP_ASYNC_DATABASE_URL is set. The sync engine above stays for scripts.
+DB_MODE = os.getenv("APP_DB_MODE", "sync").lower()
+if DB_MODE not in ("sync", "async"):
+    raise ValueError(f"APP_DB_MODE must be 'sync' or 'async', not {DB_MODE!r}.")
+
+
+def to_async_url(url: str) -> str:
+    scheme, sep, rest = url.partition("://")
+    driver_free = scheme.split("+", 1)[0]
+    async_drivers = {"sqlite": "sqlite+aiosqlite", "mysql": "mysql+asyncmy", "postgresql": "postgresql+asyncpg"}
+    return f"{async_drivers.get(driver_free, scheme)}{sep}{rest}"
+
+
+ASYNC_DATABASE_URL = os.getenv("APP_ASYNC_DATABASE_URL", to_async_url(DATABASE_URL))
+
+async_engine = None
+AsyncSessionFactory = None
+if DB_MODE == "async":
+    # Imported here so the sync mode doesn't need an async driver installed.
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    async_engine = create_async_engine(ASYNC_DATABASE_URL, echo=False)
+    if ASYNC_DATABASE_URL.startswith("sqlite") and SQLITE_PROFILE == "tuned":
+        event.listen(async_engine.sync_engine, "connect", _sqlite_connect_hook(read_only=False))
+    AsyncSessionFactory = async_sessionmaker(
+        bind=async_engine,
+        autoflush=False,
+        expire_on_commit=False,
+    )
+
 # --- Session provider (FastAPI-friendly) -------------------------------------
 def get_session() -> Iterator[OrmSession]:
     """
@@ -51,4 +189,35 @@ def get_session() -> Iterator[OrmSession]:
     finally:
         session.close()
 
-__all__ = ["engine", "SessionFactory", "Base", "get_session"]
+# The routers import this name.
+get_db = get_session
+
+
+def get_read_session() -> Iterator[OrmSession]:
+    """Like get_session, but bound to the read engine (replica / query_only pool)."""
+    session = ReadSessionFactory()
+    try:
+        yield session
+    finally:
+        session.close()
+
+get_read_db = get_read_session
+
+
+async def get_async_session() -> AsyncIterator["AsyncSession"]:
+    """
+    Async counterpart of get_session (only available with APP_DB_MODE=async).
+    Usage (FastAPI):
+        @app.get("/items")
+        async def route(db: AsyncSession = Depends(get_async_session)): ...
+    """
+    if AsyncSessionFactory is None:
+        raise RuntimeError("Async sessions need APP_DB_MODE=async.")
+    async with AsyncSessionFactory() as session:
+        yield session
+
+__all__ = [
+    "engine", "SessionFactory", "Base", "add_missing_columns", "get_session", "get_db",
+    "make_engine", "read_engine", "ReadSessionFactory", "get_read_session", "get_read_db",
+    "DB_MODE", "async_engine", "AsyncSessionFactory", "get_async_session",
+]
@@ -0,0 +1,297 @@
+from __future__ import annotations
+
+import heapq
+import os
+import threading
+import time
+from typing import TYPE_CHECKING, Optional
+
+import numpy as np
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import Select, event, select
+from sqlalchemy.orm import Session as OrmSession, object_session
+
+from app import models
+from app.telemetry import span
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+# --- Settings -----------------------------------------------------------------
+# Writes made through this process mark the index dirty immediately (see the
+# mapper events at the bottom). The TTL only bounds how long another worker's
+# writes can go unseen.
+INDEX_TTL_SECONDS = float(os.getenv("INTERNSHIP_INDEX_TTL", "60"))
+# How many eligible internships are scored per vectorized step in top_k().
+MATCH_CHUNK_SIZE = int(os.getenv("MATCH_CHUNK_SIZE", "4096"))
+
+
+def normalize_key(value: Optional[str]) -> str:
+    """Locations and fields compare trimmed and case-folded."""
+    return (value or "").strip().lower()
+
+
+def role_tokens(role: Optional[str]) -> frozenset[str]:
+    return frozenset(t.lower() for t in (role or "").split() if t)
+
+
+class InternshipIndex:
+    """
+    Column-oriented, pre-normalized snapshot of the internships table.
+
+    Location and field are interned into small integer codes, role words live
+    in a token -> positions posting list, and the payload needed for the
+    response is kept as plain dicts, so matching never hydrates ORM rows.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._dirty = True
+        self._generation = 0  # bumped by every mark_dirty()
+        self._built_at = 0.0
+        self.version = 0
+        self.catalog_version: Optional[int] = None
+        self._load([])
+
+    # --- Build / refresh -------------------------------------------------------
+
+    def _load(self, rows) -> None:
+        n = len(rows)
+        location_codes: dict[str, int] = {}
+        field_codes: dict[str, int] = {}
+        postings: dict[str, list[int]] = {}
+
+        ids = np.empty(n, dtype=np.int64)
+        min_cgpa = np.empty(n, dtype=np.float64)
+        location = np.empty(n, dtype=np.int32)
+        field = np.empty(n, dtype=np.int32)
+        role_token_count = np.empty(n, dtype=np.int32)
+        records = []
+
+        # Rows are (id, company_name, suggested_role, location, min_cgpa, field,
+        # program, description); see fetch_rows().
+        for pos, (job_id, company_name, role, loc, job_min_cgpa, job_field, program, description) in enumerate(rows):
+            ids[pos] = job_id
+            min_cgpa[pos] = job_min_cgpa
+            location[pos] = location_codes.setdefault(normalize_key(loc), len(location_codes))
+            field[pos] = field_codes.setdefault(normalize_key(job_field), len(field_codes))
+            tokens = role_tokens(role)
+            role_token_count[pos] = len(tokens)
+            for t in tokens:
+                postings.setdefault(t, []).append(pos)
+            records.append({
+                "id": job_id,
+                "company_name": company_name,
+                "suggested_role": role,
+                "location": loc,
+                "min_cgpa": job_min_cgpa,
+                "field": job_field,
+                "program": program,
+                "description": description,
+            })
+
+        self.ids = ids
+        self.min_cgpa = min_cgpa
+        self.location = location
+        self.field = field
+        self.role_token_count = role_token_count
+        self.location_codes = location_codes
+        self.field_codes = field_codes
+        self.role_postings = {t: np.asarray(p, dtype=np.int32) for t, p in postings.items()}
+        self.records = records
+        self.ann = None  # IVF candidate index, built lazily by app.retrieval
+        # min_cgpa order, for skipping internships the student can't qualify for.
+        self.by_min_cgpa = np.argsort(min_cgpa, kind="stable").astype(np.int32)
+        self.sorted_min_cgpa = min_cgpa[self.by_min_cgpa]
+
+    @staticmethod
+    def rows_query() -> Select:
+        I = models.Internship
+        return select(
+            I.id, I.company_name, I.suggested_role, I.location, I.min_cgpa, I.field, I.program, I.description
+        ).order_by(I.id)
+
+    @classmethod
+    def fetch_rows(cls, db: OrmSession) -> list:
+        """The internship columns the index needs, as plain tuples (no ORM objects)."""
+        return db.execute(cls.rows_query()).all()
+
+    @classmethod
+    def from_rows(cls, rows) -> "InternshipIndex":
+        """Standalone index over already-fetched rows (e.g. inside a worker process)."""
+        index = cls()
+        index._load(rows)
+        index._dirty = False
+        index._built_at = float("inf")  # never goes stale; there is no DB to refresh from
+        index.version = 1
+        return index
+
+    def rebuild(self, db: OrmSession) -> None:
+        """Reload from the database."""
+        generation = self._generation
+        self.load_rows(self.fetch_rows(db), generation)
+
+    def load_rows(self, rows, generation: int) -> None:
+        """
+        Swap in rows fetched after reading `generation`. If mark_dirty() ran
+        since then, the rows may predate that write, so the index stays dirty.
+        """
+        with self._lock:
+            self._load(rows)
+            self._dirty = self._generation != generation
+            self._built_at = time.monotonic()
+            self.version += 1
+
+    def mark_dirty(self) -> None:
+        self._generation += 1
+        self._dirty = True
+
+    def needs_refresh(self, catalog_version: Optional[int] = None) -> bool:
+        """
+        Dirty, past the TTL, or (when given) built for an older catalog
+        version than the shared one in the match cache.
+        """
+        stale = time.monotonic() - self._built_at > INDEX_TTL_SECONDS
+        outdated = catalog_version is not None and catalog_version != self.catalog_version
+        return self._dirty or stale or outdated
+
+    def ensure_fresh(self, db: OrmSession, catalog_version: Optional[int] = None) -> "InternshipIndex":
+        if self.needs_refresh(catalog_version):
+            self.rebuild(db)
+            self.catalog_version = catalog_version
+        return self
+
+    async def ensure_fresh_async(self, db: "AsyncSession", catalog_version: Optional[int] = None) -> "InternshipIndex":
+        """ensure_fresh for async routes: awaits the fetch, builds in the threadpool."""
+        if self.needs_refresh(catalog_version):
+            generation = self._generation
+            rows = (await db.execute(self.rows_query())).all()
+            await run_in_threadpool(self.load_rows, rows, generation)
+            self.catalog_version = catalog_version
+        return self
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    # --- Scoring ---------------------------------------------------------------
+
+    def eligible_positions(self, cgpa: float) -> np.ndarray:
+        """Positions with min_cgpa <= cgpa, found by bisecting the min_cgpa order."""
+        cut = int(np.searchsorted(self.sorted_min_cgpa, cgpa, side="right"))
+        return self.by_min_cgpa[:cut]
+
+    def _role_overlap(self, student: models.Student) -> tuple[np.ndarray, np.ndarray]:
+        """Sparse (positions, overlap counts) touched by the student's skills."""
+        skills = {s.strip().lower() for s in (student.skills or "").split(",") if s.strip()}
+        hits = [self.role_postings[s] for s in skills if s in self.role_postings]
+        if not hits:
+            return np.empty(0, dtype=np.int32), np.empty(0, dtype=np.int64)
+        return np.unique(np.concatenate(hits), return_counts=True)
+
+    def score_positions(
+        self,
+        student: models.Student,
+        positions: np.ndarray,
+        overlap: Optional[tuple[np.ndarray, np.ndarray]] = None,
+        role_similarity: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """
+        Match scores for one student against the given index positions:
+        0.35 * cgpa fit + 0.20 * location match + 0.45 * role alignment,
+        rounded to 4 places; ineligible (cgpa < min_cgpa) rows come back 0.
+        `role_similarity` (0..1 per index position, e.g. from the TF-IDF role
+        index) replaces the exact skill/role-word overlap when given.
+        """
+        cgpa = float(student.cgpa)
+        gap = cgpa - self.min_cgpa[positions]
+        cgpa_fit = np.where(gap > 0, np.minimum(1.0, 0.7 + 0.3 * (gap / 3.0)), 0.7)
+
+        loc_key = normalize_key(student.location)
+        loc_code = self.location_codes.get(loc_key, -1) if loc_key else -1
+        location_match = np.where(self.location[positions] == loc_code, 1.0, 0.6)
+
+        if role_similarity is not None:
+            role_alignment = 0.6 + 0.4 * role_similarity[positions]
+        else:
+            hit_positions, hit_counts = overlap if overlap is not None else self._role_overlap(student)
+            counts = self.role_token_count[positions]
+            matched = np.zeros(len(positions), dtype=np.float64)
+            if len(hit_positions):
+                at = np.minimum(np.searchsorted(hit_positions, positions), len(hit_positions) - 1)
+                found = hit_positions[at] == positions
+                matched[found] = hit_counts[at[found]]
+            role_alignment = np.where(counts > 0, 0.6 + 0.4 * (matched / np.maximum(1, counts)), 0.6)
+
+        raw = 0.35 * cgpa_fit + 0.20 * location_match + 0.45 * role_alignment
+        # np.round is not correctly rounded (x * 1e4 can drift), and ties after
+        # rounding decide the order, so round eligible rows with Python's round().
+        scores = np.zeros(len(positions), dtype=np.float64)
+        eligible = np.flatnonzero(gap >= 0)
+        scores[eligible] = [round(v, 4) for v in raw[eligible].tolist()]
+        return scores
+
+    def score_student(self, student: models.Student) -> np.ndarray:
+        """Scores against every indexed internship, in catalog order."""
+        return self.score_positions(student, np.arange(len(self.ids)))
+
+    @span("match_score")
+    def top_k(
+        self,
+        student: models.Student,
+        k: int,
+        chunk_size: int = MATCH_CHUNK_SIZE,
+        role_similarity: Optional[np.ndarray] = None,
+        positions: Optional[np.ndarray] = None,
+    ) -> list[tuple[float, int]]:
+        """
+        Best `k` (score, position) pairs, best first, ties in catalog order.
+
+        Internships the student's CGPA can't reach are never scored. The rest
+        are scored `chunk_size` at a time and pushed through a min-heap bounded
+        at `k`, so per-request memory stays O(k + chunk_size). `positions`
+        restricts the search to a candidate set (e.g. from app.retrieval).
+        """
+        eligible = self.eligible_positions(float(student.cgpa)) if positions is None else positions
+        overlap = self._role_overlap(student) if role_similarity is None else None
+        heap: list[tuple[float, int]] = []  # (score, -position): smallest = worst kept
+
+        for start in range(0, len(eligible), chunk_size):
+            positions = eligible[start:start + chunk_size]
+            scores = self.score_positions(student, positions, overlap, role_similarity)
+            if len(scores) > k:
+                # Cheap pre-cut; keep everything tied with the k-th best so the
+                # heap still sees every tie-break candidate.
+                kth = np.partition(scores, len(scores) - k)[len(scores) - k]
+                keep = np.flatnonzero(scores >= kth)
+                positions, scores = positions[keep], scores[keep]
+            for score, pos in zip(scores.tolist(), positions.tolist()):
+                if score <= 0:
+                    continue
+                item = (score, -pos)
+                if len(heap) < k:
+                    heapq.heappush(heap, item)
+                elif item > heap[0]:
+                    heapq.heapreplace(heap, item)
+
+        return [(score, -neg_pos) for score, neg_pos in sorted(heap, reverse=True)]
+
+
+# One index per process.
+internship_index = InternshipIndex()
+
+
+# Flag the session on any internship write, and only invalidate once that
+# write is committed (so a concurrent rebuild can't miss an in-flight row).
+@event.listens_for(models.Internship, "after_insert")
+@event.listens_for(models.Internship, "after_update")
+@event.listens_for(models.Internship, "after_delete")
+def _internship_changed(mapper, connection, target) -> None:
+    session = object_session(target)
+    if session is not None:
+        session.info["internships_changed"] = True
+
+
+@event.listens_for(OrmSession, "after_commit")
+def _invalidate_after_commit(session: OrmSession) -> None:
+    if session.info.pop("internships_changed", False):
+        internship_index.mark_dirty()
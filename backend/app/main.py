@@ -1,13 +1,29 @@
 from __future__ import annotations
 
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 
-from app.database import engine, Base
-from app.routers import students, internships, matching
+from app.database import engine, Base, DB_MODE, SessionFactory, add_missing_columns
+from app.skills import backfill as backfill_student_skills
+from app.telemetry import CONTENT_TYPE, TimingMiddleware, registry
+
+# APP_DB_MODE=async swaps in the async twins of every router (same paths).
+if DB_MODE == "async":
+    from app.routers import (
+        students_async as students,
+        internships_async as internships,
+        matching_async as matching,
+    )
+else:
+    from app.routers import students, internships, matching
 
 # Initialize database schema (simple setup).
 # ⚠️ For production, consider Alembic migrations instead of auto-create.
 Base.metadata.create_all(bind=engine)
+add_missing_columns(engine)
+# Students created before the skill tables existed get linked once (no-op afterwards).
+with SessionFactory() as _db:
+    backfill_student_skills(_db)
 
 # Application entrypoint
 app = FastAPI(
@@ -15,6 +31,8 @@ app = FastAPI(
     version="1.0",
     description="Lightweight API for linking students with internships"
 )
+# Per-route latency (DB vs Python time), Server-Timing headers, X-Profile captures.
+app.add_middleware(TimingMiddleware)
 
 # Attach routers from different feature modules
 app.include_router(students.router, prefix="/students", tags=["Students"])
@@ -25,3 +43,8 @@ app.include_router(matching.router, prefix="/matching", tags=["Matching"])
 def check_health() -> dict[str, str]:
     """Quick endpoint to verify the service is up."""
     return {"status": "healthy"}
+
+@app.get("/metrics", tags=["System"], response_class=PlainTextResponse)
+def metrics() -> PlainTextResponse:
+    """Request and hot-path timings in Prometheus text format."""
+    return PlainTextResponse(registry.render(), media_type=CONTENT_TYPE)
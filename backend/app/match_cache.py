@@ -0,0 +1,237 @@
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+# --- Settings -----------------------------------------------------------------
+#   MATCH_CACHE_BACKEND = memory (default) | sqlite | off
+#   MATCH_CACHE_SIZE    = max cached results (LRU beyond that)
+#   MATCH_CACHE_PATH    = sqlite file shared by all workers on the host
+#   MATCH_CACHE_TTL     = seconds a memory entry lives (defaults to INTERNSHIP_INDEX_TTL)
+#
+# The memory backend only sees version bumps made by its own process, so with
+# several workers a result can outlive another worker's write; the TTL caps that
+# at the same staleness the internship index already allows. Multi-worker
+# deployments that need writes visible everywhere at once should run with
+# MATCH_CACHE_BACKEND=sqlite, which shares the versions across processes.
+CACHE_BACKEND = os.getenv("MATCH_CACHE_BACKEND", "memory").lower()
+CACHE_SIZE = int(os.getenv("MATCH_CACHE_SIZE", "1024"))
+CACHE_PATH = os.getenv("MATCH_CACHE_PATH", "match_cache.sqlite3")
+CACHE_TTL_SECONDS = float(os.getenv("MATCH_CACHE_TTL", os.getenv("INTERNSHIP_INDEX_TTL", "60")))
+
+CATALOG = "catalog"
+
+
+def _student_counter(student_id: int) -> str:
+    return f"student:{student_id}"
+
+
+class MemoryBackend:
+    """
+    Per-process LRU with a TTL. Versions live here too, so they are per-process
+    as well; the TTL is what bounds staleness across workers.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float = CACHE_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._versions: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return None
+            expires_at, value = item
+            if time.monotonic() >= expires_at:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def version(self, name: str) -> int:
+        return self._versions.get(name, 0)
+
+    def bump(self, name: str) -> int:
+        with self._lock:
+            self._versions[name] = self._versions.get(name, 0) + 1
+            return self._versions[name]
+
+    def bump_many(self, names: list[str]) -> None:
+        with self._lock:
+            for name in names:
+                self._versions[name] = self._versions.get(name, 0) + 1
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SqliteBackend:
+    """
+    Same interface, backed by one sqlite file so every worker on the host shares
+    both the cached results and the version counters.
+    """
+
+    def __init__(self, path: str, max_entries: int):
+        self.path = path
+        self.max_entries = max_entries
+        self._local = threading.local()
+        with self._conn() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS match_cache ("
+                " key TEXT PRIMARY KEY, value TEXT NOT NULL, last_used REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_match_cache_last_used ON match_cache(last_used)")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS match_cache_versions ("
+                " name TEXT PRIMARY KEY, version INTEGER NOT NULL)"
+            )
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Optional[Any]:
+        conn = self._conn()
+        row = conn.execute("SELECT value FROM match_cache WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        conn.execute("UPDATE match_cache SET last_used = ? WHERE key = ?", (time.time(), key))
+        return json.loads(row[0])
+
+    def set(self, key: str, value: Any) -> None:
+        conn = self._conn()
+        conn.execute(
+            "INSERT OR REPLACE INTO match_cache (key, value, last_used) VALUES (?, ?, ?)",
+            (key, json.dumps(value), time.time()),
+        )
+        overflow = len(self) - self.max_entries
+        if overflow > 0:
+            conn.execute(
+                "DELETE FROM match_cache WHERE key IN"
+                " (SELECT key FROM match_cache ORDER BY last_used LIMIT ?)",
+                (overflow,),
+            )
+
+    def version(self, name: str) -> int:
+        row = self._conn().execute(
+            "SELECT version FROM match_cache_versions WHERE name = ?", (name,)
+        ).fetchone()
+        return row[0] if row else 0
+
+    def bump(self, name: str) -> int:
+        conn = self._conn()
+        conn.execute(
+            "INSERT INTO match_cache_versions (name, version) VALUES (?, 1)"
+            " ON CONFLICT(name) DO UPDATE SET version = version + 1",
+            (name,),
+        )
+        return self.version(name)
+
+    def bump_many(self, names: list[str]) -> None:
+        conn = self._conn()
+        with conn:  # one transaction instead of one per name
+            conn.execute("BEGIN")
+            conn.executemany(
+                "INSERT INTO match_cache_versions (name, version) VALUES (?, 1)"
+                " ON CONFLICT(name) DO UPDATE SET version = version + 1",
+                [(name,) for name in names],
+            )
+
+    def __len__(self) -> int:
+        return self._conn().execute("SELECT COUNT(*) FROM match_cache").fetchone()[0]
+
+
+class MatchCache:
+    """
+    Caches /match results under (student id, student version, catalog version, top_k).
+
+    Bumping a student's version only orphans that student's entries; bumping the
+    catalog version orphans everything (any new internship can change any top-k).
+    Orphaned entries are never read again and age out through LRU eviction.
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        # Lookups hit a file; async routes should run them in the threadpool.
+        self.blocking = isinstance(backend, SqliteBackend)
+
+    def catalog_version(self) -> int:
+        return self.backend.version(CATALOG) if self.backend else 0
+
+    def entry(self, student_id: int, top_k: int) -> "CacheEntry":
+        """Pin the current versions; get/put on the entry then agree on one key."""
+        if self.backend is None:
+            return CacheEntry(self, None, 0)
+        student_version = self.backend.version(_student_counter(student_id))
+        catalog_version = self.catalog_version()
+        return CacheEntry(self, f"{student_id}:{student_version}:{catalog_version}:{top_k}", catalog_version)
+
+    def student_changed(self, student_id: int) -> None:
+        if self.backend is not None:
+            self.backend.bump(_student_counter(student_id))
+
+    def students_changed(self, student_ids) -> None:
+        """Bulk form of student_changed (one write for the whole batch)."""
+        if self.backend is not None:
+            self.backend.bump_many([_student_counter(i) for i in student_ids])
+
+    def catalog_changed(self) -> None:
+        if self.backend is not None:
+            self.backend.bump(CATALOG)
+
+
+class CacheEntry:
+    def __init__(self, cache: MatchCache, key: Optional[str], catalog_version: int):
+        self.cache = cache
+        self.key = key
+        self.catalog_version = catalog_version
+
+    def get(self) -> Optional[dict]:
+        if self.key is None:
+            return None
+        value = self.cache.backend.get(self.key)
+        if value is None:
+            self.cache.misses += 1
+        else:
+            self.cache.hits += 1
+        return value
+
+    def put(self, result: dict) -> None:
+        if self.key is not None:
+            self.cache.backend.set(self.key, result)
+
+
+def _make_backend():
+    if CACHE_BACKEND == "off":
+        return None
+    if CACHE_BACKEND == "sqlite":
+        return SqliteBackend(CACHE_PATH, CACHE_SIZE)
+    if CACHE_BACKEND == "memory":
+        return MemoryBackend(CACHE_SIZE)
+    raise ValueError(f"Unknown MATCH_CACHE_BACKEND {CACHE_BACKEND!r} (use memory, sqlite or off).")
+
+
+# One cache per process (the sqlite backend shares its data across processes).
+match_cache = MatchCache(_make_backend())
@@ -2,8 +2,11 @@ from __future__ import annotations
 
 from typing import Annotated, Optional, Iterable
 
+from datetime import datetime
+
 from sqlalchemy import (
-    String, Integer, Float, Text, CheckConstraint, Index
+    String, Integer, Float, Text, DateTime, CheckConstraint, Index,
+    ForeignKey, UniqueConstraint, func,
 )
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -21,6 +24,14 @@ SkillsStr  = Annotated[str, mapped_column("Skills", String(800),  nullable=False
 QualStr    = Annotated[str, mapped_column("Qualification", String(120), nullable=False, default="")]
 BioText    = Annotated[Optional[str], mapped_column("Bio", Text, nullable=True, default=None)]
 CGPAFloat  = Annotated[float, mapped_column("CGPA", Float, nullable=False)]
+# NOTE: SQLAlchemy ignores the column name given inside Annotated[...], so the
+# real column names are the attribute names (lowercase). Constraints and
+# indexes below must use those.
+CompanyStr = Annotated[str, mapped_column(String(200), index=True, nullable=False)]
+RoleStr    = Annotated[str, mapped_column(String(160), nullable=False)]
+MinCGPA    = Annotated[float, mapped_column(Float, index=True, nullable=False, default=0.0)]
+FieldStr   = Annotated[str, mapped_column(String(120), nullable=False, default="")]
+ProgramStr = Annotated[str, mapped_column(String(120), nullable=False, default="")]
 
 
 class Student(Base):
@@ -49,7 +60,7 @@ class Student(Base):
         # CGPA should be in a 0–10 scale (inclusive)
         CheckConstraint("CGPA >= 0 AND CGPA <= 10", name="ck_students_cgpa_range"),
         # Handy search pattern: where is this student and what level are they?
-        Index("ix_students_location_qualification", "Location", "Qualification"),
+        Index("ix_students_location_qualification", "location", "qualification"),
     )
 
     # --- Convenience helpers (pure Python, not required by SQLAlchemy) -------
@@ -75,3 +86,84 @@ class Student(Base):
 
     def __str__(self) -> str:
         return f"{self.full_name} ({self.email})"
+
+
+class Internship(Base):
+    """An internship posting students can be matched against."""
+
+    __tablename__ = "internships"
+
+    id: Mapped[PKInt]
+    company_name: Mapped[CompanyStr]
+    suggested_role: Mapped[RoleStr]
+
+    location: Mapped[LocStr]
+    min_cgpa: Mapped[MinCGPA]
+
+    field: Mapped[FieldStr]
+    program: Mapped[ProgramStr]
+    description: Mapped[Optional[str]] = mapped_column(Text, nullable=True, default=None)
+
+    __table_args__ = (
+        CheckConstraint("min_cgpa >= 0 AND min_cgpa <= 10", name="ck_internships_min_cgpa_range"),
+    )
+
+    def __repr__(self) -> str:
+        return f"<Internship #{self.id} {self.company_name!r} {self.suggested_role!r}>"
+
+
+class Skill(Base):
+    """One entry of the canonical skill vocabulary (see app/skills.py)."""
+
+    __tablename__ = "skills"
+
+    id: Mapped[PKInt]
+    key: Mapped[str] = mapped_column(String(120), nullable=False, unique=True)
+    name: Mapped[str] = mapped_column(String(120), nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<Skill #{self.id} {self.key!r}>"
+
+
+class StudentSkill(Base):
+    """student <-> skill association, derived from Student.skills."""
+
+    __tablename__ = "student_skills"
+
+    student_id: Mapped[int] = mapped_column(
+        ForeignKey("students.id", ondelete="CASCADE"), primary_key=True
+    )
+    skill_id: Mapped[int] = mapped_column(
+        ForeignKey("skills.id", ondelete="CASCADE"), primary_key=True
+    )
+
+    __table_args__ = (
+        # "who has skill X" is the hot lookup; the PK already covers per-student reads.
+        Index("ix_student_skills_skill_student", "skill_id", "student_id"),
+    )
+
+
+class Recommendation(Base):
+    """A stored student → internship match (written by the batch matcher)."""
+
+    __tablename__ = "recommendations"
+
+    id: Mapped[PKInt]
+    student_id: Mapped[int] = mapped_column(
+        ForeignKey("students.id", ondelete="CASCADE"), nullable=False
+    )
+    internship_id: Mapped[int] = mapped_column(
+        ForeignKey("internships.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    score: Mapped[float] = mapped_column(Float, nullable=False)
+    reason: Mapped[Optional[str]] = mapped_column(String(255), nullable=True, default=None)
+    recommended_at: Mapped[datetime] = mapped_column(
+        DateTime, nullable=False, server_default=func.current_timestamp()
+    )
+
+    __table_args__ = (
+        UniqueConstraint("student_id", "internship_id", name="uq_recommendations_pair"),
+    )
+
+    def __repr__(self) -> str:
+        return f"<Recommendation student={self.student_id} internship={self.internship_id} score={self.score}>"
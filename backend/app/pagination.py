@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import base64
+import json
+from typing import Any, AsyncIterator, Callable, Iterator, Optional
+
+from fastapi import HTTPException, Response
+from sqlalchemy import Select, select
+
+from app import database
+from app.database import ReadSessionFactory
+
+# --- Keyset pagination ----------------------------------------------------------
+# Lists are ordered newest first on the primary key and continued with
+# `WHERE id < last_id`, so deep pages cost the same as the first one.
+# Clients only ever see an opaque `cursor` token.
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+EXPORT_BATCH = 1000
+
+
+def encode_cursor(last_id: int) -> str:
+    raw = json.dumps({"before": int(last_id)}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token: Optional[str]) -> Optional[int]:
+    """Last id of the previous page, or None for the first page. 400 on junk."""
+    if not token:
+        return None
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        return int(json.loads(base64.urlsafe_b64decode(padded))["before"])
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid page cursor.")
+
+
+def _page_stmt(stmt: Select, pk, cursor: Optional[str], limit: int) -> Select:
+    before = decode_cursor(cursor)
+    if before is not None:
+        stmt = stmt.where(pk < before)
+    return stmt.order_by(pk.desc()).limit(limit + 1)
+
+
+def _finish_page(rows: list, limit: int, response: Response) -> list:
+    if len(rows) > limit:
+        rows = rows[:limit]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(rows[-1].id)
+    return rows
+
+
+def keyset_page(db, stmt: Select, pk, cursor: Optional[str], limit: int, response: Response) -> list:
+    """
+    Run `stmt` (already filtered, not yet ordered) as one keyset page.
+    Sets the next-page token as a header so the body keeps its list shape.
+    """
+    rows = db.scalars(_page_stmt(stmt, pk, cursor, limit)).all()
+    return _finish_page(list(rows), limit, response)
+
+
+async def keyset_page_async(db, stmt: Select, pk, cursor: Optional[str], limit: int, response: Response) -> list:
+    """keyset_page for an AsyncSession."""
+    rows = (await db.scalars(_page_stmt(stmt, pk, cursor, limit))).all()
+    return _finish_page(list(rows), limit, response)
+
+
+def _id_array_page(ids, cursor: Optional[str], limit: int) -> list[int]:
+    """Newest-first page (plus one look-ahead id) out of an ascending id array."""
+    before = decode_cursor(cursor)
+    if before is not None:
+        ids = ids[: int(ids.searchsorted(before))]
+    return [int(i) for i in ids[-(limit + 1):][::-1]]
+
+
+def id_array_page(db, model, ids, cursor: Optional[str], limit: int, response: Response) -> list:
+    """
+    keyset_page over a precomputed, sorted id array (e.g. from the skill index):
+    the page is sliced out of the array and only those rows are loaded.
+    """
+    page_ids = _id_array_page(ids, cursor, limit)
+    if not page_ids:
+        return []
+    rows = db.scalars(select(model).where(model.id.in_(page_ids)).order_by(model.id.desc())).all()
+    return _finish_page(list(rows), limit, response)
+
+
+async def id_array_page_async(db, model, ids, cursor: Optional[str], limit: int, response: Response) -> list:
+    """id_array_page for an AsyncSession."""
+    page_ids = _id_array_page(ids, cursor, limit)
+    if not page_ids:
+        return []
+    rows = (await db.scalars(select(model).where(model.id.in_(page_ids)).order_by(model.id.desc()))).all()
+    return _finish_page(list(rows), limit, response)
+
+
+def ndjson_export(stmt: Select, to_dict: Callable[[Any], dict]) -> Iterator[str]:
+    """
+    Stream every row of `stmt` as NDJSON through a server-side cursor.
+    Uses its own session: the request-scoped one may be closed before the
+    response body is fully sent.
+    """
+    with ReadSessionFactory() as db:
+        result = db.execute(stmt.execution_options(stream_results=True, yield_per=EXPORT_BATCH))
+        for row in result.scalars():
+            yield json.dumps(to_dict(row), default=str) + "\n"
+
+
+async def ndjson_export_async(stmt: Select, to_dict: Callable[[Any], dict]) -> AsyncIterator[str]:
+    """ndjson_export on the async engine (server-side cursor via stream_scalars)."""
+    async with database.AsyncSessionFactory() as db:
+        result = await db.stream_scalars(stmt.execution_options(yield_per=EXPORT_BATCH))
+        async for row in result:
+            yield json.dumps(to_dict(row), default=str) + "\n"
+
+
+def _id_chunks(ids) -> Iterator[list[int]]:
+    """Newest first, EXPORT_BATCH ids at a time (keeps every IN list small)."""
+    for stop in range(len(ids), 0, -EXPORT_BATCH):
+        yield [int(i) for i in ids[max(0, stop - EXPORT_BATCH):stop][::-1]]
+
+
+def ndjson_export_ids(model, ids, to_dict: Callable[[Any], dict]) -> Iterator[str]:
+    """ndjson_export for the rows named by a sorted id array."""
+    with ReadSessionFactory() as db:
+        for chunk in _id_chunks(ids):
+            for row in db.scalars(select(model).where(model.id.in_(chunk)).order_by(model.id.desc())):
+                yield json.dumps(to_dict(row), default=str) + "\n"
+
+
+async def ndjson_export_ids_async(model, ids, to_dict: Callable[[Any], dict]) -> AsyncIterator[str]:
+    async with database.AsyncSessionFactory() as db:
+        for chunk in _id_chunks(ids):
+            for row in await db.scalars(select(model).where(model.id.in_(chunk)).order_by(model.id.desc())):
+                yield json.dumps(to_dict(row), default=str) + "\n"
@@ -0,0 +1,153 @@
+"""
+Two-stage retrieval for large internship catalogs.
+
+    MATCH_RETRIEVAL   = exact (default) | ann
+    ANN_MIN_CATALOG   = below this many internships /match stays exact (default 5000)
+    ANN_LISTS         = IVF lists (default: sqrt of the catalog size)
+    ANN_PROBE         = lists searched per query (default 16)
+    ANN_CANDIDATES    = candidates handed to the exact scorer (default 300)
+    ANN_DIM           = hashed embedding width (default 128)
+
+Stage 1 embeds every internship so that `embedding . query` is a linear
+approximation of `InternshipIndex.score_positions` (role-word overlap,
+location match, and the CGPA gap), hashed into ANN_DIM dimensions. A small IVF index (k-means lists,
+pure NumPy) then finds the best few hundred eligible candidates by
+inner product. Stage 2 re-ranks only those with the exact scorer, so every
+returned score is exact; only recall is approximate. More probes or more
+candidates trade latency for recall (see benchmarks/ann_recall.py).
+"""
+from __future__ import annotations
+
+import math
+import os
+import zlib
+from typing import Optional
+
+import numpy as np
+
+from app.internship_index import InternshipIndex, normalize_key, role_tokens
+from app.telemetry import span
+
+# --- Settings -----------------------------------------------------------------
+RETRIEVAL = os.getenv("MATCH_RETRIEVAL", "exact").lower()
+if RETRIEVAL not in ("exact", "ann"):
+    raise ValueError(f"MATCH_RETRIEVAL must be 'exact' or 'ann', not {RETRIEVAL!r}.")
+ANN_MIN_CATALOG = int(os.getenv("ANN_MIN_CATALOG", "5000"))
+ANN_LISTS = int(os.getenv("ANN_LISTS", "0"))  # 0 = sqrt(n)
+ANN_PROBE = int(os.getenv("ANN_PROBE", "16"))
+ANN_CANDIDATES = int(os.getenv("ANN_CANDIDATES", "300"))
+ANN_DIM = int(os.getenv("ANN_DIM", "128"))
+KMEANS_ITERS = 8
+KMEANS_SAMPLE = 20000
+
+# score_positions' weights, as they enter the linear approximation.
+ROLE_WEIGHT = 0.45 * 0.4      # role_alignment slope per fully matched role
+LOCATION_WEIGHT = 0.20 * 0.4  # location_match 1.0 vs 0.6
+CGPA_WEIGHT = 0.35 * 0.1      # cgpa_fit slope (0.3 per 3 points)
+
+
+def _bucket(feature: str, dim: int) -> tuple[int, float]:
+    """Signed feature hashing; crc32 so every process hashes the same way."""
+    h = zlib.crc32(feature.encode("utf-8"))
+    return h % dim, (1.0 if (h >> 31) & 1 else -1.0)
+
+
+def embed_internships(index: InternshipIndex, dim: int = ANN_DIM) -> np.ndarray:
+    """(n, dim + 1) float32; the last column carries the CGPA term."""
+    vectors = np.zeros((len(index), dim + 1), dtype=np.float32)
+    for pos, record in enumerate(index.records):
+        tokens = role_tokens(record["suggested_role"])
+        for token in tokens:
+            b, sign = _bucket(f"r:{token}", dim)
+            vectors[pos, b] += sign * ROLE_WEIGHT / len(tokens)
+        loc = normalize_key(record["location"])
+        if loc:
+            b, sign = _bucket(f"l:{loc}", dim)
+            vectors[pos, b] += sign * LOCATION_WEIGHT
+    vectors[:, dim] = -CGPA_WEIGHT * index.min_cgpa
+    return vectors
+
+
+def embed_student(student, dim: int = ANN_DIM) -> np.ndarray:
+    query = np.zeros(dim + 1, dtype=np.float32)
+    for skill in {s.strip().lower() for s in (student.skills or "").split(",") if s.strip()}:
+        b, sign = _bucket(f"r:{skill}", dim)
+        query[b] += sign
+    loc = normalize_key(student.location)
+    if loc:
+        b, sign = _bucket(f"l:{loc}", dim)
+        query[b] += sign
+    query[dim] = 1.0
+    return query
+
+
+class IVFIndex:
+    """Inverted-file index: k-means centroids, each with the positions assigned to it."""
+
+    def __init__(self, vectors: np.ndarray, n_lists: int = 0, seed: int = 0) -> None:
+        self.vectors = vectors
+        n = len(vectors)
+        n_lists = min(n, n_lists or max(1, int(math.sqrt(n))))
+        rng = np.random.default_rng(seed)
+        sample = vectors[rng.choice(n, size=min(n, KMEANS_SAMPLE), replace=False)] if n else vectors
+        centroids = sample[rng.choice(len(sample), size=n_lists, replace=False)].copy() if n else sample[:0]
+        for _ in range(KMEANS_ITERS if n else 0):
+            assign = self._nearest(sample, centroids)
+            for c in range(n_lists):
+                members = sample[assign == c]
+                if len(members):
+                    centroids[c] = members.mean(axis=0)
+        self.centroids = centroids
+        assign = self._nearest(vectors, centroids) if n else np.empty(0, dtype=np.int64)
+        order = np.argsort(assign, kind="stable")
+        bounds = np.searchsorted(assign[order], np.arange(n_lists + 1))
+        self.lists = [order[bounds[c]:bounds[c + 1]].astype(np.int32) for c in range(n_lists)]
+
+    @staticmethod
+    def _nearest(points: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+        # argmin ||p - c||^2 == argmax (p.c - |c|^2 / 2)
+        return np.argmax(points @ centroids.T - 0.5 * (centroids ** 2).sum(axis=1), axis=1)
+
+    def search(self, query: np.ndarray, n_probe: int, allowed=None) -> np.ndarray:
+        """Positions in the n_probe lists whose centroids score best against `query`."""
+        if not len(self.lists):
+            return np.empty(0, dtype=np.int32)
+        n_probe = min(n_probe, len(self.lists))
+        scores = self.centroids @ query
+        probe = np.argpartition(-scores, n_probe - 1)[:n_probe]
+        positions = np.concatenate([self.lists[c] for c in probe])
+        if allowed is not None:
+            positions = positions[allowed(positions)]
+        return positions
+
+
+def ann_index(index: InternshipIndex) -> IVFIndex:
+    """The IVF index for this build of the internship index (built on first use)."""
+    ivf = getattr(index, "ann", None)
+    if ivf is None:
+        ivf = IVFIndex(embed_internships(index), ANN_LISTS)
+        index.ann = ivf  # _load() resets this on every rebuild
+    return ivf
+
+
+@span("ann_candidates")
+def candidates(
+    index: InternshipIndex,
+    student,
+    n_candidates: int = ANN_CANDIDATES,
+    n_probe: int = ANN_PROBE,
+) -> np.ndarray:
+    """Stage 1: up to n_candidates eligible positions with the best approximate score."""
+    ivf = ann_index(index)
+    cgpa = float(student.cgpa)
+    query = embed_student(student)
+    positions = ivf.search(query, n_probe, lambda p: index.min_cgpa[p] <= cgpa)
+    if len(positions) > n_candidates:
+        approx = ivf.vectors[positions] @ query
+        positions = positions[np.argpartition(-approx, n_candidates - 1)[:n_candidates]]
+    return np.sort(positions)
+
+
+def use_ann(index: InternshipIndex, role_similarity: Optional[np.ndarray] = None) -> bool:
+    # The TF-IDF scorer already computes every similarity in its sparse product.
+    return RETRIEVAL == "ann" and role_similarity is None and len(index) >= ANN_MIN_CATALOG
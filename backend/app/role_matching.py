@@ -0,0 +1,296 @@
+"""
+TF-IDF role matching: internship `suggested_role` + `description` against
+student skills + bio, as one sparse matrix product.
+
+    MATCH_ROLE_SCORER = overlap (default: exact skill/role-word overlap, as score_positions)
+                      | tfidf   (cosine similarity from this index)
+    ROLE_INDEX_PATH   = where the fitted vectorizer + internship matrix are kept
+    ROLE_INDEX_REFIT  = refit the vocabulary once this fraction of rows was
+                        appended since the last fit (default 0.25)
+
+New internships are transformed with the already-fitted vectorizer and
+appended to the matrix; only updates/deletes, or enough appended rows that
+the idf weights are worth recomputing, trigger a full refit.
+"""
+from __future__ import annotations
+
+import os
+import pickle
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterable, Optional, Sequence
+
+import numpy as np
+from fastapi.concurrency import run_in_threadpool
+from scipy import sparse
+from sqlalchemy import Select, event, func, select
+from sqlalchemy.orm import Session as OrmSession, object_session
+
+from app import models
+from app.skills import skill_keys
+from app.telemetry import span
+
+if TYPE_CHECKING:
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+# --- Settings -----------------------------------------------------------------
+ROLE_SCORER = os.getenv("MATCH_ROLE_SCORER", "overlap").lower()
+if ROLE_SCORER not in ("overlap", "tfidf"):
+    raise ValueError(f"MATCH_ROLE_SCORER must be 'overlap' or 'tfidf', not {ROLE_SCORER!r}.")
+ROLE_INDEX_PATH = Path(os.getenv("ROLE_INDEX_PATH", "role_index.pkl"))
+REFIT_FRACTION = float(os.getenv("ROLE_INDEX_REFIT", "0.25"))
+INDEX_TTL_SECONDS = float(os.getenv("ROLE_INDEX_TTL", "60"))
+ROLE_INDEX_FORMAT = 1
+
+
+def internship_text(role: Optional[str], description: Optional[str]) -> str:
+    # The role is short and the description long; repeat the role so it isn't drowned out.
+    role = role or ""
+    return f"{role} {role} {description or ''}"
+
+
+def student_text(skills: Optional[str], bio: Optional[str]) -> str:
+    """Raw skills plus their canonical forms ('ML' also reads 'machine learning')."""
+    raw = (skills or "").replace(",", " ")
+    return f"{raw} {' '.join(skill_keys(skills))} {bio or ''}"
+
+
+def make_vectorizer() -> "TfidfVectorizer":
+    # Imported here: with the default overlap scorer the API never needs sklearn.
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    return TfidfVectorizer(
+        lowercase=True,
+        stop_words="english",
+        token_pattern=r"(?u)\b\w[\w+#]*",  # keeps c++ / c#
+        ngram_range=(1, 2),
+        sublinear_tf=True,
+        dtype=np.float32,
+    )
+
+
+class RoleIndex:
+    """
+    Fitted vectorizer + L2-normalized CSR matrix of internship texts (one row per
+    internship, in id order). Rows are unit length, so `students @ matrix.T` is
+    cosine similarity.
+    """
+
+    def __init__(self, path: Optional[Path] = ROLE_INDEX_PATH) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._dirty = True
+        self._stale = False   # an update/delete happened: appending isn't enough
+        self._generation = 0  # bumped by every mark_dirty()
+        self._built_at = 0.0
+        self.vectorizer: Optional["TfidfVectorizer"] = None
+        self.matrix = sparse.csr_matrix((0, 0), dtype=np.float32)
+        self.ids = np.empty(0, dtype=np.int64)
+        self.fitted_rows = 0
+        if path is not None and path.exists():
+            self._read()
+
+    # --- Persistence -----------------------------------------------------------
+
+    def _read(self) -> None:
+        with self.path.open("rb") as f:
+            state = pickle.load(f)
+        if state.get("format") != ROLE_INDEX_FORMAT:
+            return
+        self.vectorizer = state["vectorizer"]
+        self.matrix = state["matrix"]
+        self.ids = state["ids"]
+        self.fitted_rows = state["fitted_rows"]
+
+    def _write(self) -> None:
+        if self.path is None:
+            return
+        # One file, swapped in atomically: the vectorizer and matrix always agree.
+        tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        with tmp.open("wb") as f:
+            pickle.dump(
+                {
+                    "format": ROLE_INDEX_FORMAT,
+                    "vectorizer": self.vectorizer,
+                    "matrix": self.matrix,
+                    "ids": self.ids,
+                    "fitted_rows": self.fitted_rows,
+                },
+                f,
+                protocol=pickle.HIGHEST_PROTOCOL,
+            )
+        os.replace(tmp, self.path)
+
+    # --- Build / refresh -------------------------------------------------------
+
+    @staticmethod
+    def rows_query(after_id: int = 0) -> Select:
+        I = models.Internship
+        return select(I.id, I.suggested_role, I.description).where(I.id > after_id).order_by(I.id)
+
+    @staticmethod
+    def count_query() -> Select:
+        return select(func.count(models.Internship.id))
+
+    @classmethod
+    def _fetch(cls, db: OrmSession, after_id: int = 0) -> list:
+        return db.execute(cls.rows_query(after_id)).all()
+
+    @property
+    def last_id(self) -> int:
+        return int(self.ids[-1]) if len(self.ids) else 0
+
+    def fit(self, rows: Sequence) -> None:
+        """Refit the vocabulary and idf weights on (id, role, description) rows."""
+        vectorizer = make_vectorizer()
+        texts = [internship_text(role, desc) for _, role, desc in rows]
+        if any(t.strip() for t in texts):
+            try:
+                matrix = vectorizer.fit_transform(texts).tocsr()
+            except ValueError:  # nothing left after stop words
+                vectorizer, matrix = None, sparse.csr_matrix((len(rows), 0), dtype=np.float32)
+        else:
+            vectorizer, matrix = None, sparse.csr_matrix((len(rows), 0), dtype=np.float32)
+        self.vectorizer = vectorizer
+        self.matrix = matrix
+        self.ids = np.array([r[0] for r in rows], dtype=np.int64)
+        self.fitted_rows = len(rows)
+
+    def append(self, rows: Sequence) -> None:
+        """Add internships under the current vocabulary (unknown words are dropped)."""
+        if not rows:
+            return
+        texts = [internship_text(role, desc) for _, role, desc in rows]
+        self.matrix = sparse.vstack([self.matrix, self.vectorizer.transform(texts)], format="csr")
+        self.ids = np.concatenate([self.ids, np.array([r[0] for r in rows], dtype=np.int64)])
+
+    def needs_refit(self, total: int, n_new: int) -> bool:
+        return (
+            self.vectorizer is None
+            or self._stale
+            # Rows we indexed were deleted behind our back.
+            or total != len(self.ids) + n_new
+            or len(self.ids) + n_new - self.fitted_rows > REFIT_FRACTION * max(1, self.fitted_rows)
+        )
+
+    def apply(self, rows: Sequence, refit: bool) -> str:
+        """Refit on every row, or append the new ones; returns 'fresh', 'appended' or 'refit'."""
+        if refit:
+            self.fit(rows)
+            outcome = "refit"
+        else:
+            # Another caller may have appended these already.
+            rows = [r for r in rows if r[0] > self.last_id]
+            self.append(rows)
+            outcome = "appended" if rows else "fresh"
+        if outcome != "fresh":
+            self._write()
+        return outcome
+
+    def sync(self, db: OrmSession) -> str:
+        """Bring the index in line with the table; returns 'fresh', 'appended' or 'refit'."""
+        new_rows = self._fetch(db, self.last_id)
+        refit = self.needs_refit(db.scalar(self.count_query()), len(new_rows))
+        return self.apply(self._fetch(db) if refit else new_rows, refit)
+
+    def mark_dirty(self, stale: bool = False) -> None:
+        self._generation += 1
+        self._dirty = True
+        self._stale = self._stale or stale
+
+    def needs_refresh(self) -> bool:
+        return self._dirty or time.monotonic() - self._built_at > INDEX_TTL_SECONDS
+
+    def _settle(self, generation: int) -> None:
+        """
+        Done refreshing from rows read after `generation`. If mark_dirty() ran
+        since then, the rows may predate that write, so the index stays dirty
+        (and stale, if that write asked for a refit).
+        """
+        self._dirty = self._generation != generation
+        if not self._dirty:
+            self._stale = False
+        self._built_at = time.monotonic()
+
+    def _refresh_from(self, rows: Sequence, refit: bool, generation: int) -> None:
+        with self._lock:
+            self.apply(rows, refit)
+            self._settle(generation)
+
+    def ensure_fresh(self, db: OrmSession) -> "RoleIndex":
+        if self.needs_refresh():
+            with self._lock:
+                generation = self._generation
+                self.sync(db)
+                self._settle(generation)
+        return self
+
+    async def ensure_fresh_async(self, db: "AsyncSession") -> "RoleIndex":
+        """ensure_fresh for async routes: awaits the queries, fits in the threadpool."""
+        if self.needs_refresh():
+            generation = self._generation
+            new_rows = (await db.execute(self.rows_query(self.last_id))).all()
+            refit = self.needs_refit(await db.scalar(self.count_query()), len(new_rows))
+            if refit:
+                new_rows = (await db.execute(self.rows_query())).all()
+            await run_in_threadpool(self._refresh_from, new_rows, refit, generation)
+        return self
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    # --- Matching --------------------------------------------------------------
+
+    def similarity(self, students: Iterable[tuple[Optional[str], Optional[str]]]) -> np.ndarray:
+        """(skills, bio) pairs -> dense (n_students, n_internships) cosine similarities."""
+        students = list(students)
+        if self.vectorizer is None or not len(self.ids):
+            return np.zeros((len(students), len(self.ids)), dtype=np.float32)
+        queries = self.vectorizer.transform([student_text(skills, bio) for skills, bio in students])
+        return (queries @ self.matrix.T).toarray()
+
+    def aligned(self, similarities: np.ndarray, ids: np.ndarray) -> np.ndarray:
+        """
+        Reorder a similarity row (or rows) to another id array, e.g. the
+        internship index's positions; ids this index hasn't seen score 0.
+        """
+        at = np.minimum(np.searchsorted(self.ids, ids), max(0, len(self.ids) - 1))
+        known = (self.ids[at] == ids) if len(self.ids) else np.zeros(len(ids), dtype=bool)
+        out = np.zeros(similarities.shape[:-1] + (len(ids),), dtype=np.float64)
+        out[..., known] = similarities[..., at[known]]
+        return out
+
+    @span("role_similarity")
+    def similarity_for(self, student: models.Student, ids: np.ndarray) -> np.ndarray:
+        """One student's similarity to every internship in `ids` order."""
+        return self.aligned(self.similarity([(student.skills, student.bio)])[0], ids)
+
+
+# One index per process (the file on disk is shared). Nothing is loaded unless
+# the tfidf scorer is on.
+role_index = RoleIndex(ROLE_INDEX_PATH if ROLE_SCORER == "tfidf" else None)
+
+
+# Inserts are picked up by id; updates and deletes need a refit.
+@event.listens_for(models.Internship, "after_insert")
+def _internship_added(mapper, connection, target) -> None:
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault("role_index_change", "added")
+
+
+@event.listens_for(models.Internship, "after_update")
+@event.listens_for(models.Internship, "after_delete")
+def _internship_rewritten(mapper, connection, target) -> None:
+    session = object_session(target)
+    if session is not None:
+        session.info["role_index_change"] = "stale"
+
+
+@event.listens_for(OrmSession, "after_commit")
+def _invalidate_after_commit(session: OrmSession) -> None:
+    change = session.info.pop("role_index_change", None)
+    if change is not None:
+        role_index.mark_dirty(stale=change == "stale")
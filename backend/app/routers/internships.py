@@ -1,10 +1,18 @@
 from __future__ import annotations
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
 from sqlalchemy.orm import Session
-from app.database import get_db
-from app import models, schemas
+from app.database import get_db, get_read_db
+from app import bulk, models, schemas
+from app.match_cache import match_cache
+from app.pagination import keyset_page, ndjson_export
+from app.telemetry import TimedRoute
 
-router = APIRouter(prefix="/internships", tags=["Internships"])
+router = APIRouter(prefix="/internships", tags=["Internships"], route_class=TimedRoute)
 
 @router.post("/", response_model=schemas.InternshipRead)
 def create_internship(payload: schemas.InternshipCreate, db: Session = Depends(get_db)):
@@ -15,17 +23,48 @@ def create_internship(payload: schemas.InternshipCreate, db: Session = Depends(g
         min_cgpa=payload.min_cgpa,
         field=payload.field,
         program=payload.program,
+        description=payload.description,
     )
     db.add(job); db.commit(); db.refresh(job)
+    match_cache.catalog_changed()
     return job
 
+@router.post("/bulk")
+async def bulk_create_internships(
+    request: Request,
+    profile: str = Query("api", pattern=bulk.PROFILE_PATTERN),
+    db: Session = Depends(get_db),
+):
+    """JSON array, NDJSON or CSV of internships; same report shape and profiles as /students/bulk."""
+    report = bulk.BulkReport()
+    async for batch in bulk.validated_batches(request, bulk.INTERNSHIP_PROFILES[profile], report):
+        await run_in_threadpool(bulk.insert_internships, db, batch, report)
+    return report.as_dict()
+
 @router.get("/{internship_id}", response_model=schemas.InternshipRead)
-def get_internship(internship_id: int, db: Session = Depends(get_db)):
+def get_internship(internship_id: int, db: Session = Depends(get_read_db)):
     job = db.get(models.Internship, internship_id)
     if not job:
         raise HTTPException(status_code=404, detail="Internship not found.")
     return job
 
 @router.get("/", response_model=list[schemas.InternshipRead])
-def list_internships(db: Session = Depends(get_db)):
-    return db.query(models.Internship).order_by(models.Internship.id.desc()).all()
+def list_internships(
+    response: Response,
+    db: Session = Depends(get_read_db),
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=500),
+    format: Optional[str] = Query(None, pattern="^(json|ndjson)$"),
+):
+    """Newest first, keyset-paginated like /students; `format=ndjson` streams everything."""
+    stmt = select(models.Internship)
+    if format == "ndjson":
+        return StreamingResponse(
+            ndjson_export(stmt.order_by(models.Internship.id.desc()), internship_dict),
+            media_type="application/x-ndjson",
+        )
+    return keyset_page(db, stmt, models.Internship.id, cursor, limit, response)
+
+
+def internship_dict(job: models.Internship) -> dict:
+    return schemas.InternshipRead.model_validate(job).model_dump()
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_async_session
+from app import bulk, models, schemas
+from app.match_cache import match_cache
+from app.pagination import keyset_page_async, ndjson_export_async
+from app.routers.internships import internship_dict
+from app.telemetry import TimedRoute
+
+# Async twin of routers/internships.py (mounted when APP_DB_MODE=async).
+router = APIRouter(prefix="/internships", tags=["Internships"], route_class=TimedRoute)
+
+
+@router.post("/", response_model=schemas.InternshipRead)
+async def create_internship(payload: schemas.InternshipCreate, db: AsyncSession = Depends(get_async_session)):
+    job = models.Internship(**payload.model_dump())
+    db.add(job)
+    await db.commit()
+    await db.refresh(job)
+    match_cache.catalog_changed()
+    return job
+
+
+@router.post("/bulk")
+async def bulk_create_internships(
+    request: Request,
+    profile: str = Query("api", pattern=bulk.PROFILE_PATTERN),
+    db: AsyncSession = Depends(get_async_session),
+):
+    report = bulk.BulkReport()
+    async for batch in bulk.validated_batches(request, bulk.INTERNSHIP_PROFILES[profile], report):
+        await db.run_sync(bulk.insert_internships, batch, report)
+    return report.as_dict()
+
+
+@router.get("/{internship_id}", response_model=schemas.InternshipRead)
+async def get_internship(internship_id: int, db: AsyncSession = Depends(get_async_session)):
+    job = await db.get(models.Internship, internship_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Internship not found.")
+    return job
+
+
+@router.get("/", response_model=list[schemas.InternshipRead])
+async def list_internships(
+    response: Response,
+    db: AsyncSession = Depends(get_async_session),
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=500),
+    format: Optional[str] = Query(None, pattern="^(json|ndjson)$"),
+):
+    stmt = select(models.Internship)
+    if format == "ndjson":
+        return StreamingResponse(
+            ndjson_export_async(stmt.order_by(models.Internship.id.desc()), internship_dict),
+            media_type="application/x-ndjson",
+        )
+    return await keyset_page_async(db, stmt, models.Internship.id, cursor, limit, response)
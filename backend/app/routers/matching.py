@@ -2,57 +2,45 @@ from __future__ import annotations
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 
-from app.database import get_db
+from app.database import get_read_db
 from app import models, schemas
+from app.internship_index import internship_index
+from app.match_cache import match_cache
+from app.retrieval import candidates, use_ann
+from app.role_matching import ROLE_SCORER, role_index
+from app.telemetry import TimedRoute
 
-router = APIRouter(prefix="/match", tags=["Matching"])
-
-
-def _score(student: models.Student, job: models.Internship) -> float:
-    """Simple scoring logic between a student and an internship."""
-    if student.cgpa < job.min_cgpa:
-        return 0.0
-
-    # 1) CGPA fit
-    cgpa_fit = min(
-        1.0,
-        0.7 + 0.3 * ((student.cgpa - job.min_cgpa) / 3.0)
-        if student.cgpa > job.min_cgpa else 0.7
-    )
-
-    # 2) Field match (ignore if student.field not present)
-    field_val = getattr(student, "field", None)
-    field_match = 1.0 if field_val and field_val.strip().lower() == job.field.strip().lower() else 0.5
-
-    # 3) Location match
-    location_match = 1.0 if (
-        student.location.strip().lower() == job.location.strip().lower()
-        and student.location.strip()
-    ) else 0.6
-
-    # 4) Skills vs role tokens
-    student_skills = {s.strip().lower() for s in (student.skills or "").split(",") if s.strip()}
-    role_tokens = {t.lower() for t in (job.suggested_role or "").split() if t}
-    overlap = student_skills & role_tokens
-    role_alignment = 0.6 + 0.4 * (len(overlap) / max(1, len(role_tokens))) if role_tokens else 0.6
-
-    # Weighted average
-    return round(0.35 * cgpa_fit + 0.20 * location_match + 0.45 * role_alignment, 4)
+router = APIRouter(prefix="/match", tags=["Matching"], route_class=TimedRoute)
 
 
 @router.get("/{student_id}", response_model=schemas.MatchResult)
 def match_internships_for_student(
     student_id: int,
     top_k: int = Query(3, ge=1, le=20),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     """Return the top internships for a given student."""
+    cache_entry = match_cache.entry(student_id, top_k)
+    cached = cache_entry.get()
+    if cached is not None:
+        return cached
+
     student = db.get(models.Student, student_id)
     if not student:
         raise HTTPException(status_code=404, detail="Student not found.")
 
-    jobs = db.query(models.Internship).all()
-    if not jobs:
+    # The entry pinned the catalog version before the index is (re)built, so a
+    # concurrent write can only make us cache under an older, never-read key.
+    index = internship_index.ensure_fresh(db, cache_entry.catalog_version)
+    role_similarity = None
+    if ROLE_SCORER == "tfidf":
+        role_similarity = role_index.ensure_fresh(db).similarity_for(student, index.ids)
+    return build_match_result(student, index, top_k, cache_entry, role_similarity)
+
+
+def build_match_result(student, index, top_k: int, cache_entry, role_similarity=None) -> schemas.MatchResult:
+    """Top-k from a fresh index -> MatchResult (cached unless the catalog is empty)."""
+    if not len(index):
         return schemas.MatchResult(
             student_id=student.id,
             student_name=student.full_name,
@@ -60,16 +48,19 @@ def match_internships_for_student(
             top_matches=[]
         )
 
-    scored = [{"score": _score(student, j), "internship": j} for j in jobs]
-    scored = [x for x in scored if x["score"] > 0]
-    scored.sort(key=lambda x: x["score"], reverse=True)
-
-    top = scored[:top_k]
+    # Huge catalogs: shortlist with the IVF index, then score only the shortlist exactly.
+    positions = candidates(index, student) if use_ann(index, role_similarity) else None
+    top = [
+        {"score": score, "internship": index.records[pos]}
+        for score, pos in index.top_k(student, top_k, role_similarity=role_similarity, positions=positions)
+    ]
     best = top[0]["internship"] if top else None
 
-    return schemas.MatchResult(
+    result = schemas.MatchResult(
         student_id=student.id,
         student_name=student.full_name,
         best_match=best,
-        top_matches=[{"score": t["score"], "internship": t["internship"]} for t in top],
+        top_matches=top,
     )
+    cache_entry.put(result.model_dump())
+    return result
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_async_session
+from app import models, schemas
+from app.internship_index import internship_index
+from app.match_cache import match_cache
+from app.role_matching import ROLE_SCORER, role_index
+from app.routers.matching import build_match_result
+from app.telemetry import TimedRoute
+
+# Async twin of routers/matching.py (mounted when APP_DB_MODE=async).
+# Only the queries run on the event loop; index builds, scoring and sqlite
+# cache I/O go to the threadpool so they don't stall other requests.
+router = APIRouter(prefix="/match", tags=["Matching"], route_class=TimedRoute)
+
+
+async def _cache_call(fn, *args):
+    if match_cache.blocking:
+        return await run_in_threadpool(fn, *args)
+    return fn(*args)
+
+
+def _match(student, index, top_k: int, cache_entry, roles) -> schemas.MatchResult:
+    role_similarity = roles.similarity_for(student, index.ids) if roles is not None else None
+    return build_match_result(student, index, top_k, cache_entry, role_similarity)
+
+
+@router.get("/{student_id}", response_model=schemas.MatchResult)
+async def match_internships_for_student(
+    student_id: int,
+    top_k: int = Query(3, ge=1, le=20),
+    db: AsyncSession = Depends(get_async_session),
+):
+    """Return the top internships for a given student."""
+    cache_entry = await _cache_call(match_cache.entry, student_id, top_k)
+    cached = await _cache_call(cache_entry.get)
+    if cached is not None:
+        return cached
+
+    student = await db.get(models.Student, student_id)
+    if not student:
+        raise HTTPException(status_code=404, detail="Student not found.")
+
+    index = await internship_index.ensure_fresh_async(db, cache_entry.catalog_version)
+    roles = await role_index.ensure_fresh_async(db) if ROLE_SCORER == "tfidf" else None
+    return await run_in_threadpool(_match, student, index, top_k, cache_entry, roles)
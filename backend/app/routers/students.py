@@ -1,13 +1,22 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from typing import Optional
 
-from app.database import get_db
-from app import models, schemas
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.orm import Session
 
-router = APIRouter(prefix="/students", tags=["Students"])
+from app.database import get_db, get_read_db
+from app import bulk, models, schemas
+from app.match_cache import match_cache
+from app.pagination import id_array_page, keyset_page, ndjson_export, ndjson_export_ids
+from app.skills import link_students, skill_index
+from app.student_records import DUPLICATE_EMAIL, new_student, student_dict
+from app.telemetry import TimedRoute
 
+router = APIRouter(prefix="/students", tags=["Students"], route_class=TimedRoute)
 
 @router.post("/", response_model=schemas.StudentRead)
 def add_student(data: schemas.StudentCreate, db: Session = Depends(get_db)):
@@ -16,31 +25,43 @@ def add_student(data: schemas.StudentCreate, db: Session = Depends(get_db)):
     - Email is forced to lowercase for consistency.
     - Duplicate email check is done here before saving.
     """
-    normalized_email = str(data.email).strip().lower()
-
-    if db.query(models.Student).filter(models.Student.email == normalized_email).first():
-        raise HTTPException(status_code=400, detail="Email already exists. Please try another one.")
+    student = new_student(data)
 
-    student = models.Student(
-        full_name=data.full_name.strip(),
-        email=normalized_email,
-        password=data.password,  # 🔒 in real-world apps, hash the password
-        college=(data.college or "").strip(),
-        cgpa=data.cgpa,
-        location=(data.location or "").strip(),
-        skills=(data.skills or "").strip(),
-        qualification=(data.qualification or "").strip(),
-        bio=(data.bio or None),
-    )
+    if db.query(models.Student).filter(models.Student.email == student.email).first():
+        raise HTTPException(status_code=400, detail=DUPLICATE_EMAIL)
 
     db.add(student)
+    db.flush()
+    link_students(db, [(student.id, student.skills)])
     db.commit()
     db.refresh(student)
+    # sqlite can hand out a deleted id again; never serve that id's old matches.
+    match_cache.student_changed(student.id)
     return student
 
 
+@router.post("/bulk")
+async def bulk_add_students(
+    request: Request,
+    profile: str = Query("api", pattern=bulk.PROFILE_PATTERN),
+    db: Session = Depends(get_db),
+):
+    """
+    Insert many students at once: a JSON array, NDJSON (application/x-ndjson)
+    or CSV (text/csv, header row with the field names). Rows are validated like
+    POST /, duplicate emails are rejected per row, and every batch is one
+    transaction. Returns counts plus the row numbers that failed and why.
+    ?profile=dataset accepts the shipped student dataset CSV (see app/bulk.py).
+    """
+    report = bulk.BulkReport()
+    seen: set[str] = set()
+    async for batch in bulk.validated_batches(request, bulk.STUDENT_PROFILES[profile], report):
+        await run_in_threadpool(bulk.insert_students, db, batch, seen, report)
+    return report.as_dict()
+
+
 @router.get("/{student_id}", response_model=schemas.StudentRead)
-def read_student(student_id: int, db: Session = Depends(get_db)):
+def read_student(student_id: int, db: Session = Depends(get_read_db)):
     """
     Retrieve details of a student by their ID.
     Returns 404 if no match is found.
@@ -53,13 +74,33 @@ def read_student(student_id: int, db: Session = Depends(get_db)):
 
 @router.get("/", response_model=list[schemas.StudentRead])
 def get_all_students(
-    db: Session = Depends(get_db),
-    skip: int = 0,
-    limit: int = 25,
+    response: Response,
+    db: Session = Depends(get_read_db),
+    cursor: Optional[str] = None,
+    limit: int = Query(25, ge=1, le=500),
+    format: Optional[str] = Query(None, pattern="^(json|ndjson)$"),
+    skills: Optional[str] = Query(None, description="comma-separated, e.g. python,sql"),
+    skills_match: str = Query("all", pattern="^(all|any)$"),
 ):
     """
     List students ordered by newest first.
-    Pagination supported with `skip` and `limit`.
+    Keyset pagination: pass the `X-Next-Cursor` header from the previous page
+    as `cursor`. `format=ndjson` streams the whole table instead.
+    `skills` keeps students with all (or, with skills_match=any, any) of the
+    given skills, answered from the in-memory skill index.
     """
-    query = db.query(models.Student).order_by(models.Student.id.desc())
-    return query.offset(skip).limit(limit).all()
+    if skills is not None:
+        ids = skill_index.ensure_fresh(db).students_with(skills.split(","), skills_match == "all")
+        if format == "ndjson":
+            return StreamingResponse(
+                ndjson_export_ids(models.Student, ids, student_dict), media_type="application/x-ndjson"
+            )
+        return id_array_page(db, models.Student, ids, cursor, limit, response)
+
+    stmt = select(models.Student)
+    if format == "ndjson":
+        return StreamingResponse(
+            ndjson_export(stmt.order_by(models.Student.id.desc()), student_dict),
+            media_type="application/x-ndjson",
+        )
+    return keyset_page(db, stmt, models.Student.id, cursor, limit, response)
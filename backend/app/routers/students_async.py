@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_async_session
+from app import bulk, models, schemas
+from app.match_cache import match_cache
+from app.pagination import (
+    id_array_page_async, keyset_page_async, ndjson_export_async, ndjson_export_ids_async,
+)
+from app.skills import link_students, skill_index
+from app.student_records import DUPLICATE_EMAIL, new_student, student_dict
+from app.telemetry import TimedRoute
+
+# Async twin of routers/students.py (mounted when APP_DB_MODE=async).
+router = APIRouter(prefix="/students", tags=["Students"], route_class=TimedRoute)
+
+
+@router.post("/", response_model=schemas.StudentRead)
+async def add_student(data: schemas.StudentCreate, db: AsyncSession = Depends(get_async_session)):
+    """Same rules as the sync route: lowercase email, reject duplicates."""
+    student = new_student(data)
+
+    existing = await db.scalar(select(models.Student.id).where(models.Student.email == student.email))
+    if existing is not None:
+        raise HTTPException(status_code=400, detail=DUPLICATE_EMAIL)
+
+    db.add(student)
+    await db.flush()
+    await db.run_sync(link_students, [(student.id, student.skills)])
+    await db.commit()
+    await db.refresh(student)
+    match_cache.student_changed(student.id)
+    return student
+
+
+@router.post("/bulk")
+async def bulk_add_students(
+    request: Request,
+    profile: str = Query("api", pattern=bulk.PROFILE_PATTERN),
+    db: AsyncSession = Depends(get_async_session),
+):
+    report = bulk.BulkReport()
+    seen: set[str] = set()
+    async for batch in bulk.validated_batches(request, bulk.STUDENT_PROFILES[profile], report):
+        await db.run_sync(bulk.insert_students, batch, seen, report)
+    return report.as_dict()
+
+
+@router.get("/{student_id}", response_model=schemas.StudentRead)
+async def read_student(student_id: int, db: AsyncSession = Depends(get_async_session)):
+    student = await db.get(models.Student, student_id)
+    if not student:
+        raise HTTPException(status_code=404, detail="No student found with that ID.")
+    return student
+
+
+@router.get("/", response_model=list[schemas.StudentRead])
+async def get_all_students(
+    response: Response,
+    db: AsyncSession = Depends(get_async_session),
+    cursor: Optional[str] = None,
+    limit: int = Query(25, ge=1, le=500),
+    format: Optional[str] = Query(None, pattern="^(json|ndjson)$"),
+    skills: Optional[str] = Query(None, description="comma-separated, e.g. python,sql"),
+    skills_match: str = Query("all", pattern="^(all|any)$"),
+):
+    if skills is not None:
+        index = await db.run_sync(skill_index.ensure_fresh)
+        ids = index.students_with(skills.split(","), skills_match == "all")
+        if format == "ndjson":
+            return StreamingResponse(
+                ndjson_export_ids_async(models.Student, ids, student_dict), media_type="application/x-ndjson"
+            )
+        return await id_array_page_async(db, models.Student, ids, cursor, limit, response)
+
+    stmt = select(models.Student)
+    if format == "ndjson":
+        return StreamingResponse(
+            ndjson_export_async(stmt.order_by(models.Student.id.desc()), student_dict),
+            media_type="application/x-ndjson",
+        )
+    return await keyset_page_async(db, stmt, models.Student.id, cursor, limit, response)
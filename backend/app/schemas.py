@@ -50,6 +50,7 @@ class InternshipBase(BaseModel):
     min_cgpa: float = PydField(ge=0, le=10)
     field: str = PydField(min_length=0, max_length=120)
     program: str = PydField(min_length=0, max_length=120)
+    description: Optional[str] = None
 
 
 class InternshipCreate(InternshipBase):
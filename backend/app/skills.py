@@ -0,0 +1,325 @@
+"""
+Skill vocabulary, the student_skills association, and an in-memory inverted
+index over it.
+
+    cd backend
+    python -m app.skills --backfill     # link students created before this existed
+
+Free-text skills ("Web Dev", "web development", " Python ") are reduced to one
+canonical key per skill. Students are linked to skill ids in `student_skills`
+when they are created; SkillIndex keeps skill id -> sorted student ids in
+memory so "students who know python AND sql" is an array intersection.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import re
+import threading
+import time
+from typing import Iterable, Optional
+
+import numpy as np
+from sqlalchemy import delete, event, insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session as OrmSession
+
+from app import models
+
+# --- Settings -----------------------------------------------------------------
+# Same contract as the internship index: writes through this process mark the
+# index dirty on commit, the TTL bounds how stale other workers' writes can be.
+INDEX_TTL_SECONDS = float(os.getenv("SKILL_INDEX_TTL", "60"))
+BACKFILL_BATCH = 1000
+
+# --- Vocabulary -----------------------------------------------------------------
+_SEPARATORS = re.compile(r"[^a-z0-9+#.]+")
+
+# Spelling variants -> canonical key. Keys on both sides are already normalized
+# (lowercase, single spaces), see skill_key().
+SKILL_SYNONYMS = {
+    "web dev": "web development",
+    "webdev": "web development",
+    "web developer": "web development",
+    "ml": "machine learning",
+    "data analytics": "data analysis",
+    "cyber security": "cybersecurity",
+    "js": "javascript",
+    "java script": "javascript",
+    "ts": "typescript",
+    "py": "python",
+    "python3": "python",
+    "cpp": "c++",
+    "c plus plus": "c++",
+    "golang": "go",
+    "node": "node.js",
+    "nodejs": "node.js",
+    "node js": "node.js",
+    "reactjs": "react",
+    "react.js": "react",
+    "postgres": "postgresql",
+    "mysql db": "mysql",
+    "internet of things": "iot",
+    "ios development": "ios",
+    "android development": "android",
+    "human resources": "hr",
+}
+
+# How canonical keys are displayed; anything else keeps its first-seen spelling.
+CANONICAL_NAMES = {
+    "web development": "Web Development",
+    "machine learning": "Machine Learning",
+    "data analysis": "Data Analysis",
+    "cybersecurity": "Cybersecurity",
+    "javascript": "JavaScript",
+    "typescript": "TypeScript",
+    "python": "Python",
+    "c++": "C++",
+    "node.js": "Node.js",
+    "postgresql": "PostgreSQL",
+    "mysql": "MySQL",
+    "sql": "SQL",
+    "iot": "IoT",
+    "ios": "iOS",
+    "hr": "HR",
+    "ai": "AI",
+}
+
+
+def skill_key(raw: Optional[str]) -> str:
+    """'  Web Dev ' / 'web-development' / 'WEB DEVELOPMENT' -> 'web development'."""
+    key = _SEPARATORS.sub(" ", (raw or "").lower()).strip()
+    return SKILL_SYNONYMS.get(key, key)
+
+
+def skill_keys(skills: Optional[str]) -> list[str]:
+    """Canonical keys of a comma-separated skills string, deduplicated, in order."""
+    seen: dict[str, None] = {}
+    for part in (skills or "").split(","):
+        key = skill_key(part)
+        if key:
+            seen.setdefault(key)
+    return list(seen)
+
+
+def display_name(key: str, raw: str) -> str:
+    return CANONICAL_NAMES.get(key, raw.strip() or key)
+
+
+def resolve_skills(db: OrmSession, raw_skills: Iterable[str], create: bool = False) -> dict[str, int]:
+    """
+    key -> skill id for the given free-text skills, with one IN query.
+    With create=True, unknown skills are added to the vocabulary; the INSERT
+    runs in a savepoint, so losing a race with a concurrent signup that adds
+    the same key just means reading that key's id instead.
+    """
+    wanted: dict[str, str] = {}
+    for raw in raw_skills:
+        key = skill_key(raw)
+        if key:
+            wanted.setdefault(key, raw)
+    if not wanted:
+        return {}
+    S = models.Skill
+    found = dict(db.execute(select(S.key, S.id).where(S.key.in_(list(wanted)))).all())
+    missing = [k for k in wanted if k not in found]
+    while missing and create:
+        try:
+            with db.begin_nested():
+                db.execute(insert(S), [{"key": k, "name": display_name(k, wanted[k])} for k in missing])
+        except IntegrityError:
+            # Someone else committed some of these keys first. A locking read
+            # sees their rows even under REPEATABLE READ; retry with the rest.
+            added = dict(db.execute(select(S.key, S.id).where(S.key.in_(missing)).with_for_update()).all())
+            if not added:
+                raise
+            found.update(added)
+        else:
+            found.update(db.execute(select(S.key, S.id).where(S.key.in_(missing))).all())
+        missing = [k for k in missing if k not in found]
+    return found
+
+
+def link_students(db: OrmSession, students: Iterable[tuple[int, Optional[str]]]) -> int:
+    """
+    Replace the student_skills rows of each (student_id, skills string).
+    Runs inside the caller's transaction; once it commits, the new rows are
+    added to the in-memory index (see SkillIndex.add_links).
+    """
+    students = list(students)
+    if not students:
+        return 0
+    parsed = [(student_id, skill_keys(skills)) for student_id, skills in students]
+    ids = resolve_skills(db, (k for _, keys in parsed for k in keys), create=True)
+
+    SS = models.StudentSkill
+    db.execute(delete(SS).where(SS.student_id.in_([student_id for student_id, _ in parsed])))
+    rows = [
+        {"student_id": student_id, "skill_id": ids[key]}
+        for student_id, keys in parsed
+        for key in keys
+    ]
+    if rows:
+        db.execute(insert(SS), rows)
+    pending = db.info.setdefault("student_skills_pending", {"students": [], "links": [], "skill_ids": {}})
+    pending["students"].extend(student_id for student_id, _ in parsed)
+    pending["links"].extend((row["skill_id"], row["student_id"]) for row in rows)
+    pending["skill_ids"].update(ids)
+    return len(rows)
+
+
+def backfill(db: OrmSession, batch: int = BACKFILL_BATCH) -> int:
+    """Link every student that has skills but no student_skills rows yet."""
+    St, SS = models.Student, models.StudentSkill
+    linked, last_id = 0, 0
+    while True:
+        rows = db.execute(
+            select(St.id, St.skills)
+            .where(St.id > last_id, St.skills != "")
+            .where(~select(SS.student_id).where(SS.student_id == St.id).exists())
+            .order_by(St.id)
+            .limit(batch)
+        ).all()
+        if not rows:
+            return linked
+        last_id = rows[-1][0]
+        link_students(db, [tuple(r) for r in rows])
+        db.commit()
+        linked += len(rows)
+
+
+# --- Inverted index ---------------------------------------------------------------
+
+def _group(pairs: np.ndarray) -> dict[int, np.ndarray]:
+    """(skill_id, student_id) rows sorted by both -> skill id -> student ids."""
+    postings: dict[int, np.ndarray] = {}
+    if len(pairs):
+        # Split at skill changes.
+        starts = np.flatnonzero(np.r_[True, pairs[1:, 0] != pairs[:-1, 0]])
+        for skill_id, ids in zip(pairs[starts, 0], np.split(pairs[:, 1], starts[1:])):
+            postings[int(skill_id)] = ids
+    return postings
+
+
+class SkillIndex:
+    """skill id -> sorted int64 array of student ids, plus key -> skill id."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._dirty = True
+        self._generation = 0  # bumped by every mark_dirty()
+        self._built_at = 0.0
+        self._max_student = 0  # highest student id in any posting
+        self.skill_ids: dict[str, int] = {}
+        self.postings: dict[int, np.ndarray] = {}
+
+    def rebuild(self, db: OrmSession) -> None:
+        """Reload from the database."""
+        generation = self._generation
+        skill_ids = dict(db.execute(select(models.Skill.key, models.Skill.id)).all())
+        SS = models.StudentSkill
+        pairs = db.execute(select(SS.skill_id, SS.student_id).order_by(SS.skill_id, SS.student_id)).all()
+        self.load_rows(skill_ids, pairs, generation)
+
+    def load_rows(self, skill_ids: dict[str, int], pairs, generation: int) -> None:
+        """
+        Swap in (skill_id, student_id) rows fetched after reading `generation`.
+        If mark_dirty() ran since then, the rows may predate that write, so the
+        index stays dirty.
+        """
+        pairs = np.array(pairs, dtype=np.int64).reshape(-1, 2)
+        postings = _group(pairs)  # rows arrive sorted by skill, then student
+        with self._lock:
+            self.skill_ids, self.postings = skill_ids, postings
+            self._max_student = int(pairs[:, 1].max()) if len(pairs) else 0
+            self._dirty = self._generation != generation
+            self._built_at = time.monotonic()
+
+    def add_links(self, students: Iterable[int], links: Iterable[tuple[int, int]], skill_ids: dict[str, int]) -> None:
+        """
+        Fold committed link_students() writes in without a reload: the rows of
+        `students` were replaced by `links` ((skill_id, student_id) pairs).
+        Postings are swapped for new arrays, never changed in place.
+        """
+        students = np.unique(np.fromiter(students, dtype=np.int64))
+        pairs = np.array(list(links), dtype=np.int64).reshape(-1, 2)
+        with self._lock:
+            self._generation += 1  # a rebuild already fetching may predate these rows
+            if self._dirty:
+                return  # the next rebuild reads them anyway
+            self.skill_ids.update(skill_ids)
+            # New signups have ids above every indexed one, so they have nothing to drop.
+            if len(students) and students[0] <= self._max_student:
+                for skill_id, ids in self.postings.items():
+                    keep = ~np.isin(ids, students, assume_unique=True)
+                    if not keep.all():
+                        self.postings[skill_id] = ids[keep]
+            if len(pairs):
+                pairs = pairs[np.lexsort((pairs[:, 1], pairs[:, 0]))]
+                for skill_id, ids in _group(pairs).items():
+                    current = self.postings.get(skill_id)
+                    self.postings[skill_id] = ids if current is None else np.union1d(current, ids)
+                self._max_student = max(self._max_student, int(pairs[:, 1].max()))
+
+    def mark_dirty(self) -> None:
+        self._generation += 1
+        self._dirty = True
+
+    def ensure_fresh(self, db: OrmSession) -> "SkillIndex":
+        if self._dirty or time.monotonic() - self._built_at > INDEX_TTL_SECONDS:
+            self.rebuild(db)
+        return self
+
+    def students_with(self, skills: Iterable[str], match_all: bool = True) -> np.ndarray:
+        """
+        Sorted student ids having all (AND) or any (OR) of the free-text skills.
+        A skill nobody has makes an AND query empty and is ignored by OR.
+        """
+        keys = {skill_key(s) for s in skills} - {""}
+        empty = np.empty(0, dtype=np.int64)
+        lists = [self.postings.get(self.skill_ids.get(k, -1), empty) for k in keys]
+        if not lists:
+            return empty
+        if match_all:
+            lists.sort(key=len)  # smallest first keeps every intersection small
+            result = lists[0]
+            for ids in lists[1:]:
+                if not len(result):
+                    break
+                result = np.intersect1d(result, ids, assume_unique=True)
+            return result
+        return np.unique(np.concatenate(lists))
+
+
+# One index per process.
+skill_index = SkillIndex()
+
+
+@event.listens_for(OrmSession, "after_commit")
+def _apply_after_commit(session: OrmSession) -> None:
+    pending = session.info.pop("student_skills_pending", None)
+    if pending is not None:
+        skill_index.add_links(pending["students"], pending["links"], pending["skill_ids"])
+
+
+@event.listens_for(OrmSession, "after_soft_rollback")
+def _discard_after_rollback(session: OrmSession, previous_transaction) -> None:
+    if not previous_transaction.nested:
+        session.info.pop("student_skills_pending", None)
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Maintain the skill vocabulary and student_skills.")
+    parser.add_argument("--backfill", action="store_true", help="link students that have no skill rows yet")
+    args = parser.parse_args(argv)
+
+    from app.database import Base, SessionFactory, engine
+
+    Base.metadata.create_all(bind=engine)
+    if args.backfill:
+        with SessionFactory() as db:
+            print(f"Linked {backfill(db)} students")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from app import models, schemas
+
+# Student payload -> row helpers shared by the sync and async routers and by
+# bulk ingestion (app/bulk.py).
+DUPLICATE_EMAIL = "Email already exists. Please try another one."
+
+
+def new_student(data: schemas.StudentCreate) -> models.Student:
+    """Build (not save) a Student from the payload, with the usual normalization."""
+    return models.Student(
+        full_name=data.full_name.strip(),
+        email=str(data.email).strip().lower(),
+        password=data.password,  # 🔒 in real-world apps, hash the password
+        college=(data.college or "").strip(),
+        cgpa=data.cgpa,
+        location=(data.location or "").strip(),
+        skills=(data.skills or "").strip(),
+        qualification=(data.qualification or "").strip(),
+        bio=(data.bio or None),
+    )
+
+
+def student_dict(student: models.Student) -> dict:
+    return schemas.StudentRead.model_validate(student).model_dump()
@@ -0,0 +1,123 @@
+"""
+Request timing for the API, on top of the shared core in telemetry_core.py
+(registry, spans, profiling; see there for X-Profile and its settings).
+
+Every HTTP request is timed by `TimingMiddleware` and split into time spent
+executing SQL (SQLAlchemy cursor events) and everything else ("python" time:
+routing, validation, scoring, serialization). Results land in per-route
+histograms served as Prometheus text on GET /metrics, and each response
+carries a `Server-Timing` header with the same split plus any spans.
+A profile capture covers the endpoint function, in the thread it runs on.
+"""
+from __future__ import annotations
+
+import functools
+import inspect
+import time
+
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from telemetry_core import CONTENT_TYPE, RequestStats, capture, current, registry, requested_profiler, span
+
+__all__ = ["CONTENT_TYPE", "registry", "span", "TimedRoute", "TimingMiddleware", "route_label"]
+
+
+# --- SQL time -------------------------------------------------------------------
+# Class-level listeners cover every engine: primary, read pool, and the
+# async engine's sync core.
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    if context is not None:
+        context.telemetry_started = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    stats = current.get()
+    started = getattr(context, "telemetry_started", None)
+    if stats is not None and started is not None:
+        stats.db_seconds += time.perf_counter() - started
+        stats.db_queries += 1
+
+
+# --- Profiling --------------------------------------------------------------------
+def _profiled(endpoint, path: str):
+    """Run the endpoint under the requested profiler, in its own thread/task."""
+    if inspect.iscoroutinefunction(endpoint):
+        @functools.wraps(endpoint)
+        async def run_async(*args, **kwargs):
+            stats = current.get()
+            if stats is None or stats.profiler is None:
+                return await endpoint(*args, **kwargs)
+            with capture(stats.profiler, path) as written:
+                result = await endpoint(*args, **kwargs)
+            stats.profile_file = written[0] if written else None
+            return result
+        return run_async
+
+    @functools.wraps(endpoint)
+    def run_sync(*args, **kwargs):
+        stats = current.get()
+        if stats is None or stats.profiler is None:
+            return endpoint(*args, **kwargs)
+        with capture(stats.profiler, path) as written:
+            result = endpoint(*args, **kwargs)
+        stats.profile_file = written[0] if written else None
+        return result
+    return run_sync
+
+
+class TimedRoute(APIRoute):
+    """APIRoute whose endpoint can be profiled on demand (see X-Profile)."""
+
+    def __init__(self, path: str, endpoint, **kwargs) -> None:
+        super().__init__(path, _profiled(endpoint, path), **kwargs)
+
+
+# --- Middleware -------------------------------------------------------------------
+def route_label(scope) -> str:
+    """
+    The matched route template, e.g. /matching/match/{student_id}. Never the
+    raw path: ids in labels would explode the series count. Routes of an
+    included router may carry only their own part of the template, so the
+    leading segments come from the request path.
+    """
+    template = getattr(scope.get("route"), "path", None)
+    if not template:
+        return "unmatched"
+    segments = scope["path"].split("/")
+    return "/".join(segments[: len(segments) - template.count("/")]) + template
+
+
+class TimingMiddleware:
+    """Pure ASGI, so the request context (and its stats) is shared with the endpoint."""
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        headers = {k.decode("latin-1").lower(): v.decode("latin-1") for k, v in scope.get("headers", [])}
+        stats = RequestStats(requested_profiler(headers))
+        token = current.set(stats)
+        status = 500
+
+        async def send_with_timing(message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                extra = [(b"server-timing", stats.server_timing().encode("latin-1"))]
+                if stats.profile_file:
+                    extra.append((b"x-profile-file", stats.profile_file.encode("latin-1")))
+                message = {**message, "headers": list(message.get("headers", [])) + extra}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            current.reset(token)
+            stats.finish(scope["method"], route_label(scope), status)
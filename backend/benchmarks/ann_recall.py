@@ -0,0 +1,139 @@
+"""
+Recall and latency of two-stage (IVF + exact re-rank) retrieval vs exact top-k.
+
+    cd backend
+    python -m benchmarks.ann_recall --internships 50000 --students 300 --top-k 10
+    python -m benchmarks.ann_recall --probe 4 8 16 --candidates 100 300 1000
+
+Runs in memory on a synthetic catalog (no database): the internship index is
+built from generated rows, so the numbers isolate retrieval cost. Recall is
+|ann top-k ∩ exact top-k| / k, counting a tie at the k-th exact score as a hit
+(any of the tied internships is an equally correct answer).
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import statistics
+import time
+from types import SimpleNamespace
+
+from app.internship_index import InternshipIndex
+from app.retrieval import IVFIndex, ann_index, candidates, embed_internships
+
+ROLE_WORDS = [
+    "software", "data", "science", "python", "java", "web", "frontend", "backend", "ml",
+    "ai", "cloud", "devops", "android", "ios", "security", "analyst", "design", "marketing",
+    "finance", "hr", "embedded", "iot", "sql", "testing", "research", "product", "sales",
+]
+SKILLS = ROLE_WORDS + ["c++", "excel", "communication", "react", "node", "networking"]
+CITIES = ["Mumbai", "Delhi", "Pune", "Bangalore", "Chennai", "Hyderabad", "Kolkata", "Jaipur", ""]
+
+
+def synthetic_rows(n: int, seed: int = 0) -> list[tuple]:
+    rnd = random.Random(seed)
+    return [
+        (
+            i + 1, f"Company {i}",
+            " ".join(rnd.sample(ROLE_WORDS, rnd.randint(1, 3))) + " intern",
+            rnd.choice(CITIES), round(rnd.uniform(5.0, 9.0), 1), "B.Tech", "PM Internship", None,
+        )
+        for i in range(n)
+    ]
+
+
+def synthetic_students(n: int, seed: int = 1) -> list[SimpleNamespace]:
+    rnd = random.Random(seed)
+    return [
+        SimpleNamespace(
+            cgpa=round(rnd.uniform(5.5, 10.0), 2),
+            location=rnd.choice(CITIES),
+            skills=", ".join(rnd.sample(SKILLS, rnd.randint(1, 5))),
+        )
+        for _ in range(n)
+    ]
+
+
+def _recall(exact: list, approx: list, k: int) -> float:
+    if not exact:
+        return 1.0
+    kth = exact[-1][0]
+    exact_pos = {pos for _, pos in exact}
+    hits = sum(1 for score, pos in approx if pos in exact_pos or score >= kth)
+    return min(hits, len(exact)) / len(exact)
+
+
+def _ms(samples: list[float]) -> dict:
+    ordered = sorted(samples)
+    return {
+        "p50_ms": round(statistics.median(ordered) * 1000, 3),
+        "p95_ms": round(ordered[int(0.95 * (len(ordered) - 1))] * 1000, 3),
+    }
+
+
+def run(n_internships: int, n_students: int, top_k: int, probes: list[int], candidate_sizes: list[int], lists: int) -> dict:
+    index = InternshipIndex.from_rows(synthetic_rows(n_internships))
+    students = synthetic_students(n_students)
+
+    started = time.perf_counter()
+    index.ann = IVFIndex(embed_internships(index), lists)
+    build_sec = time.perf_counter() - started
+
+    exact, exact_times = [], []
+    for student in students:
+        t = time.perf_counter()
+        exact.append(index.top_k(student, top_k))
+        exact_times.append(time.perf_counter() - t)
+
+    report = {
+        "internships": n_internships,
+        "students": n_students,
+        "top_k": top_k,
+        "ivf_lists": len(ann_index(index).lists),
+        "ivf_build_sec": round(build_sec, 3),
+        "exact": _ms(exact_times),
+        "ann": [],
+    }
+    for n_probe in probes:
+        for n_candidates in candidate_sizes:
+            recalls, times = [], []
+            for student, truth in zip(students, exact):
+                t = time.perf_counter()
+                shortlist = candidates(index, student, n_candidates, n_probe)
+                approx = index.top_k(student, top_k, positions=shortlist)
+                times.append(time.perf_counter() - t)
+                recalls.append(_recall(truth, approx, top_k))
+            row = {
+                "probe": n_probe,
+                "candidates": n_candidates,
+                "recall": round(statistics.fmean(recalls), 4),
+                **_ms(times),
+            }
+            report["ann"].append(row)
+            print(
+                f"probe={n_probe:<3} candidates={n_candidates:<5} recall@{top_k}={row['recall']:.3f} "
+                f"p50={row['p50_ms']}ms (exact p50={report['exact']['p50_ms']}ms)"
+            )
+    return report
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="ANN recall/latency vs exact matching.")
+    parser.add_argument("--internships", type=int, default=50000)
+    parser.add_argument("--students", type=int, default=300)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--probe", type=int, nargs="+", default=[4, 8, 16])
+    parser.add_argument("--candidates", type=int, nargs="+", default=[100, 300, 1000])
+    parser.add_argument("--lists", type=int, default=0, help="IVF lists (0 = sqrt(n))")
+    parser.add_argument("--out", default="bench_ann_recall.json")
+    args = parser.parse_args(argv)
+
+    report = run(args.internships, args.students, args.top_k, args.probe, args.candidates, args.lists)
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Requests/sec of the sync vs async data layer under concurrent clients.
+
+    cd backend
+    python -m benchmarks.db_modes --concurrency 50 100 250 500 --duration 10
+
+For each APP_DB_MODE it starts uvicorn on a fresh sqlite file, seeds it over
+HTTP, then keeps N clients busy on a read mix (student by id, student list,
+/match) for `duration` seconds. Results are printed and written as JSON.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+SEED_STUDENTS = 200
+SEED_INTERNSHIPS = 500
+
+
+def _start_server(mode: str, port: int, db_path: Path) -> subprocess.Popen:
+    env = {
+        **os.environ,
+        "APP_DB_MODE": mode,
+        "APP_DATABASE_URL": f"sqlite:///{db_path.as_posix()}",
+        "MATCH_CACHE_BACKEND": "off",  # measure the data layer, not cache hits
+    }
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=env,
+    )
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/health").status_code == 200:
+                return proc
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    proc.kill()
+    raise RuntimeError(f"uvicorn ({mode}) did not start")
+
+
+def _seed(base: str) -> None:
+    rnd = random.Random(7)
+    with httpx.Client(base_url=base) as client:
+        for i in range(SEED_INTERNSHIPS):
+            client.post("/internships/internships/", json={
+                "company_name": f"Company {i}", "suggested_role": rnd.choice(["Python Intern", "Data Intern", "Web Intern"]),
+                "location": rnd.choice(["Mumbai", "Delhi", "Pune"]), "min_cgpa": round(rnd.uniform(5, 9), 1),
+                "field": "B.Tech", "program": "PM",
+            }).raise_for_status()
+        for i in range(SEED_STUDENTS):
+            client.post("/students/students/", json={
+                "full_name": f"Student {i}", "email": f"s{i}@example.com", "password": "benchpw",
+                "college": "X", "cgpa": round(rnd.uniform(5, 10), 2), "location": rnd.choice(["Mumbai", "Delhi"]),
+                "skills": "python, data", "qualification": "B.Tech",
+            }).raise_for_status()
+
+
+async def _load(base: str, concurrency: int, duration: float) -> dict:
+    paths = [
+        lambda r: f"/students/students/{r.randint(1, SEED_STUDENTS)}",
+        lambda r: "/students/students/?limit=25",
+        lambda r: f"/matching/match/{r.randint(1, SEED_STUDENTS)}?top_k=5",
+    ]
+    done, errors = 0, 0
+    stop_at = time.perf_counter() + duration
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base, limits=limits, timeout=30) as client:
+        async def worker(seed: int) -> None:
+            nonlocal done, errors
+            rnd = random.Random(seed)
+            while time.perf_counter() < stop_at:
+                try:
+                    resp = await client.get(rnd.choice(paths)(rnd))
+                    if resp.status_code == 200:
+                        done += 1
+                    else:
+                        errors += 1
+                except httpx.HTTPError:
+                    errors += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(i) for i in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    return {"concurrency": concurrency, "requests": done, "errors": errors, "rps": round(done / elapsed, 1)}
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark APP_DB_MODE=sync vs async.")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[50, 100, 250, 500])
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per concurrency level")
+    parser.add_argument("--modes", nargs="+", default=["sync", "async"])
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--out", type=Path, default=Path("bench_db_modes.json"))
+    args = parser.parse_args(argv)
+
+    results = {}
+    for mode in args.modes:
+        with tempfile.TemporaryDirectory() as tmp:
+            proc = _start_server(mode, args.port, Path(tmp) / "bench.db")
+            try:
+                base = f"http://127.0.0.1:{args.port}"
+                _seed(base)
+                results[mode] = [asyncio.run(_load(base, c, args.duration)) for c in args.concurrency]
+            finally:
+                proc.terminate()
+                proc.wait(timeout=10)
+
+    print(f"{'clients':>8} " + " ".join(f"{m + ' rps':>12}" for m in args.modes))
+    for i, c in enumerate(args.concurrency):
+        print(f"{c:>8} " + " ".join(f"{results[m][i]['rps']:>12}" for m in args.modes))
+    args.out.write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
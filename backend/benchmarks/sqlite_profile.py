@@ -0,0 +1,116 @@
+"""
+Mixed read/write throughput on SQLite, default settings vs the tuned profile.
+
+    cd backend
+    python -m benchmarks.sqlite_profile --threads 16 --duration 10 --write-ratio 0.2
+
+Each profile gets its own fresh database file (journal_mode is sticky per
+file). Worker threads share one engine, like the FastAPI threadpool does, and
+run a random mix of primary-key reads and single-row update/insert commits.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from app import models
+from app.database import Base, make_engine
+
+SEED_STUDENTS = 5000
+
+
+def _seed(engine) -> None:
+    Base.metadata.create_all(bind=engine)
+    rows = [
+        {
+            "full_name": f"Student {i}", "email": f"s{i}@example.com", "password": "x" * 8,
+            "college": "X", "cgpa": 7.0, "location": "Mumbai", "skills": "python",
+            "qualification": "B.Tech", "bio": None,
+        }
+        for i in range(SEED_STUDENTS)
+    ]
+    with engine.begin() as conn:
+        conn.execute(insert(models.Student), rows)
+
+
+def _run(engine, threads: int, duration: float, write_ratio: float) -> dict:
+    Session = sessionmaker(bind=engine, expire_on_commit=False)
+    counts = {"reads": 0, "writes": 0, "locked": 0}
+    lock = threading.Lock()
+    stop_at = time.perf_counter() + duration
+
+    def worker(seed: int) -> None:
+        rnd = random.Random(seed)
+        local = {"reads": 0, "writes": 0, "locked": 0}
+        while time.perf_counter() < stop_at:
+            student_id = rnd.randint(1, SEED_STUDENTS)
+            try:
+                with Session() as db:
+                    if rnd.random() < write_ratio:
+                        if rnd.random() < 0.5:
+                            db.execute(update(models.Student).where(models.Student.id == student_id)
+                                       .values(cgpa=round(rnd.uniform(5, 10), 2)))
+                        else:
+                            db.add(models.Internship(company_name="Bench", suggested_role="Intern",
+                                                     location="Pune", min_cgpa=6.0, field="B.Tech", program="PM"))
+                        db.commit()
+                        local["writes"] += 1
+                    else:
+                        db.execute(select(models.Student).where(models.Student.id == student_id)).scalar_one()
+                        local["reads"] += 1
+            except OperationalError:  # "database is locked"
+                local["locked"] += 1
+        with lock:
+            for k, v in local.items():
+                counts[k] += v
+
+    started = time.perf_counter()
+    pool = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    elapsed = time.perf_counter() - started
+
+    return {
+        **counts,
+        "ops_per_sec": round((counts["reads"] + counts["writes"]) / elapsed, 1),
+        "reads_per_sec": round(counts["reads"] / elapsed, 1),
+        "writes_per_sec": round(counts["writes"] / elapsed, 1),
+    }
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="SQLite default vs tuned profile, mixed workload.")
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--write-ratio", type=float, default=0.2)
+    parser.add_argument("--out", type=Path, default=Path("bench_sqlite_profile.json"))
+    args = parser.parse_args(argv)
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for profile in ("default", "tuned"):
+            url = f"sqlite:///{(Path(tmp) / f'{profile}.db').as_posix()}"
+            engine = make_engine(url, tuned=(profile == "tuned"))
+            _seed(engine)
+            results[profile] = _run(engine, args.threads, args.duration, args.write_ratio)
+            engine.dispose()
+
+    for profile, r in results.items():
+        print(f"{profile:>8}: {r['ops_per_sec']:>9} ops/s  "
+              f"({r['reads_per_sec']} reads/s, {r['writes_per_sec']} writes/s, {r['locked']} locked)")
+    args.out.write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,244 @@
+"""
+Framework-neutral telemetry shared by the FastAPI service (app/telemetry.py)
+and the Flask site (../telemetry.py): the metric registry and its Prometheus
+text rendering, per-request stats, hot-path spans and on-demand profiling.
+Each side only adds the glue that times its requests and its SQL.
+
+    @span("match_score")          # or: with span("match_score"): ...
+    def top_k(...): ...
+
+Profiling a single request, without redeploying:
+
+    curl -H "X-Profile: cprofile" -H "X-Profile-Token: $PROFILE_TOKEN" ...
+
+    PROFILE_TOKEN        required for X-Profile to be honoured (unset = profiling off)
+    PROFILE_SAMPLE_RATE  share of flagged requests actually profiled (default 1.0)
+    PROFILE_DIR          where captures are written (default ./profiles)
+
+`cprofile` writes a pstats file, `pyinstrument` an HTML report (falls back to
+cProfile if pyinstrument isn't installed); the file name comes back in
+`X-Profile-File`. Metrics are per process: scrape each worker, or run one.
+"""
+from __future__ import annotations
+
+import contextvars
+import os
+import random
+import re
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+# --- Settings -----------------------------------------------------------------
+PROFILE_TOKEN = os.getenv("PROFILE_TOKEN", "")
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "1.0"))
+PROFILE_DIR = Path(os.getenv("PROFILE_DIR", "profiles"))
+PROFILE_HEADER = "x-profile"
+PROFILE_TOKEN_HEADER = "x-profile-token"
+PROFILERS = ("cprofile", "pyinstrument")
+
+# Seconds; Prometheus `le` upper bounds (+Inf is implicit).
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# name -> (type, help). Apps add their own metrics with METRIC_HELP.update().
+METRIC_HELP = {
+    "http_requests_total": ("counter", "Requests served, by route and status."),
+    "http_request_duration_seconds": ("histogram", "Wall-clock request latency."),
+    "http_request_db_seconds": ("histogram", "Time spent executing SQL per request."),
+    "http_request_python_seconds": ("histogram", "Request time outside SQL execution."),
+    "http_db_queries_total": ("counter", "SQL statements executed while serving requests."),
+    "span_duration_seconds": ("histogram", "Duration of instrumented hot-path sections."),
+}
+
+
+# --- Metric storage -----------------------------------------------------------
+class Histogram:
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self) -> None:
+        self.counts = [0] * (len(BUCKETS) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(BUCKETS, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(pairs: tuple) -> str:
+    return ",".join(f'{k}="{_escape(v)}"' for k, v in pairs)
+
+
+class Registry:
+    """Counters and fixed-bucket histograms keyed by (name, label pairs)."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._histograms: dict[str, dict[tuple, Histogram]] = {}
+        self._counters: dict[str, dict[tuple, float]] = {}
+
+    def observe(self, name: str, labels: tuple, value: float) -> None:
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            hist = series.get(labels)
+            if hist is None:
+                hist = series[labels] = Histogram()
+            hist.observe(value)
+
+    def inc(self, name: str, labels: tuple, amount: float = 1) -> None:
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[labels] = series.get(labels, 0) + amount
+
+    def counter(self, name: str) -> dict[tuple, float]:
+        """{label pairs: value} for one counter (for non-HTTP processes, e.g. the inference server)."""
+        with self._lock:
+            return dict(self._counters.get(name, {}))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+
+    def render(self, gauges: Optional[dict[str, float]] = None) -> str:
+        """Prometheus text exposition format (0.0.4); `gauges` is {name: value}."""
+        with self._lock:
+            counters = {name: dict(series) for name, series in self._counters.items()}
+            histograms = {
+                name: {labels: (list(h.counts), h.sum, h.count) for labels, h in series.items()}
+                for name, series in self._histograms.items()
+            }
+        lines = []
+        for name in sorted(counters.keys() | histograms.keys()):
+            kind, help_text = METRIC_HELP.get(name, ("untyped", name))
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in sorted(counters.get(name, {}).items()):
+                lines.append(f"{name}{{{_labels(labels)}}} {value:g}")
+            for labels, (counts, total, count) in sorted(histograms.get(name, {}).items()):
+                cumulative = 0
+                for bound, n in zip(BUCKETS + (float("inf"),), counts):
+                    cumulative += n
+                    le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                    lines.append(f"{name}_bucket{{{_labels(labels + (('le', le),))}}} {cumulative}")
+                lines.append(f"{name}_sum{{{_labels(labels)}}} {total:.6f}")
+                lines.append(f"{name}_count{{{_labels(labels)}}} {count}")
+        for name, value in sorted((gauges or {}).items()):
+            lines.append(f"# TYPE {name} gauge")
+            lines.append(f"{name} {value:g}")
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+
+# --- Per-request state ----------------------------------------------------------
+class RequestStats:
+    def __init__(self, profiler: Optional[str] = None) -> None:
+        self.started = time.perf_counter()
+        self.db_seconds = 0.0
+        self.db_queries = 0
+        self.spans: dict[str, float] = {}
+        self.profiler = profiler
+        self.profile_file: Optional[str] = None
+
+    def server_timing(self) -> str:
+        total = time.perf_counter() - self.started
+        parts = [f"db;dur={self.db_seconds * 1000:.2f}", f"app;dur={(total - self.db_seconds) * 1000:.2f}"]
+        parts += [f"{name};dur={sec * 1000:.2f}" for name, sec in self.spans.items()]
+        return ", ".join(parts)
+
+    def finish(self, method: str, route: str, status: int) -> None:
+        total = time.perf_counter() - self.started
+        labels = (("method", method), ("route", route))
+        registry.inc("http_requests_total", labels + (("status", str(status)),))
+        registry.observe("http_request_duration_seconds", labels, total)
+        registry.observe("http_request_db_seconds", labels, self.db_seconds)
+        registry.observe("http_request_python_seconds", labels, max(0.0, total - self.db_seconds))
+        if self.db_queries:
+            registry.inc("http_db_queries_total", labels, self.db_queries)
+
+
+# The request being served in this context. asyncio tasks and FastAPI's
+# threadpool copy it along, so sync routes and spans inside them see it too.
+current: contextvars.ContextVar[Optional[RequestStats]] = contextvars.ContextVar("request_stats", default=None)
+
+
+@contextmanager
+def span(name: str):
+    """Time a hot-path section (also usable as a decorator)."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        registry.observe("span_duration_seconds", (("span", name),), elapsed)
+        stats = current.get()
+        if stats is not None:
+            stats.spans[name] = stats.spans.get(name, 0.0) + elapsed
+
+
+# --- Profiling --------------------------------------------------------------------
+_profile_lock = threading.Lock()  # one capture at a time; profilers don't nest
+
+
+def requested_profiler(headers) -> Optional[str]:
+    """
+    Profiler named by X-Profile, if the token matches and the sample says yes.
+    `headers` needs a .get() that accepts lower-case names.
+    """
+    wanted = (headers.get(PROFILE_HEADER) or "").strip().lower()
+    if not wanted or not PROFILE_TOKEN or headers.get(PROFILE_TOKEN_HEADER) != PROFILE_TOKEN:
+        return None
+    if random.random() >= PROFILE_SAMPLE_RATE:
+        return None
+    return wanted if wanted in PROFILERS else "cprofile"
+
+
+@contextmanager
+def capture(kind: str, label: str):
+    """Profile the block; yields a list that receives the written file name."""
+    written: list[str] = []
+    if not _profile_lock.acquire(blocking=False):
+        yield written
+        return
+    try:
+        profiler = None
+        if kind == "pyinstrument":
+            try:
+                from pyinstrument import Profiler
+                profiler = Profiler()
+            except ImportError:
+                kind = "cprofile"
+        if profiler is None:
+            import cProfile
+            profiler = cProfile.Profile()
+            profiler.enable()
+        else:
+            profiler.start()
+        try:
+            yield written
+        finally:
+            PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+            stem = f"{datetime.now():%Y%m%d-%H%M%S-%f}-{re.sub(r'[^A-Za-z0-9]+', '_', label).strip('_') or 'root'}"
+            if kind == "pyinstrument":
+                profiler.stop()
+                path = PROFILE_DIR / f"{stem}.html"
+                path.write_text(profiler.output_html(), encoding="utf-8")
+            else:
+                profiler.disable()
+                path = PROFILE_DIR / f"{stem}.prof"
+                profiler.dump_stats(path)
+            written.append(path.name)
+    finally:
+        _profile_lock.release()
@@ -0,0 +1 @@
+"""Benchmark harness for the recommendation and matching hot paths (see benchmarks/suite.py)."""
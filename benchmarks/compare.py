@@ -0,0 +1,76 @@
+"""
+Compare two benchmark result files and flag regressions.
+
+    python -m benchmarks.compare baseline.json candidate.json
+    python -m benchmarks.compare baseline.json candidate.json --threshold 0.15 --metrics p95_ms peak_rss_mb
+
+Results are matched on (name, scale). A latency or memory metric that grew,
+or a throughput that dropped, by more than `threshold` (relative) is a
+regression. Exits 1 if any regression was found, so CI can gate on it.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# metric -> True if bigger is better
+METRICS = {"p50_ms": False, "p95_ms": False, "p99_ms": False, "throughput": True, "peak_rss_mb": False}
+DEFAULT_METRICS = ["p50_ms", "p95_ms", "throughput"]
+
+
+def _index(report: dict) -> dict:
+    return {(r["name"], r["scale"]): r for r in report["results"] if not r.get("skipped")}
+
+
+def compare(baseline: dict, candidate: dict, threshold: float, metrics: list[str]) -> list[dict]:
+    """One row per (benchmark, scale, metric) present in both files."""
+    base, cand = _index(baseline), _index(candidate)
+    rows = []
+    for key in sorted(base.keys() & cand.keys()):
+        for metric in metrics:
+            old, new = base[key].get(metric), cand[key].get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            worse = -change if METRICS[metric] else change
+            rows.append({
+                "name": key[0], "scale": key[1], "metric": metric,
+                "baseline": old, "candidate": new, "change": round(change, 4),
+                "regression": worse > threshold,
+                "improvement": -worse > threshold,
+            })
+    return rows
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Flag regressions between two benchmark result files.")
+    parser.add_argument("baseline", type=Path)
+    parser.add_argument("candidate", type=Path)
+    parser.add_argument("--threshold", type=float, default=0.10, help="relative change that counts (0.10 = 10%%)")
+    parser.add_argument("--metrics", nargs="+", choices=sorted(METRICS), default=DEFAULT_METRICS)
+    parser.add_argument("--json", action="store_true", help="print the comparison as JSON")
+    args = parser.parse_args(argv)
+
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    candidate = json.loads(args.candidate.read_text(encoding="utf-8"))
+    rows = compare(baseline, candidate, args.threshold, args.metrics)
+    regressions = [r for r in rows if r["regression"]]
+
+    if args.json:
+        print(json.dumps({"rows": rows, "regressions": len(regressions)}, indent=2))
+    else:
+        print(f"baseline  {baseline['meta'].get('git_commit')}  ->  candidate  {candidate['meta'].get('git_commit')}")
+        for r in rows:
+            flag = "REGRESSION" if r["regression"] else ("improved" if r["improvement"] else "")
+            print(
+                f"{r['name']:<22} {r['scale']:>8} {r['metric']:<12} "
+                f"{r['baseline']:>12} -> {r['candidate']:<12} {r['change']:+8.1%}  {flag}"
+            )
+        print(f"{len(regressions)} regression(s) over {args.threshold:.0%}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
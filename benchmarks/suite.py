@@ -0,0 +1,360 @@
+"""
+Benchmark suite for the hot paths.
+
+    python -m benchmarks.suite                                  # 1k and 10k, everything
+    python -m benchmarks.suite --scales 1k 10k 100k 1M --out bench_results.json
+    python -m benchmarks.suite --only recommend matching --repeat 200
+    python -m benchmarks.compare baseline.json bench_results.json
+
+Benchmarks (each run per scale N, on seeded synthetic data):
+
+  train             recommender.training.train() on N students x TRAIN_COMPANIES
+                    companies (skipped above --max-train-pairs)
+  recommend_single  model.recommend_for_new_student() against a catalog of N companies
+  recommend_batch   model.recommend_for_students() for a batch of students, same catalog
+  match_batch       backend InternshipIndex.top_k() for many students, N internships
+  http_*            FastAPI endpoints through TestClient on a SQLite file seeded with
+                    N students and N internships (capped by --http-max-rows)
+
+Every result records p50/p95/p99 latency, throughput and the peak RSS seen
+while it ran, and the whole run is written as one JSON file.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+
+from benchmarks import synthetic
+
+ROOT = Path(__file__).resolve().parent.parent
+BACKEND_DIR = ROOT / "backend"
+DEFAULT_SCALES = ["1k", "10k"]
+ALL_BENCHMARKS = ["train", "recommend", "matching", "http"]
+TRAIN_COMPANIES = 10  # the demo catalog size; training cost grows with N x this
+BATCH_STUDENTS = 256
+MAX_BATCH_PAIRS = 10_000_000  # recommend_batch: keeps the feature matrix under ~1 GB
+WARMUP_CALLS = 2
+
+
+def parse_scale(text: str) -> int:
+    text = text.strip().lower()
+    for suffix, factor in (("k", 1_000), ("m", 1_000_000)):
+        if text.endswith(suffix):
+            return int(float(text[:-1]) * factor)
+    return int(text)
+
+
+# --- Measurement helpers ----------------------------------------------------------
+
+def _rss_bytes() -> int:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        # ru_maxrss is KiB on Linux, bytes on macOS; it is also a lifetime max.
+        scale = 1 if sys.platform == "darwin" else 1024
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+
+
+class PeakRSS:
+    """Samples resident memory in a background thread while the block runs."""
+
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+
+    def _sample(self) -> None:
+        while not self._stop.is_set():
+            self.peak = max(self.peak, _rss_bytes())
+            self._stop.wait(self.interval)
+
+    def __enter__(self) -> "PeakRSS":
+        self.peak = _rss_bytes()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, _rss_bytes())
+
+
+def _result(name: str, scale: int, samples: list[float], items_per_sample: float, unit: str, rss: PeakRSS, **extra) -> dict:
+    """Latency percentiles over per-call samples, throughput in `unit`/sec."""
+    arr = np.asarray(samples, dtype=np.float64)
+    total = float(arr.sum())
+    return {
+        "name": name,
+        "scale": scale,
+        "samples": len(samples),
+        "p50_ms": round(float(np.percentile(arr, 50)) * 1000, 4),
+        "p95_ms": round(float(np.percentile(arr, 95)) * 1000, 4),
+        "p99_ms": round(float(np.percentile(arr, 99)) * 1000, 4),
+        "throughput": round(items_per_sample * len(samples) / total, 2) if total else None,
+        "throughput_unit": f"{unit}/s",
+        "peak_rss_mb": round(rss.peak / 2**20, 1),
+        **extra,
+    }
+
+
+def _timed(fn, repeat: int, warmup: int = WARMUP_CALLS) -> list[float]:
+    for _ in range(warmup):  # first calls pay for lazy imports and cold caches
+        fn()
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def _log(result: dict) -> None:
+    if result.get("skipped"):
+        print(f"  {result['name']:<22} n={result['scale']:<8} skipped: {result['skipped']}")
+        return
+    print(
+        f"  {result['name']:<22} n={result['scale']:<8} p50={result['p50_ms']:.3f}ms "
+        f"p95={result['p95_ms']:.3f}ms p99={result['p99_ms']:.3f}ms "
+        f"{result['throughput']} {result['throughput_unit']} rss={result['peak_rss_mb']}MB"
+    )
+
+
+# --- ML recommender -----------------------------------------------------------------
+
+_reference_model = None
+
+
+def _reference_model_bundle():
+    """A model trained once on small synthetic data, shared by the recommend benchmarks."""
+    global _reference_model
+    if _reference_model is None:
+        from recommender.training import train
+
+        result = train(synthetic.students_frame(1000), synthetic.companies_frame(TRAIN_COMPANIES))
+        _reference_model = (result["model"], result["encoders"]["dept"])
+    return _reference_model
+
+
+def bench_train(scale: int, max_pairs: int) -> list[dict]:
+    from recommender.training import train
+
+    pairs = scale * TRAIN_COMPANIES
+    if pairs > max_pairs:
+        return [{"name": "train", "scale": scale, "skipped": f"{pairs} pairs > --max-train-pairs {max_pairs}"}]
+    students, companies = synthetic.students_frame(scale), synthetic.companies_frame(TRAIN_COMPANIES)
+    with PeakRSS() as rss:
+        started = time.perf_counter()
+        result = train(students, companies)
+        elapsed = time.perf_counter() - started
+    return [_result("train", scale, [elapsed], pairs, "pairs", rss, model=result["metadata"]["model_name"])]
+
+
+def _profiles(n: int, seed: int) -> list[dict]:
+    frame = synthetic.students_frame(n, seed=seed)
+    return frame[["department", "cgpa", "projects", "skills"]].to_dict("records")
+
+
+def bench_recommend(scale: int, repeat: int) -> list[dict]:
+    import model as recommender_facade
+
+    fitted, le_dept = _reference_model_bundle()
+    companies = synthetic.companies_frame(scale)
+    profiles = _profiles(max(repeat + WARMUP_CALLS, BATCH_STUDENTS), seed=11)
+    results = []
+
+    with PeakRSS() as rss:
+        it = iter(profiles)
+        samples = _timed(
+            lambda: recommender_facade.recommend_for_new_student(next(it), companies, fitted, le_dept), repeat
+        )
+    results.append(_result("recommend_single", scale, samples, 1, "students", rss))
+
+    batch = profiles[:BATCH_STUDENTS]
+    batch_repeat = max(3, repeat // 20)
+    if scale * len(batch) > MAX_BATCH_PAIRS:
+        batch = batch[: max(1, MAX_BATCH_PAIRS // scale)]
+    with PeakRSS() as rss:
+        samples = _timed(
+            lambda: recommender_facade.recommend_for_students(batch, companies, fitted, le_dept), batch_repeat
+        )
+    results.append(_result("recommend_batch", scale, samples, len(batch), "students", rss, batch=len(batch)))
+    return results
+
+
+# --- Backend --------------------------------------------------------------------------
+
+def _backend_on_path() -> None:
+    """backend/ first, so `app` is the FastAPI package and not the Flask app.py at the root."""
+    if sys.path[:1] != [str(BACKEND_DIR)]:
+        while str(BACKEND_DIR) in sys.path:
+            sys.path.remove(str(BACKEND_DIR))
+        sys.path.insert(0, str(BACKEND_DIR))
+    app = sys.modules.get("app")
+    if app is not None and not hasattr(app, "__path__"):
+        raise RuntimeError("The Flask app.py is already imported as `app`; run the backend benchmarks in their own process.")
+
+
+def bench_matching(scale: int, repeat: int) -> list[dict]:
+    _backend_on_path()
+    from app.internship_index import InternshipIndex
+
+    rows = [
+        (i + 1, r["company_name"], r["suggested_role"], r["location"], r["min_cgpa"], r["field"], r["program"], None)
+        for i, r in enumerate(synthetic.internship_rows(scale))
+    ]
+    students = [
+        SimpleNamespace(cgpa=r["cgpa"], location=r["location"], skills=r["skills"])
+        for r in synthetic.student_rows(repeat + WARMUP_CALLS)
+    ]
+    with PeakRSS() as rss:
+        index = InternshipIndex.from_rows(rows)
+        it = iter(students)
+        samples = _timed(lambda: index.top_k(next(it), 10), repeat)
+    return [_result("match_batch", scale, samples, 1, "students", rss, pairs_per_student=scale)]
+
+
+_client = None
+
+
+def _configure_backend(db_path: Path) -> None:
+    """
+    Point the backend at the benchmark's own SQLite file. The backend reads
+    these at import time, so this runs before anything imports `app`.
+    """
+    os.environ["APP_DATABASE_URL"] = f"sqlite:///{db_path.as_posix()}"
+    os.environ["MATCH_CACHE_BACKEND"] = "off"  # time the work, not cache hits
+
+
+def _http_client():
+    """Import the FastAPI app once (it reads its settings at import time)."""
+    global _client
+    if _client is None:
+        _backend_on_path()
+        from fastapi.testclient import TestClient
+        from app.main import app
+
+        _client = TestClient(app)
+    return _client
+
+
+def _reseed(students: list[dict], internships: list[dict], db_path: Path) -> None:
+    from sqlalchemy import delete, insert
+
+    from app import models
+    from app.database import engine
+    from app.internship_index import internship_index
+
+    # This empties the tables, so never let it run against anything but the temp file.
+    target = engine.url.database
+    if engine.url.get_backend_name() != "sqlite" or not target or Path(target).resolve() != db_path.resolve():
+        raise RuntimeError(f"Refusing to reseed {engine.url!r}: the benchmark only writes to {db_path}.")
+    with engine.begin() as conn:
+        for table in (models.StudentSkill, models.Recommendation, models.Student, models.Internship):
+            conn.execute(delete(table))
+        for start in range(0, len(students), 50_000):
+            conn.execute(insert(models.Student), students[start:start + 50_000])
+        for start in range(0, len(internships), 50_000):
+            conn.execute(insert(models.Internship), internships[start:start + 50_000])
+    internship_index.mark_dirty()
+
+
+def bench_http(scale: int, repeat: int, max_rows: int, db_path: Path) -> list[dict]:
+    client = _http_client()
+    n = min(scale, max_rows)
+    _reseed(synthetic.student_rows(n), synthetic.internship_rows(n), db_path)
+    rng = np.random.default_rng(5)
+    ids = rng.integers(1, n + 1, size=repeat + WARMUP_CALLS).tolist()
+
+    client.get(f"/matching/match/{ids[0]}")  # build the internship index outside the timings
+    endpoints = {
+        "http_student_by_id": lambda i: f"/students/students/{i}",
+        "http_student_list": lambda i: "/students/students/?limit=25",
+        "http_match": lambda i: f"/matching/match/{i}?top_k=10",
+    }
+    results = []
+    for name, path in endpoints.items():
+        it = iter(ids)
+        with PeakRSS() as rss:
+            samples = _timed(lambda: client.get(path(next(it))).raise_for_status(), repeat)
+        results.append(_result(name, scale, samples, 1, "requests", rss, seeded_rows=n))
+    return results
+
+
+# --- Driver ----------------------------------------------------------------------------
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(scales: list[int], only: list[str], repeat: int, max_train_pairs: int, http_max_rows: int) -> dict:
+    report = {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "git_commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "scales": scales,
+            "repeat": repeat,
+        },
+        "results": [],
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "bench.db"
+        _configure_backend(db_path)
+        for scale in scales:
+            print(f"scale {scale}")
+            batches = []
+            if "train" in only:
+                batches.append(lambda: bench_train(scale, max_train_pairs))
+            if "recommend" in only:
+                batches.append(lambda: bench_recommend(scale, repeat))
+            if "matching" in only:
+                batches.append(lambda: bench_matching(scale, repeat))
+            if "http" in only:
+                batches.append(lambda: bench_http(scale, repeat, http_max_rows, db_path))
+            for batch in batches:
+                for result in batch():
+                    _log(result)
+                    report["results"].append(result)
+    return report
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Time training, recommendation, matching and HTTP endpoints.")
+    parser.add_argument("--scales", nargs="+", default=DEFAULT_SCALES, help="e.g. 1k 10k 100k 1M")
+    parser.add_argument("--only", nargs="+", choices=ALL_BENCHMARKS, default=ALL_BENCHMARKS)
+    parser.add_argument("--repeat", type=int, default=100, help="timed calls per latency benchmark")
+    parser.add_argument("--max-train-pairs", type=int, default=2_000_000)
+    parser.add_argument("--http-max-rows", type=int, default=100_000, help="cap on rows seeded for HTTP runs")
+    parser.add_argument("--out", type=Path, default=Path("bench_results.json"))
+    args = parser.parse_args(argv)
+
+    report = run([parse_scale(s) for s in args.scales], args.only, args.repeat,
+                 args.max_train_pairs, args.http_max_rows)
+    args.out.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"Wrote {args.out}")
+
+
+if __name__ == "__main__":
+    main()
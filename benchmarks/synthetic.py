@@ -0,0 +1,108 @@
+"""
+Synthetic data at any scale, in the shapes the code already consumes:
+
+- students_frame / companies_frame: the columns of `student dataset.csv` and
+  `company dataset.csv` (what recommender.training reads),
+- student_rows / internship_rows: column dicts for the backend ORM tables.
+
+Vocabularies (departments, degrees, skills) come from the shipped CSVs, so
+the generated data hits the same encoders and label rules as the real data.
+Everything is seeded, so two runs of the suite see identical inputs.
+"""
+from __future__ import annotations
+
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from recommender.training import load_datasets
+
+CITIES = ["Mumbai", "Delhi", "Pune", "Bangalore", "Chennai", "Hyderabad", "Kolkata", "Jaipur", ""]
+ROLE_WORDS = ["Software", "Data", "Web", "ML", "Python", "Java", "Cloud", "Security", "Design",
+              "Marketing", "Finance", "HR", "Embedded", "Testing", "Research", "Analyst"]
+
+
+@lru_cache(maxsize=1)
+def vocabulary() -> dict:
+    students, companies = load_datasets()
+    skills = set()
+    for column in (students["skills"], companies["skills_required"]):
+        for value in column.astype(str):
+            skills.update(s.strip() for s in value.split(",") if s.strip())
+    return {
+        "departments": sorted(students["department"].astype(str).unique()),
+        "degrees": sorted(students["degree"].astype(str).unique()),
+        "skills": sorted(skills),
+    }
+
+
+def _join_samples(rng: np.random.Generator, items: list[str], n: int, low: int, high: int) -> list[str]:
+    """n comma-joined samples of low..high distinct items each."""
+    items = np.asarray(items)
+    counts = rng.integers(low, high + 1, size=n)
+    out: list[str] = []
+    for start in range(0, n, 100_000):  # bounded memory at the 1M scale
+        stop = min(n, start + 100_000)
+        picks = np.argsort(rng.random((stop - start, len(items))), axis=1)  # a permutation per row
+        out.extend(",".join(items[row[:k]]) for row, k in zip(picks, counts[start:stop]))
+    return out
+
+
+def students_frame(n: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    vocab = vocabulary()
+    return pd.DataFrame({
+        "student_id": [f"S{i + 1}" for i in range(n)],
+        "cgpa": np.round(rng.uniform(5.0, 10.0, n), 2),
+        "degree": rng.choice(vocab["degrees"], n),
+        "department": rng.choice(vocab["departments"], n),
+        "skills": _join_samples(rng, vocab["skills"], n, 3, 7),
+        "projects": rng.integers(0, 6, n),
+    })
+
+
+def companies_frame(n: int, seed: int = 1) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    vocab = vocabulary()
+    return pd.DataFrame({
+        "company": [f"Company_{i + 1}" for i in range(n)],
+        "departments": _join_samples(rng, vocab["departments"], n, 1, 3),
+        "skills_required": _join_samples(rng, vocab["skills"], n, 1, 3),
+        "min_cgpa": np.round(rng.uniform(6.0, 8.0, n), 2),
+        "min_projects": rng.integers(0, 4, n),
+    })
+
+
+def student_rows(n: int, seed: int = 2) -> list[dict]:
+    """Rows for models.Student (emails unique, skills in the CSV vocabulary)."""
+    rng = np.random.default_rng(seed)
+    vocab = vocabulary()
+    cgpa = np.round(rng.uniform(5.0, 10.0, n), 2)
+    cities = rng.choice(CITIES, n)
+    degrees = rng.choice(vocab["degrees"], n)
+    skills = _join_samples(rng, vocab["skills"], n, 2, 6)
+    return [
+        {
+            "full_name": f"Student {i + 1}", "email": f"student{i + 1}@example.com", "password": "benchpw",
+            "college": "Bench College", "cgpa": float(cgpa[i]), "location": str(cities[i]),
+            "skills": skills[i].replace(",", ", "), "qualification": str(degrees[i]), "bio": None,
+        }
+        for i in range(n)
+    ]
+
+
+def internship_rows(n: int, seed: int = 3) -> list[dict]:
+    """Rows for models.Internship."""
+    rng = np.random.default_rng(seed)
+    min_cgpa = np.round(rng.uniform(5.0, 9.0, n), 1)
+    cities = rng.choice(CITIES, n)
+    roles = _join_samples(rng, ROLE_WORDS, n, 1, 3)
+    return [
+        {
+            "company_name": f"Company {i + 1}", "suggested_role": roles[i].replace(",", " ") + " Intern",
+            "location": str(cities[i]), "min_cgpa": float(min_cgpa[i]), "field": "B.Tech",
+            "program": "PM Internship", "description": None,
+        }
+        for i in range(n)
+    ]
@@ -0,0 +1 @@
+# Present so pytest puts the repository root on sys.path (tests import recommender, model, ...).
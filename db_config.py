@@ -0,0 +1,18 @@
+"""
+MySQL connection settings, shared by the Flask app and
+recommendation_pipeline.py (which shouldn't have to import the whole web app):
+
+    DB_HOST / DB_USER / DB_PASS / DB_NAME   (a .env file works too)
+"""
+import os
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+DB_CONFIG = {
+    'host': os.getenv("DB_HOST", "localhost"),
+    'user': os.getenv("DB_USER", "root"),
+    'password': os.getenv("DB_PASS", ""),
+    'database': os.getenv("DB_NAME", "internsetu_db")
+}
@@ -0,0 +1,165 @@
+"""
+MySQL connection pool for the Flask app.
+
+mysql.connector.pooling has a fixed size, no overflow, no recycling and raises
+as soon as it is empty, so this is a small equivalent with those knobs:
+
+    DB_POOL_SIZE      connections kept open (default 5)
+    DB_POOL_OVERFLOW  extra connections allowed under bursts, closed on return (default 10)
+    DB_POOL_TIMEOUT   seconds to wait for a free connection before giving up (default 2)
+    DB_POOL_RECYCLE   reconnect connections older than this many seconds (default 1800, 0 = never)
+    DB_POOL_PRE_PING  check a connection is alive before handing it out (default 1)
+"""
+import os
+import queue
+import threading
+import time
+
+import mysql.connector
+from mysql.connector import Error
+
+
+class PoolExhausted(Exception):
+    """No connection became free within the pool timeout."""
+
+
+class ConnectionPool:
+    def __init__(self, db_config, size=5, max_overflow=10, timeout=2.0, recycle=1800, pre_ping=True):
+        self.db_config = dict(db_config)
+        self.size = size
+        self.max_overflow = max_overflow
+        self.timeout = timeout
+        self.recycle = recycle
+        self.pre_ping = pre_ping
+
+        self._idle = queue.LifoQueue()  # most recently used first: warmest connection
+        self._lock = threading.Lock()
+        self._open = 0          # connections currently open (idle + checked out)
+        self._checked_out = 0
+        self._created_at = {}   # id(conn) -> creation time, for recycling
+        self._stats = {"checkouts": 0, "created": 0, "recycled": 0, "ping_failures": 0,
+                       "exhausted": 0, "wait_seconds": 0.0}
+
+    @classmethod
+    def from_env(cls, db_config):
+        return cls(
+            db_config,
+            size=int(os.getenv("DB_POOL_SIZE", "5")),
+            max_overflow=int(os.getenv("DB_POOL_OVERFLOW", "10")),
+            timeout=float(os.getenv("DB_POOL_TIMEOUT", "2")),
+            recycle=int(os.getenv("DB_POOL_RECYCLE", "1800")),
+            pre_ping=os.getenv("DB_POOL_PRE_PING", "1") not in ("0", "false", "False"),
+        )
+
+    # ------------------------------
+    # CHECKOUT / CHECKIN
+    # ------------------------------
+    def _connect(self):
+        conn = mysql.connector.connect(**self.db_config)
+        self._created_at[id(conn)] = time.monotonic()
+        self._stats["created"] += 1
+        return conn
+
+    def _discard(self, conn):
+        self._created_at.pop(id(conn), None)
+        try:
+            conn.close()
+        except Error:
+            pass
+        with self._lock:
+            self._open -= 1
+
+    def _reserve_slot(self):
+        """Claim room for a brand-new connection, if size + overflow allows it."""
+        with self._lock:
+            if self._open < self.size + self.max_overflow:
+                self._open += 1
+                return True
+            return False
+
+    def _new_connection(self):
+        try:
+            return self._connect()
+        except Error:
+            with self._lock:
+                self._open -= 1
+            raise
+
+    def _usable(self, conn):
+        """Apply recycle + pre-ping; returns a live connection or None."""
+        age = time.monotonic() - self._created_at.get(id(conn), 0)
+        if self.recycle and age > self.recycle:
+            self._stats["recycled"] += 1
+            self._discard(conn)
+            return None
+        if self.pre_ping:
+            try:
+                conn.ping(reconnect=False)
+            except Error:
+                self._stats["ping_failures"] += 1
+                self._discard(conn)
+                return None
+        return conn
+
+    def checkout(self):
+        started = time.monotonic()
+        deadline = started + self.timeout
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                conn = None
+                if self._reserve_slot():
+                    conn = self._new_connection()
+                else:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._stats["exhausted"] += 1
+                        raise PoolExhausted(
+                            f"all {self.size + self.max_overflow} connections busy for {self.timeout}s"
+                        )
+                    try:
+                        conn = self._idle.get(timeout=remaining)
+                    except queue.Empty:
+                        continue
+                    conn = self._usable(conn)
+            else:
+                conn = self._usable(conn)
+
+            if conn is not None:
+                with self._lock:
+                    self._checked_out += 1
+                self._stats["checkouts"] += 1
+                self._stats["wait_seconds"] += time.monotonic() - started
+                return conn
+
+    def checkin(self, conn):
+        with self._lock:
+            self._checked_out -= 1
+            over_size = self._open > self.size
+        try:
+            if over_size or not conn.is_connected():
+                # Overflow connections are only for bursts; don't keep them around.
+                self._discard(conn)
+                return
+            conn.rollback()  # never hand the next request an open transaction
+        except Error:
+            self._discard(conn)
+            return
+        self._idle.put(conn)
+
+    # ------------------------------
+    # METRICS
+    # ------------------------------
+    def metrics(self):
+        with self._lock:
+            open_, checked_out = self._open, self._checked_out
+        return {
+            "size": self.size,
+            "max_overflow": self.max_overflow,
+            "open": open_,
+            "checked_out": checked_out,
+            "idle": self._idle.qsize(),
+            "overflow_in_use": max(0, open_ - self.size),
+            **{k: round(v, 4) if isinstance(v, float) else v for k, v in self._stats.items()},
+        }
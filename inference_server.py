@@ -0,0 +1,59 @@
+"""
+Host-wide inference server for the recommendation model.
+
+    python inference_server.py                                   # Unix socket (INFERENCE_SOCKET)
+    python inference_server.py --socket 127.0.0.1:7311 --window-ms 5 --max-batch 64
+    RECOMMEND_SERVING=socket gunicorn app:app ...                # web workers become clients
+
+Loads the latest bundle once, then answers every web worker on this host
+through one micro-batcher: requests arriving within the batch window share a
+single predict_proba call (see recommender/serving.py for the protocol).
+"""
+import argparse
+import signal
+import sys
+
+import model
+from recommender import serving
+from telemetry import registry
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve batched recommendations over a local socket.")
+    parser.add_argument("--socket", default=serving.SOCKET_ADDRESS, help="Unix socket path or host:port")
+    parser.add_argument("--window-ms", type=float, default=serving.BATCH_WINDOW * 1000)
+    parser.add_argument("--max-batch", type=int, default=serving.MAX_BATCH)
+    args = parser.parse_args(argv)
+
+    bundle = model.get_bundle()
+    bundle.predictor, bundle.dept_encoder, bundle.companies  # load now, not on the first request
+    batcher = serving.MicroBatcher(
+        serving.recommendation_handler(model.recommend_with_bundle), args.window_ms / 1000, args.max_batch
+    )
+
+    def recommend(request):
+        return batcher((request["profile"], float(request.get("threshold", 0.5))))
+
+    def stats(_request):
+        candidates = {dict(labels)["stage"]: value for labels, value in registry.counter("recommend_candidates_total").items()}
+        profiles = registry.counter("recommend_profiles_total").get((), 0)
+        return {"bundle": model.get_bundle().version, **batcher.stats,
+                "profiles": profiles, "candidates": candidates}
+
+    def reload(_request):
+        return model.reload_bundle().version
+
+    server = serving.make_server(args.socket, {"recommend": recommend, "stats": stats, "reload": reload})
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    print(f"🚀 Serving bundle {bundle.version} on {args.socket} "
+          f"(window {args.window_ms:g} ms, max batch {args.max_batch})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -15,6 +15,7 @@ CREATE TABLE IF NOT EXISTS students (
     location VARCHAR(100),
     field VARCHAR(100),                       -- e.g. 'B.Tech', 'MBA', 'BCA'
     skills TEXT,
+    field_key VARCHAR(100) NULL,             -- normalized field, set by recommendation_pipeline.py
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     CHECK (CHAR_LENGTH(hashed_password) >= 60) -- bcrypt hashes are ~60 chars; optional depending on MySQL version
 );
@@ -31,6 +32,7 @@ CREATE TABLE IF NOT EXISTS internships (
     program VARCHAR(100) DEFAULT 'PM Internship',
     description TEXT,
     apply_link VARCHAR(500),
+    field_key VARCHAR(100) NULL,             -- normalized field, set by recommendation_pipeline.py
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
@@ -78,34 +80,19 @@ CREATE INDEX idx_internships_field_location ON internships(field, location);
 DROP INDEX IF EXISTS idx_internships_min_cgpa ON internships;
 CREATE INDEX idx_internships_min_cgpa ON internships(min_cgpa);
 
--- TRIGGER: after inserting a student, create recommendations automatically
--- Note: trigger uses flexible field matching (exact OR substring) and respects Remote/Onsite
+DROP INDEX IF EXISTS idx_students_field_key_cgpa ON students;
+CREATE INDEX idx_students_field_key_cgpa ON students(field_key, cgpa);
+
+DROP INDEX IF EXISTS idx_internships_field_key ON internships;
+CREATE INDEX idx_internships_field_key ON internships(field_key);
+
+-- RECOMMENDATIONS: generated by recommendation_pipeline.py
+-- The old trg_after_student_insert trigger matched every insert against all
+-- internships with LOWER(...) LIKE '%...%' (no index can serve that) inside
+-- the insert transaction. Rows now land with field_key NULL and the pipeline
+-- fills field_key and writes recommendations in both directions
+-- (run `python recommendation_pipeline.py --once` after loading sample data).
 DROP TRIGGER IF EXISTS trg_after_student_insert;
-DELIMITER $$
-CREATE TRIGGER trg_after_student_insert
-AFTER INSERT ON students
-FOR EACH ROW
-BEGIN
-    INSERT IGNORE INTO recommendations (student_id, internship_id, reason)
-    SELECT NEW.student_id, i.internship_id,
-           CONCAT('Matches field "', i.field, '" | min CGPA ', i.min_cgpa, ' | ', i.mode, ' in ', COALESCE(i.location,'Any'))
-    FROM internships i
-    WHERE
-      -- flexible field matching: exact or substring in either direction (case-insensitive)
-      (
-        LOWER(i.field) = LOWER(NEW.field)
-        OR LOWER(NEW.field) LIKE CONCAT('%', LOWER(i.field), '%')
-        OR LOWER(i.field) LIKE CONCAT('%', LOWER(NEW.field), '%')
-      )
-      AND NEW.cgpa >= i.min_cgpa
-      -- match by location OR allow remote OR if internship has no location specified
-      AND (
-            i.mode = 'Remote'
-            OR i.location IS NULL
-            OR LOWER(i.location) = LOWER(NEW.location)
-          );
-END$$
-DELIMITER ;
 
 -- VIEWS for convenience
 CREATE OR REPLACE VIEW student_recommendations AS
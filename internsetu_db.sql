@@ -14,6 +14,7 @@ CREATE TABLE IF NOT EXISTS students (
     location VARCHAR(100),
     field VARCHAR(100),                      
     skills TEXT,
+    field_key VARCHAR(100) NULL,             -- normalized field, set by recommendation_pipeline.py
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     CHECK (CHAR_LENGTH(hashed_password) >= 60)
 );
@@ -30,6 +31,7 @@ CREATE TABLE IF NOT EXISTS internships (
     program VARCHAR(100) DEFAULT 'PM Internship',
     description TEXT,
     apply_link VARCHAR(500),
+    field_key VARCHAR(100) NULL,             -- normalized field, set by recommendation_pipeline.py
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
@@ -79,33 +81,25 @@ DROP INDEX idx_internships_field_location ON internships;
 
 DROP INDEX idx_internships_min_cgpa ON internships;
 
+DROP INDEX idx_students_field_key_cgpa ON students;
+
+DROP INDEX idx_internships_field_key ON internships;
+
 CREATE INDEX idx_students_field_location ON students(field, location);
 CREATE INDEX idx_internships_field_location ON internships(field, location);
 CREATE INDEX idx_internships_min_cgpa ON internships(min_cgpa);
+CREATE INDEX idx_students_field_key_cgpa ON students(field_key, cgpa);
+CREATE INDEX idx_internships_field_key ON internships(field_key);
 
 -- ===========================================
--- TRIGGER: auto-generate recommendations
+-- RECOMMENDATIONS: generated by recommendation_pipeline.py
 -- ===========================================
+-- The old trg_after_student_insert trigger matched every insert against all
+-- internships with LOWER(...) LIKE '%...%' (no index can serve that) inside
+-- the insert transaction. Rows now land with field_key NULL and the pipeline
+-- fills field_key and writes recommendations in both directions
+-- (run `python recommendation_pipeline.py --once` after loading sample data).
 DROP TRIGGER IF EXISTS trg_after_student_insert;
-DELIMITER $$
-CREATE TRIGGER trg_after_student_insert
-AFTER INSERT ON students
-FOR EACH ROW
-BEGIN
-    INSERT IGNORE INTO recommendations (student_id, internship_id, reason)
-    SELECT NEW.student_id, i.internship_id,
-           CONCAT('Matches field "', i.field, '" | min CGPA ', i.min_cgpa, ' | ', i.mode, ' in ', COALESCE(i.location,'Any'))
-    FROM internships i
-    WHERE
-      (LOWER(i.field) = LOWER(NEW.field)
-        OR LOWER(NEW.field) LIKE CONCAT('%', LOWER(i.field), '%')
-        OR LOWER(i.field) LIKE CONCAT('%', LOWER(NEW.field), '%'))
-      AND NEW.cgpa >= i.min_cgpa
-      AND (i.mode = 'Remote'
-           OR i.location IS NULL
-           OR LOWER(i.location) = LOWER(NEW.location));
-END$$
-DELIMITER ;
 
 -- ===========================================
 -- VIEWS
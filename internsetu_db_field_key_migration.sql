@@ -0,0 +1,17 @@
+-- ===========================================
+-- MIGRATION: trigger -> recommendation_pipeline.py
+-- For databases created before field_key existed. Run once.
+-- ===========================================
+USE internsetu_db;
+
+DROP TRIGGER IF EXISTS trg_after_student_insert;
+
+ALTER TABLE students    ADD COLUMN field_key VARCHAR(100) NULL AFTER skills;
+ALTER TABLE internships ADD COLUMN field_key VARCHAR(100) NULL AFTER apply_link;
+
+CREATE INDEX idx_students_field_key_cgpa ON students(field_key, cgpa);
+CREATE INDEX idx_internships_field_key ON internships(field_key);
+
+-- Existing rows keep field_key NULL on purpose: the pipeline treats them as
+-- pending, normalizes them and (re)generates their recommendations with
+-- INSERT IGNORE, so rows the trigger already wrote are left as they are.
@@ -1,100 +1,147 @@
-import pandas as pd
-import numpy as np
-import pickle
-from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import LabelEncoder
-from sklearn.linear_model import LogisticRegression
-from sklearn.ensemble import RandomForestClassifier, GradientBoostingClassifier
-from sklearn.metrics import accuracy_score
+"""
+Serving-side access to the recommendation model.
+
+Importing this module is cheap: nothing is trained here. The latest bundle
+written by `python train.py` is loaded lazily the first time `best_model`,
+`le_dept`, `le_company` or `companies` is accessed.
+"""
+from recommender import eligibility, retrieval, serving
+from recommender.bundle import load_bundle
+from recommender.scoring import company_feature_matrix, rank_companies, score_matrix, score_shortlists
+from telemetry import registry, span
+
+_bundle = None
+_candidate_index = None  # (companies, model, le_dept, CandidateIndex)
+_eligibility_index = None  # (companies, EligibilityIndex)
+_batcher = None
+_client = None
+
+
+def get_bundle():
+    """Return the loaded bundle, loading it on first call."""
+    global _bundle
+    if _bundle is None:
+        _bundle = load_bundle()
+    return _bundle
+
+
+def reload_bundle():
+    """Drop the cached bundle so the next access picks up a newer version."""
+    global _bundle, _candidate_index, _eligibility_index
+    _bundle = None
+    _candidate_index = None
+    _eligibility_index = None
+    return get_bundle()
+
+
+def get_candidate_index(companies, model, le_dept):
+    """Two-stage retrieval index for this catalog + model (rebuilt if either changes)."""
+    global _candidate_index
+    cached = _candidate_index
+    if cached is None or cached[0] is not companies or cached[1] is not model or cached[2] is not le_dept:
+        departments = get_eligibility_index(companies).department_positions if eligibility.FILTERS else None
+        index = retrieval.CandidateIndex(model, le_dept, company_feature_matrix(companies),
+                                         department_positions=departments)
+        cached = _candidate_index = (companies, model, le_dept, index)
+    return cached[3]
+
+
+def get_eligibility_index(companies):
+    """Department -> companies index and min_cgpa/min_projects bounds for this catalog."""
+    global _eligibility_index
+    cached = _eligibility_index
+    if cached is None or cached[0] is not companies:
+        cached = _eligibility_index = (companies, eligibility.EligibilityIndex(companies))
+    return cached[1]
+
+
+def __getattr__(name):
+    # Lazy module attributes, so `model.best_model` etc. keep working for app.py.
+    if name == "best_model":
+        return get_bundle().predictor
+    if name == "le_dept":
+        return get_bundle().dept_encoder
+    if name == "le_company":
+        return get_bundle().encoders["company"]
+    if name == "companies":
+        return get_bundle().companies
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-# ---------------------------
-# LOAD DATA
-# ---------------------------
-students = pd.read_csv("student dataset.csv")       # ✅ same folder
-companies = pd.read_csv("company dataset.csv")  # ✅ same folder
-
-# Merge students with companies
-students['key'] = 1
-companies['key'] = 1
-data = students.merge(companies, on='key').drop('key', axis=1)
-
-# Target function
-def qualifies(row):
-    student_skills = str(row['skills']).lower().split(',')
-    required_skills = str(row['skills_required']).lower().split(',')
-    skills_match = all(skill.strip() in student_skills for skill in required_skills)
-    cgpa_match = row['cgpa'] >= row['min_cgpa']
-    projects_match = row['projects'] >= row['min_projects']
-    return int(skills_match and cgpa_match and projects_match)
-
-data['qualified'] = data.apply(qualifies, axis=1)
-
-# Encode categorical features
-le_dept = LabelEncoder()
-data['department'] = le_dept.fit_transform(data['department'])
-le_company = LabelEncoder()
-data['company'] = le_company.fit_transform(data['company'])
-
-# Features + Target
-X = data[['department', 'cgpa', 'projects', 'min_cgpa', 'min_projects']]
-y = data['qualified']
-
-# Split
-X_train, X_test, y_train, y_test = train_test_split(
-    X, y, test_size=0.2, random_state=42
-)
-
-# ---------------------------
-# TRAIN MODELS
-# ---------------------------
-models = {
-    "Logistic Regression": LogisticRegression(max_iter=1000),
-    "Random Forest": RandomForestClassifier(n_estimators=100, random_state=42),
-    "Gradient Boosting": GradientBoostingClassifier(random_state=42)
-}
-
-best_model = None
-best_acc = 0
-
-for name, model in models.items():
-    model.fit(X_train, y_train)
-    acc = accuracy_score(y_test, model.predict(X_test))
-    if acc > best_acc:
-        best_acc = acc
-        best_model = model
-
-print(f"\n✅ Best Model Selected: {type(best_model).__name__} with Accuracy = {best_acc:.3f}")
-
-# ---------------------------
-# SAVE TRAINED MODEL
-# ---------------------------
-with open("best_model.pkl", "wb") as f:
-    pickle.dump(best_model, f)
-
-with open("label_encoders.pkl", "wb") as f:
-    pickle.dump({"dept": le_dept, "company": le_company}, f)
 
 # ---------------------------
 # PREDICTION FUNCTION
 # ---------------------------
 def recommend_for_new_student(student_profile, companies, model, le_dept, threshold=0.5):
-    recommendations = []
-    for _, comp in companies.iterrows():
-        row = {
-            'department': le_dept.transform([student_profile['department']])[0],
-            'cgpa': student_profile['cgpa'],
-            'projects': student_profile['projects'],
-            'min_cgpa': comp['min_cgpa'],
-            'min_projects': comp['min_projects']
-        }
-        df_row = pd.DataFrame([row])
+    return recommend_for_students([student_profile], companies, model, le_dept, threshold)[0]
+
+
+@span("model_inference")
+def recommend_for_students(student_profiles, companies, model, le_dept, threshold=0.5, filter_stats=None):
+    """
+    Batch version: score every profile against every company in one
+    predict_proba call and return one recommendation list per profile.
+    Companies a student is not eligible for (department, min_cgpa,
+    min_projects; see recommender/eligibility.py) never reach the model.
+    With RECOMMEND_RETRIEVAL=ann and a big enough catalog, only each
+    student's shortlist from the candidate index is scored.
+    Pass a list as `filter_stats` to get each profile's per-filter counts.
+    """
+    profiles = list(student_profiles)
+    names = companies['company'].tolist()
+    allowed = None
+    if eligibility.FILTERS:
+        index = get_eligibility_index(companies)
+        allowed = []
+        for profile in profiles:
+            positions, stats = index.eligible(profile)
+            allowed.append(positions)
+            for stage, count in stats.items():
+                registry.inc("recommend_candidates_total", (("stage", stage),), count)
+            if filter_stats is not None:
+                filter_stats.append(stats)
+        registry.inc("recommend_profiles_total", (), len(profiles))
+
+    if retrieval.RETRIEVAL == "ann" and len(companies) >= retrieval.ANN_MIN_CATALOG:
+        ranked = get_candidate_index(companies, model, le_dept).recommend(profiles, names, threshold, allowed)
+    elif allowed is not None:
+        ranked = score_shortlists(profiles, company_feature_matrix(companies), allowed, model, le_dept, names, threshold)
+    else:
+        probs = score_matrix(profiles, company_feature_matrix(companies), model, le_dept)
+        ranked = [rank_companies(row, names, threshold) for row in probs]
+    return [recommendations if recommendations else [("None", 0.0)] for recommendations in ranked]
 
-        prob = model.predict_proba(df_row)[0][1] if hasattr(model, "predict_proba") else float(model.predict(df_row)[0])
-        if prob >= threshold:
-            recommendations.append((comp['company'], round(prob * 100, 2)))
 
-    recommendations.sort(key=lambda x: x[1], reverse=True)
-    return recommendations if recommendations else [("None", 0.0)]
+# ---------------------------
+# SERVING MODES
+# ---------------------------
+def recommend_with_bundle(student_profiles, threshold=0.5):
+    """recommend_for_students against the currently loaded bundle."""
+    bundle = get_bundle()
+    return recommend_for_students(student_profiles, bundle.companies, bundle.predictor, bundle.dept_encoder, threshold)
+
+
+def get_batcher():
+    """This process's micro-batcher over the loaded bundle (see recommender/serving.py)."""
+    global _batcher
+    if _batcher is None:
+        _batcher = serving.MicroBatcher(serving.recommendation_handler(recommend_with_bundle))
+    return _batcher
+
+
+def recommend(student_profile, threshold=0.5):
+    """
+    One student's recommendations, served per RECOMMEND_SERVING: scored right
+    here (direct), micro-batched with this worker's concurrent requests
+    (batched), or sent to the host's inference server (socket).
+    """
+    global _client
+    if serving.SERVING == "batched":
+        return get_batcher()((student_profile, threshold))
+    if serving.SERVING == "socket":
+        if _client is None:
+            _client = serving.InferenceClient()
+        return _client.recommend(student_profile, threshold)
+    return recommend_with_bundle([student_profile], threshold)[0]
 
 
 # ---------------------------
@@ -108,7 +155,8 @@ if __name__ == "__main__":
         "skills": "python,java"
     }
 
-    recs = recommend_for_new_student(new_student, companies, best_model, le_dept)
+    bundle = get_bundle()
+    recs = recommend_for_new_student(new_student, bundle.companies, bundle.predictor, bundle.dept_encoder)
     print("\n🎯 Recommended Companies:")
     for company, prob in recs:
         print(f"- {company}: {prob}% chance")
@@ -0,0 +1,110 @@
+"""
+Render cache for the Flask pages whose HTML depends only on their templates.
+
+    @app.route('/')
+    @cached_page
+    def index():
+        return render_template('index.html')
+
+The first GET renders the view as usual; later GETs reuse the stored bytes
+until one of the templates it rendered changes on disk. Every response
+carries a strong ETag (hash of the body) and Last-Modified (newest template
+mtime) with `Cache-Control: no-cache`, so browsers revalidate and get a
+304 with no body when nothing changed. POSTs always reach the view.
+
+    PAGE_CACHE   on (default) | off
+"""
+import hashlib
+import os
+import threading
+from datetime import datetime, timezone
+from functools import wraps
+
+from flask import make_response, request, template_rendered
+
+PAGE_CACHE = os.getenv("PAGE_CACHE", "on").lower()
+if PAGE_CACHE not in ("on", "off"):
+    raise ValueError(f"PAGE_CACHE must be 'on' or 'off', not {PAGE_CACHE!r}.")
+
+
+class RenderCache:
+    """(script root, path) -> rendered page, plus the template files it came from."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = {}
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _mtimes(paths):
+        try:
+            return tuple(os.stat(p).st_mtime for p in paths)
+        except OSError:
+            return None
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None or self._mtimes(entry["templates"]) != entry["mtimes"]:
+            return None
+        with self._lock:
+            self.hits += 1
+        return entry
+
+    def put(self, key, body, mimetype, templates):
+        mtimes = self._mtimes(templates)
+        entry = {
+            "body": body,
+            "mimetype": mimetype,
+            "etag": hashlib.sha256(body).hexdigest()[:32],
+            "last_modified": datetime.fromtimestamp(int(max(mtimes, default=0)), timezone.utc),
+            "templates": templates,
+            "mtimes": mtimes,
+        }
+        with self._lock:
+            self.misses += 1
+            if mtimes is not None:
+                self._entries[key] = entry
+        return entry
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+render_cache = RenderCache()
+
+
+def _render(view, args, kwargs):
+    """Run the view, recording which template files it rendered."""
+    used = []
+
+    def record(sender, template, context, **extra):
+        if template.filename:
+            used.append(template.filename)
+
+    with template_rendered.connected_to(record):
+        response = make_response(view(*args, **kwargs))
+    return response, tuple(dict.fromkeys(used))
+
+
+def cached_page(view):
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if PAGE_CACHE == "off" or request.method not in ("GET", "HEAD"):
+            return view(*args, **kwargs)
+        key = (request.script_root, request.path)
+        entry = render_cache.get(key)
+        if entry is None:
+            response, templates = _render(view, args, kwargs)
+            if response.status_code != 200 or not templates:
+                return response
+            entry = render_cache.put(key, response.get_data(), response.mimetype, templates)
+        response = make_response(entry["body"])
+        response.mimetype = entry["mimetype"]
+        response.set_etag(entry["etag"])
+        response.last_modified = entry["last_modified"]
+        response.cache_control.no_cache = True
+        return response.make_conditional(request)
+
+    return wrapper
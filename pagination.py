@@ -0,0 +1,57 @@
+"""
+Keyset pagination helpers for the Flask list pages.
+
+Pages are keyed on the primary key (`WHERE id > last_id ORDER BY id LIMIT n`),
+so page 1000 costs the same as page 1. The position is handed to clients as an
+opaque, URL-safe token rather than a raw id.
+"""
+import base64
+import json
+from datetime import date, datetime
+from decimal import Decimal
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+EXPORT_BATCH = 1000
+
+
+def encode_cursor(last_id):
+    raw = json.dumps({"after": int(last_id)}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token):
+    """Return the last seen id (0 for the first page); ValueError if the token is bad."""
+    if not token:
+        return 0
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        return int(json.loads(base64.urlsafe_b64decode(padded))["after"])
+    except (ValueError, KeyError, TypeError) as e:
+        raise ValueError("Invalid page cursor.") from e
+
+
+def page_size(value, default=DEFAULT_PAGE_SIZE):
+    try:
+        size = int(value) if value is not None else default
+    except ValueError:
+        size = default
+    return max(1, min(size, MAX_PAGE_SIZE))
+
+
+def _json_default(value):
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value)
+
+
+def ndjson_rows(cursor, batch=EXPORT_BATCH):
+    """Yield one JSON line per row from an already-executed, unbuffered cursor."""
+    while True:
+        rows = cursor.fetchmany(batch)
+        if not rows:
+            break
+        for row in rows:
+            yield json.dumps(row, default=_json_default) + "\n"
@@ -0,0 +1,210 @@
+"""
+Incremental recommendation generation (replaces trg_after_student_insert).
+
+    python recommendation_pipeline.py --once         # process everything pending, then exit
+    python recommendation_pipeline.py --interval 5   # keep polling in the background
+
+New students and internships are inserted with field_key NULL; that NULL is
+the "pending" marker. Each pass:
+
+  1. normalizes pending internships, adds them to the in-memory field index and
+     matches them against existing students (the direction the trigger never did),
+  2. normalizes pending students and matches them against the field index.
+
+Field matching keeps the trigger's rule (equal, or one contains the other) but
+compares normalized keys, and only over the few distinct keys, so no step
+scans a whole table. Writes use INSERT IGNORE, so re-running a pass is harmless.
+"""
+import argparse
+import re
+import time
+
+import mysql.connector
+
+from db_config import DB_CONFIG
+
+BATCH_SIZE = 500
+
+_NON_ALNUM = re.compile(r"[^a-z0-9]")
+
+
+def normalize_field(field):
+    """'B.Tech' / 'b tech' / 'BTECH' -> 'btech'. None stays None (never matches)."""
+    if field is None:
+        return None
+    return _NON_ALNUM.sub("", field.lower())
+
+
+def fields_match(a, b):
+    """The trigger's rule on normalized keys; empty keys match nothing."""
+    return bool(a) and bool(b) and (a == b or a in b or b in a)
+
+
+def _reason(job):
+    location = job["location"] if job["location"] is not None else "Any"
+    return f'Matches field "{job["field"]}" | min CGPA {job["min_cgpa"]} | {job["mode"]} in {location}'
+
+
+def _same_text(a, b):
+    return a is not None and b is not None and a.strip().lower() == b.strip().lower()
+
+
+def _location_ok(job, student_location):
+    return (
+        _same_text(job["mode"], "Remote")
+        or job["location"] is None
+        or _same_text(job["location"], student_location)
+    )
+
+
+class FieldIndex:
+    """field_key -> internships with that key (only the columns matching needs)."""
+
+    def __init__(self):
+        self.by_key = {}
+
+    def add(self, job):
+        self.by_key.setdefault(job["field_key"], []).append(job)
+
+    def load(self, cursor):
+        cursor.execute(
+            "SELECT internship_id, field, field_key, min_cgpa, mode, location "
+            "FROM internships WHERE field_key IS NOT NULL"
+        )
+        for job in cursor.fetchall():
+            self.add(job)
+
+    def candidates(self, student_key):
+        for key, jobs in self.by_key.items():
+            if fields_match(student_key, key):
+                yield from jobs
+
+    def __len__(self):
+        return sum(len(jobs) for jobs in self.by_key.values())
+
+
+class RecommendationPipeline:
+    def __init__(self, conn, batch_size=BATCH_SIZE):
+        self.conn = conn
+        self.batch_size = batch_size
+        self.cursor = conn.cursor(dictionary=True)
+        self.index = FieldIndex()
+        self.index.load(self.cursor)
+        self.conn.commit()
+
+    def _insert(self, rows):
+        if rows:
+            self.cursor.executemany(
+                "INSERT IGNORE INTO recommendations (student_id, internship_id, reason) VALUES (%s, %s, %s)",
+                rows,
+            )
+
+    def _set_keys(self, table, pk, items):
+        self.cursor.executemany(
+            f"UPDATE {table} SET field_key = %s WHERE {pk} = %s",
+            [(item["field_key"], item[pk]) for item in items],
+        )
+
+    def process_new_internships(self):
+        """Normalize pending internships and match each against existing students."""
+        self.cursor.execute(
+            "SELECT internship_id, field, min_cgpa, mode, location FROM internships "
+            "WHERE field_key IS NULL ORDER BY internship_id LIMIT %s",
+            (self.batch_size,),
+        )
+        jobs = self.cursor.fetchall()
+        if not jobs:
+            return 0
+
+        for job in jobs:
+            job["field_key"] = normalize_field(job["field"]) or ""
+        self._set_keys("internships", "internship_id", jobs)
+
+        # Distinct student keys are few; the (field_key, cgpa) index serves the rest.
+        self.cursor.execute("SELECT DISTINCT field_key FROM students WHERE field_key IS NOT NULL")
+        student_keys = [row["field_key"] for row in self.cursor.fetchall()]
+
+        rows = []
+        for job in jobs:
+            keys = [k for k in student_keys if fields_match(k, job["field_key"])]
+            if not keys:
+                continue
+            placeholders = ", ".join(["%s"] * len(keys))
+            self.cursor.execute(
+                f"SELECT student_id, location FROM students "
+                f"WHERE field_key IN ({placeholders}) AND cgpa >= %s",
+                (*keys, job["min_cgpa"]),
+            )
+            for student in self.cursor.fetchall():
+                if _location_ok(job, student["location"]):
+                    rows.append((student["student_id"], job["internship_id"], _reason(job)))
+        self._insert(rows)
+        self.conn.commit()
+
+        for job in jobs:
+            self.index.add(job)
+        return len(jobs)
+
+    def process_new_students(self):
+        """Normalize pending students and match them against the field index."""
+        self.cursor.execute(
+            "SELECT student_id, field, cgpa, location FROM students "
+            "WHERE field_key IS NULL ORDER BY student_id LIMIT %s",
+            (self.batch_size,),
+        )
+        students = self.cursor.fetchall()
+        if not students:
+            return 0
+
+        rows = []
+        for student in students:
+            # A NULL field never matched in the trigger; store '' to mark it done.
+            student["field_key"] = normalize_field(student["field"]) or ""
+            for job in self.index.candidates(student["field_key"]):
+                if student["cgpa"] >= job["min_cgpa"] and _location_ok(job, student["location"]):
+                    rows.append((student["student_id"], job["internship_id"], _reason(job)))
+        self._set_keys("students", "student_id", students)
+        self._insert(rows)
+        self.conn.commit()
+        return len(students)
+
+    def run_once(self):
+        """Drain everything pending. Internships first, so new pairs are made exactly once."""
+        stats = {"internships": 0, "students": 0}
+        while True:
+            done = self.process_new_internships()
+            stats["internships"] += done
+            if done < self.batch_size:
+                break
+        while True:
+            done = self.process_new_students()
+            stats["students"] += done
+            if done < self.batch_size:
+                break
+        return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate recommendations for new students/internships.")
+    parser.add_argument("--once", action="store_true", help="process what is pending and exit")
+    parser.add_argument("--interval", type=float, default=5.0, help="seconds between polls")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    args = parser.parse_args(argv)
+
+    conn = mysql.connector.connect(**DB_CONFIG)
+    try:
+        pipeline = RecommendationPipeline(conn, args.batch_size)
+        print(f"Field index loaded: {len(pipeline.index)} internships")
+        while True:
+            stats = pipeline.run_once()
+            if stats["students"] or stats["internships"]:
+                print(f"Processed {stats['internships']} internships, {stats['students']} students")
+            if args.once:
+                break
+            time.sleep(args.interval)
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,6 @@
+"""
+Offline training + serving helpers for the company recommendation model.
+
+`train.py` builds and saves a versioned bundle; `model.py` (what the Flask
+app imports) only ever loads that bundle, it never trains.
+"""
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import json
+import os
+import pickle
+from datetime import datetime, timezone
+from functools import cached_property
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from recommender.features import ROOT, FEATURE_COLUMNS, COMPANY_FEATURE_COLUMNS
+
+# --- Bundle layout ------------------------------------------------------------
+#   artifacts/models/LATEST                 -> name of the current version
+#   artifacts/models/<version>/manifest.json
+#   artifacts/models/<version>/model.pkl
+#   artifacts/models/<version>/encoders.pkl
+#   artifacts/models/<version>/companies.csv
+#   artifacts/models/<version>/company_features.npy   (memory-mapped on load)
+#   artifacts/models/<version>/training_report.json   (per-candidate scores and timings)
+# Override the root with MODEL_BUNDLE_DIR, or pin a version with MODEL_BUNDLE_VERSION.
+BUNDLE_FORMAT = 1
+# auto: serve compiled.npz when the bundle has one, handing big tree-model
+# batches to sklearn (see recommender/compiled.py); compiled: never import
+# sklearn; sklearn: always unpickle model.pkl.
+PREDICTOR = os.getenv("RECOMMEND_PREDICTOR", "auto").lower()
+if PREDICTOR not in ("auto", "compiled", "sklearn"):
+    raise ValueError(f"RECOMMEND_PREDICTOR must be 'auto', 'compiled' or 'sklearn', not {PREDICTOR!r}.")
+BUNDLE_ROOT = Path(os.getenv("MODEL_BUNDLE_DIR", ROOT / "artifacts" / "models"))
+LATEST_POINTER = "LATEST"
+REPORT_FILE = "training_report.json"
+
+
+def save_bundle(result: dict, companies: pd.DataFrame, root: Path = BUNDLE_ROOT) -> Path:
+    """Write a new bundle version from a `training.train()` result and point LATEST at it."""
+    version = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+    target = Path(root) / version
+    target.mkdir(parents=True, exist_ok=False)
+
+    with open(target / "model.pkl", "wb") as f:
+        pickle.dump(result["model"], f, protocol=pickle.HIGHEST_PROTOCOL)
+    with open(target / "encoders.pkl", "wb") as f:
+        pickle.dump(result["encoders"], f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    companies.to_csv(target / "companies.csv", index=False)
+    features = companies[COMPANY_FEATURE_COLUMNS].to_numpy(dtype=np.float64)
+    np.save(target / "company_features.npy", features)
+
+    manifest = {
+        "format": BUNDLE_FORMAT,
+        "version": version,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "feature_columns": FEATURE_COLUMNS,
+        "company_feature_columns": COMPANY_FEATURE_COLUMNS,
+        "metadata": result["metadata"],
+    }
+    (target / "manifest.json").write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    if result.get("report"):
+        (target / REPORT_FILE).write_text(json.dumps(result["report"], indent=2), encoding="utf-8")
+
+    # Swap the pointer last so readers never see a half-written version.
+    tmp = Path(root) / (LATEST_POINTER + ".tmp")
+    tmp.write_text(version, encoding="utf-8")
+    os.replace(tmp, Path(root) / LATEST_POINTER)
+    return target
+
+
+def resolve_bundle_dir(root: Path = BUNDLE_ROOT, version: str | None = None) -> Path:
+    version = version or os.getenv("MODEL_BUNDLE_VERSION")
+    if not version:
+        pointer = Path(root) / LATEST_POINTER
+        if not pointer.exists():
+            raise FileNotFoundError(
+                f"No model bundle found under {root}. Run `python train.py` first."
+            )
+        version = pointer.read_text(encoding="utf-8").strip()
+    path = Path(root) / version
+    if not (path / "manifest.json").exists():
+        raise FileNotFoundError(f"Model bundle {path} is missing manifest.json. Run `python train.py` to write a new one.")
+    return path
+
+
+class ModelBundle:
+    """
+    Read-only view over one saved bundle.
+    Only the manifest is read up front; everything else is loaded on first use,
+    and the company feature matrix is memory-mapped rather than copied.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.manifest = json.loads((self.path / "manifest.json").read_text(encoding="utf-8"))
+        if self.manifest.get("format") != BUNDLE_FORMAT:
+            raise ValueError(
+                f"Unsupported bundle format {self.manifest.get('format')!r} in {self.path}."
+            )
+
+    @property
+    def version(self) -> str:
+        return self.manifest["version"]
+
+    @property
+    def feature_columns(self) -> list[str]:
+        return self.manifest["feature_columns"]
+
+    @cached_property
+    def model(self):
+        with open(self.path / "model.pkl", "rb") as f:
+            return pickle.load(f)
+
+    @cached_property
+    def encoders(self) -> dict:
+        with open(self.path / "encoders.pkl", "rb") as f:
+            return pickle.load(f)
+
+    @cached_property
+    def companies(self) -> pd.DataFrame:
+        return pd.read_csv(self.path / "companies.csv")
+
+    @cached_property
+    def company_features(self) -> np.ndarray:
+        return np.load(self.path / "company_features.npy", mmap_mode="r")
+
+    @cached_property
+    def compiled(self):
+        """(CompiledModel, DepartmentClasses) from compiled.npz, or None."""
+        from recommender.compiled import load_compiled
+        return load_compiled(self.path)
+
+    @cached_property
+    def _auto_predictor(self):
+        from recommender.compiled import AutoPredictor
+        return AutoPredictor(self.compiled[0], lambda: self.model)
+
+    @property
+    def predictor(self):
+        """What serving scores with: the compiled export or the sklearn model (RECOMMEND_PREDICTOR)."""
+        if PREDICTOR == "compiled" and self.compiled is not None:
+            return self.compiled[0]
+        if PREDICTOR == "auto" and self.compiled is not None:
+            return self._auto_predictor
+        if PREDICTOR == "compiled":
+            raise FileNotFoundError(f"{self.path} has no compiled predictor; run `python -m recommender.compiled`.")
+        return self.model
+
+    @property
+    def dept_encoder(self):
+        """Department classes matching `predictor` (no sklearn import for the compiled one)."""
+        if PREDICTOR != "sklearn" and self.compiled is not None:
+            return self.compiled[1]
+        return self.encoders["dept"]
+
+    def __repr__(self) -> str:
+        return f"<ModelBundle {self.version} {self.manifest['metadata'].get('model_class')}>"
+
+
+def load_bundle(root: Path = BUNDLE_ROOT, version: str | None = None) -> ModelBundle:
+    return ModelBundle(resolve_bundle_dir(root, version))
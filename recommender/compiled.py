@@ -0,0 +1,325 @@
+from __future__ import annotations
+
+import os
+import sys
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+
+# ---------------------------
+# COMPILED PREDICTOR
+# ---------------------------
+# The selected model flattened into plain NumPy arrays (compiled.npz in the
+# bundle) plus a vectorized evaluator, so serving needs neither sklearn nor
+# its per-call input validation. Loading it never imports sklearn.
+#
+#   kind "linear":  P(1) = sigmoid(X @ coef + intercept)
+#   kind "forest":  every tree in one node table (feature / threshold / left /
+#                   right / value, children as absolute node ids, -1 = leaf);
+#                   P(1) = mean over trees of the leaf's class-1 share
+#   kind "boosted": same node table with regression leaves;
+#                   P(1) = sigmoid(baseline + learning_rate * sum of leaves)
+#
+# Export refuses to write a predictor that disagrees with sklearn (see check_parity).
+#
+# The NumPy tree walk beats sklearn while per-call overhead dominates, but
+# sklearn's Cython traversal wins on big batches (crossover ~200-500 rows for
+# the 100-tree ensembles). AutoPredictor therefore hands tree models calls
+# above COMPILED_TREE_MAX_ROWS to sklearn; linear models always stay compiled.
+COMPILED_FILE = "compiled.npz"
+TREE_MAX_ROWS = int(os.getenv("COMPILED_TREE_MAX_ROWS", "256"))
+COMPILED_FORMAT = 1
+PARITY_ATOL = 1e-9
+EVAL_CHUNK_ROWS = 65536  # bounds the (rows x trees) node-id matrix
+
+
+def _sigmoid(z: np.ndarray) -> np.ndarray:
+    out = np.empty_like(z)
+    pos = z >= 0
+    out[pos] = 1.0 / (1.0 + np.exp(-z[pos]))
+    ez = np.exp(z[~pos])
+    out[~pos] = ez / (1.0 + ez)
+    return out
+
+
+class DepartmentClasses:
+    """Stands in for the fitted LabelEncoder: encode_departments only needs classes_."""
+
+    def __init__(self, classes: np.ndarray):
+        self.classes_ = np.asarray(classes)
+
+    def transform(self, labels) -> np.ndarray:
+        from recommender.scoring import encode_departments
+        return encode_departments(labels, self).astype(np.int64)
+
+
+class CompiledModel:
+    takes_arrays = True  # predict_positive skips the DataFrame wrapper
+
+    def __init__(self, arrays: dict):
+        self.kind = str(arrays["kind"])
+        self.arrays = arrays
+        self.classes_ = np.asarray(arrays["classes"])
+        self.model_class = str(arrays["model_class"])
+        if self.kind in ("forest", "boosted"):
+            self.feature = arrays["feature"]
+            self.threshold = arrays["threshold"]
+            self.left = arrays["left"]
+            self.right = arrays["right"]
+            self.value = arrays["value"]
+            self.roots = arrays["roots"]
+
+    def _leaves(self, X: np.ndarray) -> np.ndarray:
+        """(rows, trees) leaf node ids."""
+        # Trees compare float32 features against float64 thresholds, like sklearn does.
+        X32 = np.ascontiguousarray(X, dtype=np.float32)
+        n_rows, n_features = X32.shape
+        n_trees = len(self.roots)
+        flat = X32.ravel()
+        # One slot per (row, tree); only slots still at an inner node are advanced.
+        node = np.tile(self.roots, n_rows)
+        row_start = np.repeat(np.arange(n_rows, dtype=np.int64) * n_features, n_trees)
+        active = np.flatnonzero(self.left[node] >= 0)
+        while len(active):
+            at = node[active]
+            go_left = flat[row_start[active] + self.feature[at]] <= self.threshold[at]
+            nxt = np.where(go_left, self.left[at], self.right[at])
+            node[active] = nxt
+            active = active[self.left[nxt] >= 0]
+        return node.reshape(n_rows, n_trees)
+
+    def _positive(self, X: np.ndarray) -> np.ndarray:
+        if self.kind == "linear":
+            return _sigmoid(X @ self.arrays["coef"] + float(self.arrays["intercept"]))
+        if self.kind == "constant":
+            return np.full(len(X), float(self.arrays["p"]))
+        leaves = self.value[self._leaves(X)]
+        if self.kind == "forest":
+            return leaves.mean(axis=1)
+        raw = float(self.arrays["baseline"]) + float(self.arrays["learning_rate"]) * leaves.sum(axis=1)
+        return _sigmoid(raw)
+
+    def predict_positive(self, X) -> np.ndarray:
+        X = np.asarray(X, dtype=np.float64)
+        if len(X) <= EVAL_CHUNK_ROWS:
+            return self._positive(X)
+        return np.concatenate([self._positive(X[i:i + EVAL_CHUNK_ROWS]) for i in range(0, len(X), EVAL_CHUNK_ROWS)])
+
+    def predict_proba(self, X) -> np.ndarray:
+        p = self.predict_positive(X)
+        return np.column_stack([1.0 - p, p])
+
+    def predict(self, X) -> np.ndarray:
+        return (self.predict_positive(X) > 0.5).astype(np.int64)
+
+    def __repr__(self) -> str:
+        return f"<CompiledModel {self.kind} from {self.model_class}>"
+
+
+class AutoPredictor:
+    """Compiled for small calls; big tree-ensemble batches go to the (lazily loaded) sklearn model."""
+
+    takes_arrays = True
+
+    def __init__(self, compiled: CompiledModel, load_sklearn: Callable[[], object], tree_max_rows: int = TREE_MAX_ROWS):
+        self.compiled = compiled
+        self.load_sklearn = load_sklearn
+        self.tree_max_rows = tree_max_rows
+        self.classes_ = compiled.classes_
+
+    def predict_positive(self, X) -> np.ndarray:
+        if self.compiled.kind in ("forest", "boosted") and len(X) > self.tree_max_rows:
+            from recommender.scoring import predict_positive
+            return predict_positive(self.load_sklearn(), np.asarray(X, dtype=np.float64))
+        return self.compiled.predict_positive(X)
+
+    def predict_proba(self, X) -> np.ndarray:
+        p = self.predict_positive(X)
+        return np.column_stack([1.0 - p, p])
+
+    def __repr__(self) -> str:
+        return f"<AutoPredictor {self.compiled!r}>"
+
+
+# ---------------------------
+# EXPORT (needs sklearn)
+# ---------------------------
+def _tree_table(trees, leaf_value) -> dict:
+    """Concatenate sklearn trees into one node table with absolute child ids."""
+    features, thresholds, lefts, rights, values, roots = [], [], [], [], [], []
+    offset, depth = 0, 0
+    for tree in trees:
+        t = tree.tree_
+        leaf = t.children_left < 0
+        roots.append(offset)
+        features.append(np.where(leaf, 0, t.feature).astype(np.int32))
+        thresholds.append(t.threshold.astype(np.float64))
+        lefts.append(np.where(leaf, -1, t.children_left + offset).astype(np.int32))
+        rights.append(np.where(leaf, -1, t.children_right + offset).astype(np.int32))
+        values.append(leaf_value(t).astype(np.float64))
+        offset += t.node_count
+        depth = max(depth, int(t.max_depth))
+    return {
+        "feature": np.concatenate(features),
+        "threshold": np.concatenate(thresholds),
+        "left": np.concatenate(lefts),
+        "right": np.concatenate(rights),
+        "value": np.concatenate(values),
+        "roots": np.asarray(roots, dtype=np.int32),
+        "max_depth": np.int64(depth),
+    }
+
+
+def export(model) -> dict:
+    """Flat arrays for a fitted LogisticRegression / RandomForest / GradientBoosting classifier."""
+    name = type(model).__name__
+    classes = np.asarray(model.classes_)
+    base = {"format": np.int64(COMPILED_FORMAT), "model_class": np.str_(name), "classes": classes}
+    positive = np.flatnonzero(classes == 1)
+    if len(classes) == 1:
+        # Trained on one class only: sklearn's predict_proba has a single column.
+        return {**base, "kind": np.str_("constant"), "p": np.float64(1.0 if classes[0] == 1 else 0.0)}
+    if len(classes) != 2 or not len(positive):
+        raise ValueError(f"Only binary 0/1 models can be compiled (classes {classes.tolist()}).")
+    pos = int(positive[0])
+
+    if name == "LogisticRegression":
+        coef, intercept = model.coef_[0].astype(np.float64), float(model.intercept_[0])
+        if pos == 0:  # sklearn's decision function is for classes_[1]
+            coef, intercept = -coef, -intercept
+        return {**base, "kind": np.str_("linear"), "coef": coef, "intercept": np.float64(intercept)}
+
+    if name == "RandomForestClassifier":
+        def leaf_share(t):
+            counts = t.value[:, 0, :]
+            total = counts.sum(axis=1)
+            total[total == 0] = 1.0
+            return counts[:, pos] / total
+        return {**base, "kind": np.str_("forest"), **_tree_table(model.estimators_, leaf_share)}
+
+    if name == "GradientBoostingClassifier":
+        if pos == 0:
+            raise ValueError("GradientBoostingClassifier with class 1 first is not supported.")
+        trees = model.estimators_[:, 0]
+        table = _tree_table(trees, lambda t: t.value[:, 0, 0])
+        # The init estimator's raw score is constant: recover it from one row.
+        probe = np.zeros((1, model.n_features_in_), dtype=np.float64)
+        staged = sum(float(tree.predict(probe.astype(np.float32))[0]) for tree in trees)
+        names = getattr(model, "feature_names_in_", None)
+        if names is not None:
+            import pandas as pd
+            probe = pd.DataFrame(probe, columns=list(names))
+        baseline = float(model.decision_function(probe)[0]) - model.learning_rate * staged
+        return {**base, "kind": np.str_("boosted"), **table,
+                "baseline": np.float64(baseline), "learning_rate": np.float64(model.learning_rate)}
+
+    raise ValueError(f"Don't know how to compile {name}.")
+
+
+def parity_inputs(le_dept, company_features: np.ndarray, n: int = 20000, seed: int = 0) -> np.ndarray:
+    """Realistic feature rows: every department, the catalog's requirements, and edge values."""
+    rng = np.random.default_rng(seed)
+    company_features = np.asarray(company_features, dtype=np.float64)
+    X = np.empty((n, 5), dtype=np.float64)
+    X[:, 0] = rng.integers(0, len(le_dept.classes_), n)
+    X[:, 1] = np.round(rng.uniform(4.0, 10.0, n), 2)
+    X[:, 2] = rng.integers(0, 8, n)
+    X[:, 3:] = company_features[rng.integers(0, len(company_features), n)]
+    # Exactly on the requirement, where a tree split is most likely to sit.
+    X[: n // 4, 1] = X[: n // 4, 3]
+    X[: n // 4, 2] = X[: n // 4, 4]
+    return X
+
+
+def check_parity(model, compiled: CompiledModel, X: np.ndarray, atol: float = PARITY_ATOL) -> dict:
+    """Compare compiled P(qualified) with sklearn's on X."""
+    import pandas as pd
+
+    from recommender.features import FEATURE_COLUMNS
+
+    proba = model.predict_proba(pd.DataFrame(X, columns=FEATURE_COLUMNS))
+    expected = proba[:, list(model.classes_).index(1)] if 1 in model.classes_ else np.zeros(len(X))
+    got = compiled.predict_positive(X)
+    diff = np.abs(expected - got)
+    return {
+        "rows": int(len(X)),
+        "max_abs_diff": float(diff.max()) if len(diff) else 0.0,
+        "decision_mismatches": int(((expected >= 0.5) != (got >= 0.5)).sum()),
+        "ok": bool(len(diff) == 0 or diff.max() <= atol),
+    }
+
+
+def save_compiled(bundle_dir: Path, model, le_dept, company_features: np.ndarray) -> dict:
+    """Export, verify against sklearn, then write compiled.npz next to model.pkl."""
+    arrays = export(model)
+    arrays["dept_classes"] = np.asarray(le_dept.classes_).astype(str)
+    report = check_parity(model, CompiledModel(arrays), parity_inputs(le_dept, company_features))
+    if not report["ok"]:
+        raise ValueError(f"Compiled predictor disagrees with sklearn: {report}")
+    tmp = Path(bundle_dir) / (COMPILED_FILE + ".tmp.npz")
+    np.savez(tmp, **arrays)
+    tmp.replace(Path(bundle_dir) / COMPILED_FILE)
+    return report
+
+
+# ---------------------------
+# LOAD (no sklearn)
+# ---------------------------
+def load_compiled(bundle_dir: Path) -> tuple[CompiledModel, DepartmentClasses] | None:
+    path = Path(bundle_dir) / COMPILED_FILE
+    if not path.exists():
+        return None
+    with np.load(path, allow_pickle=False) as data:
+        arrays = {key: data[key] for key in data.files}
+    if int(arrays["format"]) != COMPILED_FORMAT:
+        return None
+    return CompiledModel(arrays), DepartmentClasses(arrays["dept_classes"])
+
+
+# ---------------------------
+# CLI
+# ---------------------------
+#   python -m recommender.compiled              # export + parity check for the LATEST bundle
+#   python -m recommender.compiled --check      # re-check an existing compiled.npz
+def main(argv=None) -> int:
+    import argparse
+    import time
+
+    import pandas as pd
+
+    from recommender.bundle import BUNDLE_ROOT, load_bundle
+    from recommender.features import FEATURE_COLUMNS
+
+    parser = argparse.ArgumentParser(description="Export the bundle's model to a pure-NumPy predictor.")
+    parser.add_argument("--root", type=Path, default=BUNDLE_ROOT)
+    parser.add_argument("--version", default=None)
+    parser.add_argument("--check", action="store_true", help="only compare an existing export with sklearn")
+    args = parser.parse_args(argv)
+
+    bundle = load_bundle(args.root, args.version)
+    le_dept = bundle.encoders["dept"]
+    if args.check:
+        loaded = load_compiled(bundle.path)
+        if loaded is None:
+            print(f"No {COMPILED_FILE} in {bundle.path}.")
+            return 1
+        report = check_parity(bundle.model, loaded[0], parity_inputs(le_dept, bundle.company_features, seed=1))
+    else:
+        report = save_compiled(bundle.path, bundle.model, le_dept, bundle.company_features)
+
+    compiled = load_compiled(bundle.path)[0]
+    X = parity_inputs(le_dept, bundle.company_features, n=100, seed=2)
+    frame = pd.DataFrame(X, columns=FEATURE_COLUMNS)
+    timings = {"sklearn": lambda: bundle.model.predict_proba(frame), "compiled": lambda: compiled.predict_positive(X)}
+    for label, fn in timings.items():
+        started = time.perf_counter()
+        for _ in range(200):
+            fn()
+        report[f"{label}_us_per_100_rows"] = round((time.perf_counter() - started) / 200 * 1e6, 1)
+    print(f"{compiled!r} in {bundle.path}: {report}")
+    return 0 if report["ok"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
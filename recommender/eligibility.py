@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import os
+
+import numpy as np
+import pandas as pd
+
+# ---------------------------
+# ELIGIBILITY PRE-FILTER
+# ---------------------------
+# Hard rules applied before any company reaches predict_proba:
+#
+#   department     the student's department is listed in the company's
+#                  `departments` column ("IT,CE,EEE"); companies with no
+#                  departments listed are open to everyone
+#   min_cgpa       cgpa >= min_cgpa      (a label rule, so the model would
+#   min_projects   projects >= min_projects  score these as unqualified anyway)
+#
+# The department -> companies index is built once per catalog. Each call
+# reports how many candidates every filter removed. Set RECOMMEND_FILTERS to a
+# comma-separated subset (or to an empty string for none).
+KNOWN_FILTERS = ("department", "min_cgpa", "min_projects")
+FILTERS = tuple(f.strip() for f in os.getenv("RECOMMEND_FILTERS", ",".join(KNOWN_FILTERS)).lower().split(",") if f.strip())
+if set(FILTERS) - set(KNOWN_FILTERS):
+    raise ValueError(f"RECOMMEND_FILTERS may only name {', '.join(KNOWN_FILTERS)}, not {FILTERS!r}.")
+
+
+def department_key(value) -> str:
+    return str(value).strip().upper()
+
+
+def split_departments(value) -> list[str]:
+    """'IT, CE,EEE' -> ['IT', 'CE', 'EEE']; blank or missing -> []."""
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return []
+    return [department_key(d) for d in str(value).split(",") if d.strip()]
+
+
+class EligibilityIndex:
+    def __init__(self, companies: pd.DataFrame, filters: tuple[str, ...] = FILTERS):
+        self.filters = filters
+        self.n_companies = len(companies)
+        self.min_cgpa = companies["min_cgpa"].to_numpy(dtype=np.float64)
+        self.min_projects = companies["min_projects"].to_numpy(dtype=np.float64)
+
+        listed = companies["departments"] if "departments" in companies else pd.Series([None] * len(companies))
+        by_department: dict[str, list[int]] = {}
+        open_to_all = []
+        for position, value in enumerate(listed):
+            departments = split_departments(value)
+            if not departments:
+                open_to_all.append(position)
+            for department in set(departments):
+                by_department.setdefault(department, []).append(position)
+        self.open_to_all = np.asarray(open_to_all, dtype=np.int64)
+        # Sorted catalog positions, so shortlists keep catalog order for ties.
+        self.by_department = {
+            d: np.union1d(np.asarray(p, dtype=np.int64), self.open_to_all) for d, p in by_department.items()
+        }
+
+    def department_positions(self, department: str) -> np.ndarray:
+        """Sorted catalog positions open to `department` (all of them with the filter off)."""
+        if "department" not in self.filters:
+            return np.arange(self.n_companies)
+        return self.by_department.get(department_key(department), self.open_to_all)
+
+    def eligible(self, profile: dict) -> tuple[np.ndarray, dict]:
+        """(sorted catalog positions that pass every filter, candidates removed per filter)."""
+        stats = {"catalog": self.n_companies}
+        positions = self.department_positions(profile["department"])
+        if "department" in self.filters:
+            stats["department"] = self.n_companies - len(positions)
+        for name, bound, value in (("min_cgpa", self.min_cgpa, profile["cgpa"]),
+                                   ("min_projects", self.min_projects, profile["projects"])):
+            if name in self.filters:
+                kept = positions[bound[positions] <= float(value)]
+                stats[name] = len(positions) - len(kept)
+                positions = kept
+        stats["scored"] = len(positions)
+        return positions, stats
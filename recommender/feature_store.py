@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from recommender.features import ROOT, FEATURE_COLUMNS
+
+# ---------------------------
+# FEATURE / LABEL STORE
+# ---------------------------
+# Every labelled student x company pair the model has been trained on, as
+# append-only .npy shards, plus a manifest of which students and companies
+# (by id and a digest of their row) are already covered:
+#
+#   artifacts/feature_store/manifest.json
+#   artifacts/feature_store/shard-00000.X.npy   (rows, FEATURE_COLUMNS) float32
+#   artifacts/feature_store/shard-00000.y.npy   (rows,) int8
+#
+# A full training run rewrites the store; incremental runs only append the
+# pairs that involve a new student or a new company. Override the location
+# with FEATURE_STORE_DIR.
+STORE_FORMAT = 2  # 2: float32 features
+STORE_ROOT = Path(os.getenv("FEATURE_STORE_DIR", ROOT / "artifacts" / "feature_store"))
+STUDENT_KEY = "student_id"
+COMPANY_KEY = "company"
+
+
+def row_digests(frame: pd.DataFrame, key: str) -> dict[str, str]:
+    """id -> short digest of the whole row, to tell changed rows from new ones."""
+    values = frame.astype(str).to_numpy()
+    ids = frame[key].astype(str).tolist()
+    return {i: hashlib.blake2b("\x1f".join(row).encode("utf-8"), digest_size=8).hexdigest()
+            for i, row in zip(ids, values)}
+
+
+class FeatureStore:
+    def __init__(self, root: Path = STORE_ROOT):
+        self.root = Path(root)
+        path = self.root / "manifest.json"
+        self.manifest = json.loads(path.read_text(encoding="utf-8")) if path.exists() else None
+        if self.manifest is not None and self.manifest.get("format") != STORE_FORMAT:
+            self.manifest = None  # unknown layout: the next full run rebuilds it
+
+    @property
+    def exists(self) -> bool:
+        return self.manifest is not None
+
+    @property
+    def rows(self) -> int:
+        return self.manifest["rows"] if self.manifest else 0
+
+    @property
+    def positive_rate(self) -> float:
+        return self.manifest["positives"] / self.manifest["rows"] if self.rows else 0.0
+
+    def diff(self, students: pd.DataFrame, companies: pd.DataFrame) -> dict:
+        """New / changed / removed students and companies relative to the store."""
+        out = {}
+        for kind, frame, key in (("students", students, STUDENT_KEY), ("companies", companies, COMPANY_KEY)):
+            known = self.manifest[kind] if self.manifest else {}
+            current = row_digests(frame, key)
+            out[f"new_{kind}"] = frame[[k not in known for k in current]]
+            out[f"changed_{kind}"] = sorted(k for k, d in current.items() if k in known and known[k] != d)
+            out[f"removed_{kind}"] = sorted(known.keys() - current.keys())
+        return out
+
+    def load(self) -> tuple[np.ndarray, np.ndarray]:
+        """All stored pairs (shards are memory-mapped, then concatenated once)."""
+        shards = self.manifest["shards"] if self.manifest else []
+        if not shards:
+            return np.empty((0, len(FEATURE_COLUMNS)), dtype=np.float32), np.empty(0, dtype=np.int8)
+        X = np.concatenate([np.load(self.root / f"{s['name']}.X.npy", mmap_mode="r") for s in shards])
+        y = np.concatenate([np.load(self.root / f"{s['name']}.y.npy", mmap_mode="r") for s in shards])
+        return X, y
+
+    def _write_shard(self, index: int, X: np.ndarray, y: np.ndarray) -> dict:
+        name = f"shard-{index:05d}"
+        np.save(self.root / f"{name}.X.npy", np.ascontiguousarray(X, dtype=np.float32))
+        np.save(self.root / f"{name}.y.npy", np.ascontiguousarray(y, dtype=np.int8))
+        return {"name": name, "rows": int(len(y)), "positives": int(y.sum()),
+                "created_at": datetime.now(timezone.utc).isoformat()}
+
+    def _save_manifest(self) -> None:
+        # Written last and swapped atomically, so a crash never exposes a half-written shard.
+        tmp = self.root / "manifest.json.tmp"
+        tmp.write_text(json.dumps(self.manifest), encoding="utf-8")
+        os.replace(tmp, self.root / "manifest.json")
+
+    def rebuild(self, X, y, students: pd.DataFrame, companies: pd.DataFrame, dept_classes) -> None:
+        """Replace the store with one shard holding a full training set."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        old = self.manifest["shards"] if self.manifest else []
+        shard = self._write_shard(0 if not old else int(old[-1]["name"].split("-")[1]) + 1, np.asarray(X), np.asarray(y))
+        now = datetime.now(timezone.utc).isoformat()
+        self.manifest = {
+            "format": STORE_FORMAT,
+            "feature_columns": FEATURE_COLUMNS,
+            "dept_classes": [str(c) for c in dept_classes],
+            "students": row_digests(students, STUDENT_KEY),
+            "companies": row_digests(companies, COMPANY_KEY),
+            "shards": [shard],
+            "rows": shard["rows"],
+            "positives": shard["positives"],
+            "full_trained_at": now,
+            "updated_at": now,
+        }
+        self._save_manifest()
+        for s in old:
+            for suffix in (".X.npy", ".y.npy"):
+                (self.root / f"{s['name']}{suffix}").unlink(missing_ok=True)
+
+    def append(self, X, y, new_students: pd.DataFrame, new_companies: pd.DataFrame) -> dict:
+        """Add one shard of new pairs and mark the new rows as covered."""
+        shards = self.manifest["shards"]
+        shard = self._write_shard(int(shards[-1]["name"].split("-")[1]) + 1, np.asarray(X), np.asarray(y))
+        shards.append(shard)
+        self.manifest["students"].update(row_digests(new_students, STUDENT_KEY))
+        self.manifest["companies"].update(row_digests(new_companies, COMPANY_KEY))
+        self.manifest["rows"] += shard["rows"]
+        self.manifest["positives"] += shard["positives"]
+        self.manifest["updated_at"] = datetime.now(timezone.utc).isoformat()
+        self._save_manifest()
+        return shard
@@ -0,0 +1,13 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+# Shared by training and serving. Kept free of sklearn imports so that
+# loading a bundle stays cheap.
+ROOT = Path(__file__).resolve().parent.parent
+STUDENTS_CSV = ROOT / "student dataset.csv"
+COMPANIES_CSV = ROOT / "company dataset.csv"
+
+# Order matters: the model is fitted on exactly these columns.
+FEATURE_COLUMNS = ["department", "cgpa", "projects", "min_cgpa", "min_projects"]
+COMPANY_FEATURE_COLUMNS = ["min_cgpa", "min_projects"]
@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+import copy
+import os
+import time
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pandas as pd
+from sklearn.metrics import accuracy_score
+from sklearn.model_selection import train_test_split
+
+from recommender.feature_store import FeatureStore
+from recommender.features import FEATURE_COLUMNS
+from recommender.training import FEATURE_DTYPE, build_training_matrix, memory_report, train
+
+# ---------------------------
+# INCREMENTAL RETRAINING
+# ---------------------------
+# `python train.py --incremental` labels only the pairs that involve a new
+# student or a new company, appends them to the feature store, and updates the
+# current bundle's model in place of a full run:
+#
+#   LogisticRegression          warm_start from the current coefficients
+#   RandomForest / GBoosting    warm_start with INCREMENTAL_EXTRA_TREES more trees
+#                               than it holds (boosting can stop early, well
+#                               below its n_estimators setting)
+#
+# The three-family comparison (training.train) only runs when one of these holds:
+#   - no bundle or feature store yet, or --full
+#   - rows were edited or removed, or a department the encoder never saw appears
+#   - the last full run is older than FULL_RETRAIN_DAYS (default 7)
+#   - drift: on the new pairs, the current model's accuracy is more than
+#     DRIFT_ACCURACY_DROP below the bundle's, or the positive rate moved by more
+#     than DRIFT_RATE_DELTA (checked once there are DRIFT_MIN_PAIRS new pairs)
+#   - the ensemble would grow past MAX_ENSEMBLE_GROWTH x its full-run size
+FULL_RETRAIN_DAYS = float(os.getenv("FULL_RETRAIN_DAYS", "7"))
+INCREMENTAL_EXTRA_TREES = int(os.getenv("INCREMENTAL_EXTRA_TREES", "10"))
+DRIFT_ACCURACY_DROP = float(os.getenv("DRIFT_ACCURACY_DROP", "0.05"))
+DRIFT_RATE_DELTA = float(os.getenv("DRIFT_RATE_DELTA", "0.10"))
+DRIFT_MIN_PAIRS = int(os.getenv("DRIFT_MIN_PAIRS", "100"))
+MAX_ENSEMBLE_GROWTH = float(os.getenv("MAX_ENSEMBLE_GROWTH", "2.0"))
+
+
+def fitted_trees(model) -> int | None:
+    """Trees the model actually holds (n_estimators_ after early stopping), None if not an ensemble."""
+    if hasattr(model, "n_estimators_"):
+        return int(model.n_estimators_)
+    if hasattr(model, "estimators_"):
+        return len(model.estimators_)
+    return None
+
+
+def _frame(X: np.ndarray) -> pd.DataFrame:
+    return pd.DataFrame(np.asarray(X, dtype=FEATURE_DTYPE), columns=FEATURE_COLUMNS)
+
+
+def new_pairs(diff: dict, students: pd.DataFrame, companies: pd.DataFrame, le_dept) -> tuple[np.ndarray, np.ndarray]:
+    """Labelled pairs for (new students x all companies) + (known students x new companies)."""
+    new_students, new_companies = diff["new_students"], diff["new_companies"]
+    known_students = students[~students.index.isin(new_students.index)]
+    known_companies = companies[~companies.index.isin(new_companies.index)]
+    blocks = []
+    if len(new_students) and len(companies):
+        blocks.append(build_training_matrix(new_students, companies, le_dept))
+    if len(known_students) and len(new_companies):
+        blocks.append(build_training_matrix(known_students, new_companies, le_dept))
+    if not blocks:
+        return np.empty((0, len(FEATURE_COLUMNS)), dtype=FEATURE_DTYPE), np.empty(0, dtype=np.int8)
+    return np.vstack([X.to_numpy() for X, _ in blocks]), np.concatenate([y for _, y in blocks])
+
+
+def full_retrain_reasons(store: FeatureStore, bundle, diff: dict, students: pd.DataFrame, now: datetime) -> list[str]:
+    if bundle is None:
+        return ["no model bundle yet"]
+    if not store.exists:
+        return ["no feature store yet"]
+    reasons = []
+    for kind in ("students", "companies"):
+        if diff[f"changed_{kind}"] or diff[f"removed_{kind}"]:
+            reasons.append(f"{kind} edited or removed")
+    unseen = set(students["department"].astype(str)) - set(store.manifest["dept_classes"])
+    if unseen:
+        reasons.append(f"unseen departments {sorted(unseen)}")
+    last_full = datetime.fromisoformat(store.manifest["full_trained_at"])
+    if now - last_full > timedelta(days=FULL_RETRAIN_DAYS):
+        reasons.append(f"last full run {last_full:%Y-%m-%d} is over {FULL_RETRAIN_DAYS:g} days old")
+    trees = fitted_trees(bundle.model)
+    base = bundle.manifest["metadata"].get("base_estimators")
+    if trees is not None and base and trees + INCREMENTAL_EXTRA_TREES > base * MAX_ENSEMBLE_GROWTH:
+        reasons.append(f"ensemble would exceed {MAX_ENSEMBLE_GROWTH:g}x its full-run size")
+    return reasons
+
+
+def drift_reasons(model, bundle_accuracy: float, store_rate: float, X: np.ndarray, y: np.ndarray) -> tuple[list[str], dict]:
+    if len(y) < DRIFT_MIN_PAIRS:
+        return [], {"checked": False, "pairs": int(len(y))}
+    accuracy = float(accuracy_score(y, model.predict(_frame(X))))
+    rate = float(y.mean())
+    stats = {"checked": True, "pairs": int(len(y)), "accuracy_on_new": round(accuracy, 4), "new_positive_rate": round(rate, 4)}
+    reasons = []
+    if accuracy < bundle_accuracy - DRIFT_ACCURACY_DROP:
+        reasons.append(f"accuracy on new pairs {accuracy:.3f} vs {bundle_accuracy:.3f}")
+    if abs(rate - store_rate) > DRIFT_RATE_DELTA:
+        reasons.append(f"positive rate {rate:.3f} vs {store_rate:.3f}")
+    return reasons, stats
+
+
+def warm_start(model, X: np.ndarray, y: np.ndarray):
+    """A copy of `model` updated on X, y (the serving bundle's model is left alone)."""
+    updated = copy.deepcopy(model)
+    name = type(updated).__name__
+    if name == "LogisticRegression":
+        updated.set_params(warm_start=True)
+    elif name in ("RandomForestClassifier", "GradientBoostingClassifier"):
+        updated.set_params(warm_start=True, n_estimators=fitted_trees(updated) + INCREMENTAL_EXTRA_TREES)
+    else:
+        raise ValueError(f"No warm start for {name}.")
+    updated.fit(_frame(X), y)
+    return updated
+
+
+def _full(students, companies, store: FeatureStore, reasons: list[str], chunk_size=None) -> dict:
+    result = train(students, companies, chunk_size, keep_data=True)
+    X, y = result.pop("data")
+    store.rebuild(X, y, students, companies, result["encoders"]["dept"].classes_)
+    result["metadata"]["full_retrain_reasons"] = reasons
+    result["metadata"]["base_estimators"] = fitted_trees(result["model"])
+    return result
+
+
+def update(students: pd.DataFrame, companies: pd.DataFrame, store: FeatureStore, bundle=None,
+           force_full: bool = False, chunk_size: int | None = None, now: datetime | None = None) -> dict | None:
+    """
+    Bring the model up to date with the datasets. Returns a `training.train()`
+    style result to save as a new bundle, or None if nothing changed.
+    """
+    now = now or datetime.now(timezone.utc)
+    diff = store.diff(students, companies)
+    reasons = ["--full requested"] if force_full else full_retrain_reasons(store, bundle, diff, students, now)
+    if reasons:
+        return _full(students, companies, store, reasons, chunk_size)
+    if not len(diff["new_students"]) and not len(diff["new_companies"]):
+        return None
+
+    le_dept = bundle.encoders["dept"]
+    metadata = bundle.manifest["metadata"]
+    X_new, y_new = new_pairs(diff, students, companies, le_dept)
+    drift, drift_stats = drift_reasons(bundle.model, metadata["accuracy"], store.positive_rate, X_new, y_new)
+    if drift:
+        return _full(students, companies, store, ["drift: " + r for r in drift], chunk_size)
+
+    store.append(X_new, y_new, diff["new_students"], diff["new_companies"])
+    X, y = store.load()
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+    started = time.perf_counter()
+    model = warm_start(bundle.model, X_train, y_train)
+    fit_seconds = time.perf_counter() - started
+    accuracy = float(accuracy_score(y_test, model.predict(_frame(X_test))))
+
+    return {
+        "model": model,
+        "encoders": bundle.encoders,
+        "metadata": {
+            **metadata,
+            "training_mode": "incremental",
+            "model_class": type(model).__name__,
+            "accuracy": round(accuracy, 4),
+            "n_students": int(len(students)),
+            "n_companies": int(len(companies)),
+            "n_pairs": int(len(y)),
+            "positive_rate": round(float(y.mean()), 4),
+            "new_pairs": int(len(y_new)),
+            "new_students": int(len(diff["new_students"])),
+            "new_companies": int(len(diff["new_companies"])),
+            "drift": drift_stats,
+            "warm_started_from": bundle.version,
+            "full_retrain_reasons": [],
+        },
+        "report": {
+            "selected": metadata.get("model_name"),
+            "training_mode": "incremental",
+            "warm_started_from": bundle.version,
+            "fit_seconds": round(fit_seconds, 4),
+            "n_estimators": fitted_trees(model),
+            "holdout_accuracy": round(accuracy, 4),
+            "memory": memory_report(X=X, y=y),
+        },
+    }
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+from typing import Iterable, Iterator
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+# ---------------------------
+# VECTORIZED LABELS
+# ---------------------------
+# `training.qualifies` re-splits both skill strings for every student×company
+# row. Here each student and each company is tokenized exactly once into a
+# shared vocabulary, and the skills / CGPA / projects checks are done for a
+# whole block of the cross join with matrix operations.
+#
+# Tokenization mirrors `qualifies` exactly: student tokens are lowercased but
+# not stripped, required tokens are lowercased and stripped.
+#
+# Skill strings are integer-coded first (pd.factorize), so each distinct skills
+# string is tokenized once and students sharing one share a matrix row.
+
+
+def student_tokens(skills: Iterable) -> list[set[str]]:
+    return [set(str(s).lower().split(',')) for s in skills]
+
+
+def required_tokens(skills_required: Iterable) -> list[set[str]]:
+    return [{t.strip() for t in str(s).lower().split(',')} for s in skills_required]
+
+
+class SkillVocabulary:
+    """Token -> column id mapping shared by the student and company matrices."""
+
+    def __init__(self, *token_groups: list[set[str]]):
+        self.index: dict[str, int] = {}
+        for group in token_groups:
+            for tokens in group:
+                for t in tokens:
+                    self.index.setdefault(t, len(self.index))
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def matrix(self, token_sets: list[set[str]]) -> sparse.csr_matrix:
+        """One row per token set, 1 where the token is present (CSR, int32)."""
+        indptr = np.zeros(len(token_sets) + 1, dtype=np.int64)
+        cols = []
+        for i, tokens in enumerate(token_sets):
+            ids = [self.index[t] for t in tokens if t in self.index]
+            cols.extend(ids)
+            indptr[i + 1] = indptr[i] + len(ids)
+        indices = np.asarray(cols, dtype=np.int32)
+        data = np.ones(len(indices), dtype=np.int32)
+        return sparse.csr_matrix((data, indices, indptr), shape=(len(token_sets), len(self)))
+
+
+class LabelPlan:
+    """Everything precomputed once per dataset pair; blocks are cheap after this."""
+
+    def __init__(self, students: pd.DataFrame, companies: pd.DataFrame):
+        skill_codes, skill_strings = pd.factorize(students['skills'].astype(str), use_na_sentinel=False)
+        s_tokens = student_tokens(skill_strings)
+        r_tokens = required_tokens(companies['skills_required'])
+        self.vocab = SkillVocabulary(s_tokens, r_tokens)
+
+        self.student_skills = self.vocab.matrix(s_tokens)[skill_codes.astype(np.int32)]
+        self.required_skills_T = self.vocab.matrix(r_tokens).T.tocsc()
+        self.required_counts = np.array([len(t) for t in r_tokens], dtype=np.int32)
+
+        self.cgpa = students['cgpa'].to_numpy(dtype=np.float64)
+        self.projects = students['projects'].to_numpy(dtype=np.float64)
+        self.min_cgpa = companies['min_cgpa'].to_numpy(dtype=np.float64)
+        self.min_projects = companies['min_projects'].to_numpy(dtype=np.float64)
+
+        self.n_students = len(students)
+        self.n_companies = len(companies)
+
+    def block(self, start: int, stop: int) -> np.ndarray:
+        """(stop - start, n_companies) int8 labels for students[start:stop]."""
+        hits = (self.student_skills[start:stop] @ self.required_skills_T).toarray()
+        qualified = hits == self.required_counts[None, :]
+        qualified &= self.cgpa[start:stop, None] >= self.min_cgpa[None, :]
+        qualified &= self.projects[start:stop, None] >= self.min_projects[None, :]
+        return qualified.astype(np.int8)
+
+
+def label_matrix(students: pd.DataFrame, companies: pd.DataFrame) -> np.ndarray:
+    """Full (n_students, n_companies) label matrix in one shot."""
+    plan = LabelPlan(students, companies)
+    return plan.block(0, plan.n_students)
+
+
+def iter_label_blocks(
+    students: pd.DataFrame, companies: pd.DataFrame, chunk_size: int
+) -> Iterator[tuple[int, int, np.ndarray]]:
+    """Yield (start, stop, labels) for consecutive blocks of `chunk_size` students."""
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be >= 1")
+    plan = LabelPlan(students, companies)
+    for start in range(0, plan.n_students, chunk_size):
+        stop = min(start + chunk_size, plan.n_students)
+        yield start, stop, plan.block(start, stop)
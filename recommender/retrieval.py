@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+import math
+import os
+from typing import Sequence
+
+import numpy as np
+
+from recommender.scoring import build_feature_matrix, encode_departments, predict_positive, rank_companies, score_shortlists
+
+# ---------------------------
+# CANDIDATE RETRIEVAL
+# ---------------------------
+# Two-stage mode for big catalogs: a coarse grid over (cgpa, projects) per
+# department acts as an IVF index of prototype students. Each grid point keeps
+# the `n_candidates` companies its prototype scores highest (computed once, on
+# first use). A request probes the grid points around the student, unions
+# their lists, and only those companies go through predict_proba.
+#
+#   RECOMMEND_RETRIEVAL             exact (default) | ann
+#   RECOMMEND_ANN_MIN_CATALOG       stay exact below this many companies (default 5000)
+#   RECOMMEND_ANN_CANDIDATES        companies kept per grid point (default 300)
+#   RECOMMEND_ANN_PROBE_RADIUS      grid points probed per side, per axis (default 1 -> 2x2)
+#   RECOMMEND_ANN_CGPA_STEP         grid spacing on cgpa (default 0.5; projects use 1)
+# (The FastAPI matcher's ANN_* settings in backend/app/retrieval.py are separate.)
+RETRIEVAL = os.getenv("RECOMMEND_RETRIEVAL", "exact").lower()
+if RETRIEVAL not in ("exact", "ann"):
+    raise ValueError(f"RECOMMEND_RETRIEVAL must be 'exact' or 'ann', not {RETRIEVAL!r}.")
+ANN_MIN_CATALOG = int(os.getenv("RECOMMEND_ANN_MIN_CATALOG", "5000"))
+ANN_CANDIDATES = int(os.getenv("RECOMMEND_ANN_CANDIDATES", "300"))
+ANN_PROBE_RADIUS = int(os.getenv("RECOMMEND_ANN_PROBE_RADIUS", "1"))
+ANN_CGPA_STEP = float(os.getenv("RECOMMEND_ANN_CGPA_STEP", "0.5"))
+PROJECTS_STEP = 1.0
+
+
+class CandidateIndex:
+    def __init__(
+        self,
+        model,
+        le_dept,
+        company_features: np.ndarray,
+        n_candidates: int = ANN_CANDIDATES,
+        probe_radius: int = ANN_PROBE_RADIUS,
+        cgpa_step: float = ANN_CGPA_STEP,
+        department_positions=None,
+    ):
+        self.model = model
+        self.le_dept = le_dept
+        self.company_features = np.asarray(company_features, dtype=np.float64)
+        self.n_candidates = n_candidates
+        self.probe_radius = probe_radius
+        self.cgpa_step = cgpa_step
+        # Optional department -> sorted catalog positions (the eligibility index), so
+        # each department's grid lists only rank companies open to that department.
+        self.department_positions = department_positions
+        self._lists: dict[tuple, np.ndarray] = {}
+
+    def _grid_list(self, department: str, gc: int, gp: int) -> np.ndarray:
+        """Best companies (catalog positions) for the prototype at grid point (gc, gp)."""
+        key = (department, gc, gp)
+        found = self._lists.get(key)
+        if found is None:
+            prototype = {"department": department, "cgpa": gc * self.cgpa_step, "projects": gp * PROJECTS_STEP}
+            pool = None if self.department_positions is None else self.department_positions(department)
+            features = self.company_features if pool is None else self.company_features[pool]
+            probs = predict_positive(self.model, build_feature_matrix([prototype], features, self.le_dept))
+            n = min(self.n_candidates, len(probs))
+            found = np.argpartition(-probs, n - 1)[:n] if n else np.empty(0, dtype=np.int64)
+            if pool is not None:
+                found = pool[found]
+            self._lists[key] = found
+        return found
+
+    def candidates(self, profile: dict) -> np.ndarray:
+        """Sorted catalog positions from the grid points surrounding the student."""
+        encode_departments([profile["department"]], self.le_dept)  # same error for unseen labels
+        c = float(profile["cgpa"]) / self.cgpa_step
+        p = float(profile["projects"]) / PROJECTS_STEP
+        r = self.probe_radius
+        lists = [
+            self._grid_list(profile["department"], gc, gp)
+            for gc in range(math.floor(c) - r + 1, math.floor(c) + r + 1)
+            for gp in range(max(0, math.floor(p) - r + 1), math.floor(p) + r + 1)
+        ]
+        return np.unique(np.concatenate(lists)) if lists else np.empty(0, dtype=np.int64)
+
+    def recommend(self, profiles: Sequence[dict], company_names: Sequence[str], threshold: float = 0.5,
+                  allowed: Sequence[np.ndarray] | None = None) -> list[list]:
+        """
+        Stage 2: one predict_proba over every student's candidates, then rank
+        per student. `allowed` (sorted positions per student) narrows each shortlist.
+        """
+        shortlists = [self.candidates(p) for p in profiles]
+        if allowed is not None:
+            shortlists = [np.intersect1d(c, a, assume_unique=True) for c, a in zip(shortlists, allowed)]
+        return score_shortlists(profiles, self.company_features, shortlists, self.model, self.le_dept,
+                                company_names, threshold)
+
+
+def recall_vs_exact(exact: Sequence[list], approx: Sequence[list], k: int) -> float:
+    """Mean share of each exact top-k found in the approximate top-k (ties at the cut count)."""
+    recalls = []
+    for truth, got in zip(exact, approx):
+        truth = truth[:k]
+        if not truth:
+            recalls.append(1.0)
+            continue
+        kth = truth[-1][1]
+        names = {name for name, _ in truth}
+        hits = sum(1 for name, pct in got[:k] if name in names or pct >= kth)
+        recalls.append(min(hits, len(truth)) / len(truth))
+    return float(np.mean(recalls)) if recalls else 1.0
+
+
+# ---------------------------
+# RECALL BENCHMARK
+# ---------------------------
+#   python -m recommender.retrieval --companies 20000 --students 200 --top-k 10
+# Scales the bundle's company table up with jittered copies, then compares
+# the two-stage results against exact scoring of the whole catalog.
+def _synthetic_companies(companies, n: int, seed: int = 0):
+    import pandas as pd
+
+    rng = np.random.default_rng(seed)
+    base = companies.sample(n=n, replace=True, random_state=seed).reset_index(drop=True)
+    base["company"] = [f"Company_{i + 1}" for i in range(n)]
+    base["min_cgpa"] = np.round(np.clip(base["min_cgpa"] + rng.normal(0, 0.4, n), 5.0, 9.5), 2)
+    base["min_projects"] = np.clip(base["min_projects"] + rng.integers(-1, 2, n), 0, None)
+    return pd.DataFrame(base)
+
+
+def main(argv=None):
+    import argparse
+    import json
+    import time
+
+    from recommender.bundle import load_bundle
+    from recommender.scoring import company_feature_matrix, score_matrix
+
+    parser = argparse.ArgumentParser(description="Two-stage retrieval recall/latency vs exact scoring.")
+    parser.add_argument("--companies", type=int, default=20000)
+    parser.add_argument("--students", type=int, default=200)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--candidates", type=int, nargs="+", default=[100, 300, 1000])
+    parser.add_argument("--radius", type=int, nargs="+", default=[1, 2])
+    parser.add_argument("--out", default="bench_retrieval.json")
+    args = parser.parse_args(argv)
+
+    bundle = load_bundle()
+    le_dept = bundle.encoders["dept"]
+    companies = _synthetic_companies(bundle.companies, args.companies)
+    features = company_feature_matrix(companies)
+    names = companies["company"].tolist()
+
+    rng = np.random.default_rng(1)
+    profiles = [
+        {"department": str(rng.choice(le_dept.classes_)), "cgpa": round(float(rng.uniform(6, 10)), 2),
+         "projects": int(rng.integers(0, 6))}
+        for _ in range(args.students)
+    ]
+
+    started = time.perf_counter()
+    exact = [rank_companies(row, names) for row in score_matrix(profiles, features, bundle.model, le_dept)]
+    exact_ms = (time.perf_counter() - started) / len(profiles) * 1000
+
+    report = {"companies": args.companies, "students": args.students, "top_k": args.top_k,
+              "exact_ms_per_student": round(exact_ms, 3), "ann": []}
+    for radius in args.radius:
+        for n_candidates in args.candidates:
+            index = CandidateIndex(bundle.model, le_dept, features, n_candidates, radius)
+            started = time.perf_counter()
+            index.recommend(profiles, names)  # cold: fills the grid lists
+            cold_ms = (time.perf_counter() - started) / len(profiles) * 1000
+            started = time.perf_counter()
+            approx = index.recommend(profiles, names)
+            warm_ms = (time.perf_counter() - started) / len(profiles) * 1000
+            row = {"radius": radius, "candidates": n_candidates,
+                   "recall": round(recall_vs_exact(exact, approx, args.top_k), 4),
+                   "cold_ms_per_student": round(cold_ms, 3), "warm_ms_per_student": round(warm_ms, 3),
+                   "grid_lists": len(index._lists)}
+            report["ann"].append(row)
+            print(row)
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"exact: {exact_ms:.3f} ms/student; wrote {args.out}")
+
+
+if __name__ == "__main__":
+    main()
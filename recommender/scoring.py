@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+from typing import Iterable, Sequence
+
+import numpy as np
+import pandas as pd
+
+from recommender.features import FEATURE_COLUMNS, COMPANY_FEATURE_COLUMNS
+
+# ---------------------------
+# BATCH SCORING ENGINE
+# ---------------------------
+# One feature matrix for every (student, company) pair, one predict_proba call.
+# Rows are laid out student-major: row s * n_companies + c is student s vs company c.
+
+
+def company_feature_matrix(companies: pd.DataFrame) -> np.ndarray:
+    """(n_companies, 2) float64 matrix of [min_cgpa, min_projects]."""
+    return companies[COMPANY_FEATURE_COLUMNS].to_numpy(dtype=np.float64)
+
+
+def encode_departments(departments: Iterable[str], le_dept) -> np.ndarray:
+    """Vectorized LabelEncoder.transform; raises the same way for unseen labels."""
+    lookup = {label: code for code, label in enumerate(le_dept.classes_)}
+    departments = list(departments)
+    unseen = sorted({str(d) for d in departments if d not in lookup})
+    if unseen:
+        raise ValueError(f"y contains previously unseen labels: {unseen}")
+    return np.fromiter((lookup[d] for d in departments), dtype=np.float64, count=len(departments))
+
+
+def build_student_block(profiles: Sequence[dict], le_dept) -> np.ndarray:
+    """(n_students, 3) matrix of the student-side features [department, cgpa, projects]."""
+    student_block = np.empty((len(profiles), 3), dtype=np.float64)
+    student_block[:, 0] = encode_departments((p["department"] for p in profiles), le_dept)
+    student_block[:, 1] = [float(p["cgpa"]) for p in profiles]
+    student_block[:, 2] = [float(p["projects"]) for p in profiles]
+    return student_block
+
+
+def build_feature_matrix(profiles: Sequence[dict], company_features: np.ndarray, le_dept) -> np.ndarray:
+    """Stack every student profile against every company row, in FEATURE_COLUMNS order."""
+    company_features = np.asarray(company_features, dtype=np.float64)
+    n_students, n_companies = len(profiles), len(company_features)
+    student_block = build_student_block(profiles, le_dept)
+
+    X = np.empty((n_students * n_companies, len(FEATURE_COLUMNS)), dtype=np.float64)
+    X[:, :3] = np.repeat(student_block, n_companies, axis=0)
+    X[:, 3:] = np.tile(company_features, (n_students, 1))
+    return X
+
+
+def predict_positive(model, X: np.ndarray) -> np.ndarray:
+    """P(qualified) for each row, falling back to hard predictions if needed."""
+    if getattr(model, "takes_arrays", False):  # recommender.compiled.CompiledModel
+        return model.predict_positive(X)
+    frame = pd.DataFrame(X, columns=FEATURE_COLUMNS)
+    if hasattr(model, "predict_proba"):
+        return model.predict_proba(frame)[:, 1]
+    return model.predict(frame).astype(np.float64)
+
+
+def score_matrix(profiles: Sequence[dict], company_features: np.ndarray, model, le_dept) -> np.ndarray:
+    """Return a (n_students, n_companies) matrix of qualification probabilities."""
+    n_companies = len(company_features)
+    if not profiles or not n_companies:
+        return np.zeros((len(profiles), n_companies), dtype=np.float64)
+    X = build_feature_matrix(profiles, company_features, le_dept)
+    return predict_positive(model, X).reshape(len(profiles), n_companies)
+
+
+def score_shortlists(profiles: Sequence[dict], company_features: np.ndarray, shortlists: Sequence[np.ndarray],
+                     model, le_dept, company_names: Sequence[str], threshold: float = 0.5) -> list[list]:
+    """One predict_proba over each student's own subset of catalog positions, ranked per student."""
+    student_block = build_student_block(profiles, le_dept)  # raises for unseen departments, as before
+    lengths = [len(positions) for positions in shortlists]
+    rows = sum(lengths)
+    probs = np.empty(0)
+    if rows:
+        X = np.empty((rows, len(FEATURE_COLUMNS)), dtype=np.float64)
+        X[:, :3] = np.repeat(student_block, lengths, axis=0)
+        X[:, 3:] = np.asarray(company_features, dtype=np.float64)[np.concatenate(shortlists)]
+        probs = predict_positive(model, X)
+    results, start = [], 0
+    for positions in shortlists:
+        row = probs[start:start + len(positions)]
+        start += len(positions)
+        # Sorted positions, so ties still fall back to catalog order.
+        results.append(rank_companies(row, [company_names[i] for i in positions], threshold))
+    return results
+
+
+def rank_companies(probs: np.ndarray, company_names: Sequence[str], threshold: float = 0.5) -> list[tuple]:
+    """Turn one row of probabilities into [(company, pct), ...], best first."""
+    pct = np.round(np.asarray(probs, dtype=np.float64) * 100, 2)
+    keep = np.flatnonzero(probs >= threshold)
+    order = keep[np.argsort(-pct[keep], kind="stable")]
+    return [(company_names[i], float(pct[i])) for i in order]
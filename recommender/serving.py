@@ -0,0 +1,265 @@
+from __future__ import annotations
+
+import json
+import os
+import queue
+import socket
+import socketserver
+import struct
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Sequence
+
+# ---------------------------
+# MICRO-BATCHED INFERENCE
+# ---------------------------
+# Many small recommendation requests (one per web request) are queued and
+# served together: the batcher waits at most `window` seconds after the first
+# request of a batch, or until `max_batch` requests are queued, then hands the
+# whole batch to one handler call (one predict_proba over the stacked
+# student x company rows) and fans the results back out through futures.
+#
+#   RECOMMEND_SERVING          direct (default) | batched | socket
+#   INFERENCE_BATCH_WINDOW_MS  how long a batch stays open (default 5)
+#   INFERENCE_MAX_BATCH        close the batch early at this many requests (default 64)
+#   INFERENCE_SOCKET           server address: a Unix socket path, or host:port
+#                              (default /tmp/internsetu-inference.sock)
+#   INFERENCE_TIMEOUT          seconds a client waits for an answer (default 10)
+#
+# `batched` runs the batcher inside each web worker. `socket` sends requests
+# to `python inference_server.py`, so the model is loaded once per host and
+# every worker's requests land in the same batches.
+SERVING = os.getenv("RECOMMEND_SERVING", "direct").lower()
+if SERVING not in ("direct", "batched", "socket"):
+    raise ValueError(f"RECOMMEND_SERVING must be 'direct', 'batched' or 'socket', not {SERVING!r}.")
+BATCH_WINDOW = float(os.getenv("INFERENCE_BATCH_WINDOW_MS", "5")) / 1000
+MAX_BATCH = int(os.getenv("INFERENCE_MAX_BATCH", "64"))
+SOCKET_ADDRESS = os.getenv("INFERENCE_SOCKET", "/tmp/internsetu-inference.sock")
+TIMEOUT = float(os.getenv("INFERENCE_TIMEOUT", "10"))
+
+
+class MicroBatcher:
+    """Collects items from many threads and runs `handler(items) -> results` per batch."""
+
+    def __init__(self, handler: Callable[[list], list], window: float = BATCH_WINDOW, max_batch: int = MAX_BATCH):
+        self.handler = handler
+        self.window = window
+        self.max_batch = max_batch
+        self._queue: queue.Queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+        self.stats = {"requests": 0, "batches": 0, "largest_batch": 0, "handler_seconds": 0.0}
+
+    def _ensure_worker(self) -> None:
+        # Started on first use, so a pre-forking server doesn't fork a dead thread.
+        if self._thread is None or not self._thread.is_alive():
+            with self._lock:
+                if self._thread is None or not self._thread.is_alive():
+                    self._thread = threading.Thread(target=self._loop, name="micro-batcher", daemon=True)
+                    self._thread.start()
+
+    def submit(self, item) -> Future:
+        future: Future = Future()
+        self._ensure_worker()
+        self._queue.put((item, future))
+        return future
+
+    def __call__(self, item, timeout: float | None = TIMEOUT):
+        return self.submit(item).result(timeout)
+
+    def _loop(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.window
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._run(batch)
+
+    def _run(self, batch: list) -> None:
+        started = time.perf_counter()
+        try:
+            results = self.handler([item for item, _ in batch])
+        except Exception as e:
+            if len(batch) == 1:
+                batch[0][1].set_exception(e)
+            else:
+                # One bad request (e.g. an unseen department) must not fail its
+                # neighbours: rerun them one by one.
+                for item, future in batch:
+                    self._run([(item, future)])
+                return
+        else:
+            for (_, future), result in zip(batch, results):
+                future.set_result(result)
+        self.stats["requests"] += len(batch)
+        self.stats["batches"] += 1
+        self.stats["largest_batch"] = max(self.stats["largest_batch"], len(batch))
+        self.stats["handler_seconds"] += time.perf_counter() - started
+
+
+def recommendation_handler(recommend_many: Callable[[Sequence[dict], float], list]) -> Callable[[list], list]:
+    """
+    Batch handler over `recommend_many(profiles, threshold)` (model.recommend_for_students
+    bound to a model): items are (profile, threshold), one call per distinct threshold.
+    """
+    def handle(items: list) -> list:
+        results: list = [None] * len(items)
+        by_threshold: dict[float, list[int]] = {}
+        for i, (_, threshold) in enumerate(items):
+            by_threshold.setdefault(threshold, []).append(i)
+        for threshold, positions in by_threshold.items():
+            ranked = recommend_many([items[i][0] for i in positions], threshold)
+            for i, recommendations in zip(positions, ranked):
+                results[i] = recommendations
+        return results
+    return handle
+
+
+# ---------------------------
+# LOCAL SOCKET TRANSPORT
+# ---------------------------
+# Frames are a 4-byte big-endian length followed by UTF-8 JSON. A connection
+# carries any number of request/response pairs:
+#   {"op": "recommend", "profile": {...}, "threshold": 0.5} -> {"result": [[name, pct], ...]}
+#   {"op": "stats"}                                          -> {"result": {...}}
+#   {"op": "reload"}                                         -> {"result": "<bundle version>"}
+# Failures come back as {"error": "...", "type": "ValueError"}.
+_HEADER = struct.Struct(">I")
+
+
+def _send(sock: socket.socket, payload) -> None:
+    body = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    sock.sendall(_HEADER.pack(len(body)) + body)
+
+
+def _recv_exact(sock: socket.socket, n: int) -> bytes:
+    chunks, remaining = [], n
+    while remaining:
+        chunk = sock.recv(remaining)
+        if not chunk:
+            raise ConnectionError("Inference socket closed.")
+        chunks.append(chunk)
+        remaining -= len(chunk)
+    return b"".join(chunks)
+
+
+def _recv(sock: socket.socket):
+    (length,) = _HEADER.unpack(_recv_exact(sock, _HEADER.size))
+    return json.loads(_recv_exact(sock, length))
+
+
+def _parse_address(address: str):
+    """host:port -> TCP, anything else is a Unix socket path."""
+    host, sep, port = address.rpartition(":")
+    if sep and port.isdigit() and "/" not in address:
+        return socket.AF_INET, (host or "127.0.0.1", int(port))
+    return socket.AF_UNIX, address
+
+
+class _ConnectionHandler(socketserver.BaseRequestHandler):
+    def handle(self) -> None:
+        ops = self.server.ops
+        while True:
+            try:
+                request = _recv(self.request)
+            except (ConnectionError, OSError, ValueError):
+                return
+            op = ops.get(request.get("op"))
+            try:
+                if op is None:
+                    raise ValueError(f"Unknown op {request.get('op')!r}.")
+                response = {"result": op(request)}
+            except Exception as e:
+                response = {"error": str(e), "type": type(e).__name__}
+            try:
+                _send(self.request, response)
+            except OSError:
+                return
+
+
+class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+    request_queue_size = 128  # every web worker thread may connect at once
+
+    def server_close(self) -> None:
+        super().server_close()
+        if os.path.exists(self.server_address):
+            os.unlink(self.server_address)
+
+
+class _TCPServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+    request_queue_size = 128
+
+
+def make_server(address: str, ops: dict[str, Callable[[dict], object]]) -> socketserver.BaseServer:
+    """A threaded server answering `ops` (one thread per client connection)."""
+    family, target = _parse_address(address)
+    if family == socket.AF_UNIX:
+        if os.path.exists(target):
+            os.unlink(target)  # left behind by a previous run
+        server = _UnixServer(target, _ConnectionHandler)
+    else:
+        server = _TCPServer(target, _ConnectionHandler)
+    server.ops = ops
+    return server
+
+
+class InferenceClient:
+    """Client for make_server(); one persistent connection per calling thread."""
+
+    def __init__(self, address: str = SOCKET_ADDRESS, timeout: float = TIMEOUT):
+        self.address = address
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _connect(self) -> socket.socket:
+        family, target = _parse_address(self.address)
+        sock = socket.socket(family, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        sock.connect(target)
+        self._local.sock = sock
+        return sock
+
+    def call(self, payload: dict):
+        sock = getattr(self._local, "sock", None)
+        for attempt in (0, 1):
+            try:
+                if sock is None:
+                    sock = self._connect()
+                _send(sock, payload)
+                response = _recv(sock)
+                break
+            except TimeoutError:
+                # The server is slow, not gone: resending would only queue the work twice.
+                sock.close()
+                self._local.sock = None
+                raise
+            except (ConnectionError, OSError):
+                # The server restarted (or the connection went stale): reconnect once.
+                if sock is not None:
+                    sock.close()
+                sock = self._local.sock = None
+                if attempt:
+                    raise
+        if "error" in response:
+            raise (ValueError if response.get("type") == "ValueError" else RuntimeError)(response["error"])
+        return response["result"]
+
+    def recommend(self, profile: dict, threshold: float = 0.5) -> list[tuple]:
+        result = self.call({"op": "recommend", "profile": profile, "threshold": threshold})
+        return [tuple(pair) for pair in result]
+
+    def stats(self) -> dict:
+        return self.call({"op": "stats"})
+
+    def reload(self) -> str:
+        return self.call({"op": "reload"})
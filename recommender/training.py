@@ -0,0 +1,313 @@
+from __future__ import annotations
+
+import os
+import sys
+import time
+import warnings
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from sklearn.model_selection import KFold, StratifiedKFold, train_test_split
+from sklearn.preprocessing import LabelEncoder
+from sklearn.linear_model import LogisticRegression
+from sklearn.ensemble import RandomForestClassifier, GradientBoostingClassifier
+from sklearn.metrics import accuracy_score
+
+from recommender.features import STUDENTS_CSV, COMPANIES_CSV, FEATURE_COLUMNS, COMPANY_FEATURE_COLUMNS
+from recommender.labels import label_matrix, iter_label_blocks
+
+
+# ---------------------------
+# LOAD DATA
+# ---------------------------
+# Compact dtypes: low-cardinality strings as categoricals, CGPA as float32 and
+# project counts as int16. The training matrix itself is float32 (the tree
+# models work in float32 anyway) and labels are int8.
+STUDENT_DTYPES = {"department": "category", "degree": "category", "cgpa": np.float32, "projects": np.int16}
+COMPANY_DTYPES = {"departments": "category", "min_cgpa": np.float32, "min_projects": np.int16}
+FEATURE_DTYPE = np.float32
+# The only columns the label rules and features read; everything else is
+# dropped before the (inspection) cross join.
+STUDENT_TRAINING_COLUMNS = ["student_id", "department", "cgpa", "projects", "skills"]
+COMPANY_TRAINING_COLUMNS = ["company", "skills_required", "min_cgpa", "min_projects"]
+
+
+def load_datasets(students_csv: Path = STUDENTS_CSV, companies_csv: Path = COMPANIES_CSV):
+    """Read both CSVs (utf-8-sig strips the BOM the exports ship with)."""
+    students = pd.read_csv(students_csv, encoding="utf-8-sig", dtype=STUDENT_DTYPES)
+    companies = pd.read_csv(companies_csv, encoding="utf-8-sig", dtype=COMPANY_DTYPES)
+    return students, companies
+
+
+def peak_rss_bytes() -> int | None:
+    """Peak resident set size of this process so far (None where `resource` is missing)."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024  # bytes on macOS, KiB on Linux
+
+
+def memory_report(**parts) -> dict:
+    """Sizes in MiB of the given frames / arrays plus the process's peak RSS."""
+    mib = 1024 * 1024
+    report = {}
+    for name, value in parts.items():
+        size = value.memory_usage(deep=True).sum() if isinstance(value, pd.DataFrame) else value.nbytes
+        report[f"{name}_mib"] = round(float(size) / mib, 3)
+    peak = peak_rss_bytes()
+    # Only this process: joblib pool workers hold their own fold slices on top.
+    report["peak_rss_mib"] = round(peak / mib, 1) if peak is not None else None
+    return report
+
+
+# Target function (row-level reference; training uses the vectorized
+# recommender.labels path, which must agree with this exactly)
+def qualifies(row):
+    student_skills = str(row['skills']).lower().split(',')
+    required_skills = str(row['skills_required']).lower().split(',')
+    skills_match = all(skill.strip() in student_skills for skill in required_skills)
+    cgpa_match = row['cgpa'] >= row['min_cgpa']
+    projects_match = row['projects'] >= row['min_projects']
+    return int(skills_match and cgpa_match and projects_match)
+
+
+def build_training_frame(students: pd.DataFrame, companies: pd.DataFrame) -> pd.DataFrame:
+    """Cross join students × companies and attach the `qualified` label (for inspection)."""
+    data = students[STUDENT_TRAINING_COLUMNS].merge(companies[COMPANY_TRAINING_COLUMNS], how="cross")
+    data['qualified'] = label_matrix(students, companies).ravel()
+    return data
+
+
+def build_training_matrix(
+    students: pd.DataFrame,
+    companies: pd.DataFrame,
+    le_dept: LabelEncoder,
+    chunk_size: int | None = None,
+) -> tuple[pd.DataFrame, np.ndarray]:
+    """
+    Build X (FEATURE_COLUMNS, float32) and y (int8) for the whole cross join
+    without ever materializing the merged string frame. Rows are student-major, the same
+    order `merge(how="cross")` produces. With `chunk_size`, labels are
+    computed `chunk_size` students at a time.
+    """
+    n_students, n_companies = len(students), len(companies)
+    X = np.empty((n_students * n_companies, len(FEATURE_COLUMNS)), dtype=FEATURE_DTYPE)
+    y = np.empty(n_students * n_companies, dtype=np.int8)
+
+    dept = le_dept.transform(students['department']).astype(FEATURE_DTYPE)
+    cgpa = students['cgpa'].to_numpy(dtype=FEATURE_DTYPE)
+    projects = students['projects'].to_numpy(dtype=FEATURE_DTYPE)
+    company_block = companies[COMPANY_FEATURE_COLUMNS].to_numpy(dtype=FEATURE_DTYPE)
+
+    for start, stop, labels in iter_label_blocks(students, companies, chunk_size or max(1, n_students)):
+        rows = slice(start * n_companies, stop * n_companies)
+        X[rows, 0] = np.repeat(dept[start:stop], n_companies)
+        X[rows, 1] = np.repeat(cgpa[start:stop], n_companies)
+        X[rows, 2] = np.repeat(projects[start:stop], n_companies)
+        X[rows, 3:] = np.tile(company_block, (stop - start, 1))
+        y[rows] = labels.ravel()
+
+    return pd.DataFrame(X, columns=FEATURE_COLUMNS), y
+
+
+# ---------------------------
+# TRAIN MODELS
+# ---------------------------
+# Every (candidate, CV fold) fit plus each candidate's hold-out fit runs as its
+# own joblib task across TRAIN_N_JOBS processes. Candidates are ranked by mean
+# CV accuracy; "accuracy" stays the winner's score on the 20% hold-out split.
+# The tree models stop adding trees once validation stops improving (OOB score
+# for the forest, n_iter_no_change for boosting) or once TRAIN_TIME_BUDGET
+# seconds have passed since training started (0 = no budget).
+TRAIN_N_JOBS = int(os.getenv("TRAIN_N_JOBS", "-1"))
+TRAIN_CV_FOLDS = int(os.getenv("TRAIN_CV_FOLDS", "3"))
+TRAIN_TIME_BUDGET = float(os.getenv("TRAIN_TIME_BUDGET", "0"))
+if TRAIN_CV_FOLDS < 2:
+    raise ValueError(f"TRAIN_CV_FOLDS must be at least 2, not {TRAIN_CV_FOLDS}.")
+if TRAIN_TIME_BUDGET < 0:
+    raise ValueError(f"TRAIN_TIME_BUDGET must be >= 0, not {TRAIN_TIME_BUDGET}.")
+FOREST_STEP = 20           # trees added per early-stopping round
+FOREST_TOLERANCE = 1e-3    # minimum OOB gain to keep growing
+
+
+def candidate_models(n_jobs: int = TRAIN_N_JOBS) -> dict:
+    return {
+        "Logistic Regression": LogisticRegression(max_iter=1000),
+        "Random Forest": RandomForestClassifier(n_estimators=100, random_state=42, n_jobs=n_jobs),
+        "Gradient Boosting": GradientBoostingClassifier(
+            random_state=42, n_iter_no_change=10, validation_fraction=0.1
+        ),
+    }
+
+
+def _fit_forest(model: RandomForestClassifier, X, y, deadline: float | None) -> str | None:
+    """Grow the forest FOREST_STEP trees at a time while the OOB score still improves."""
+    limit = model.n_estimators
+    model.set_params(warm_start=True, oob_score=True, n_estimators=min(FOREST_STEP, limit))
+    best, stopped = -1.0, None
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", UserWarning)  # a few rows lack OOB votes while the forest is small
+        while True:
+            model.fit(X, y)
+            if model.oob_score_ < best + FOREST_TOLERANCE:
+                stopped = "early_stopping"
+                break
+            best = model.oob_score_
+            if model.n_estimators >= limit:
+                break
+            if deadline is not None and time.time() >= deadline:
+                stopped = "time_budget"
+                break
+            model.set_params(n_estimators=min(model.n_estimators + FOREST_STEP, limit))
+    # Back to a plain forest: no per-row OOB arrays in model.pkl.
+    model.set_params(warm_start=False, oob_score=False)
+    del model.oob_score_, model.oob_decision_function_
+    return stopped
+
+
+def _fit_boosting(model: GradientBoostingClassifier, X, y, deadline: float | None) -> str | None:
+    state = {"stopped": None}
+
+    def monitor(i, _est, _locals):
+        if deadline is not None and time.time() >= deadline:
+            state["stopped"] = "time_budget"
+            return True
+        return False
+
+    model.fit(X, y, monitor=monitor)
+    if state["stopped"] is None and model.n_estimators_ < model.n_estimators:
+        state["stopped"] = "early_stopping"
+    return state["stopped"]
+
+
+def fit_candidate(name: str, model, X: np.ndarray, y: np.ndarray, train_idx, test_idx,
+                  deadline: float | None) -> dict:
+    """One joblib task: fit `model` on X[train_idx] and score it on X[test_idx]."""
+    started = time.perf_counter()
+    X_fit = pd.DataFrame(X[train_idx], columns=FEATURE_COLUMNS)
+    if isinstance(model, RandomForestClassifier):
+        stopped = _fit_forest(model, X_fit, y[train_idx], deadline)
+    elif isinstance(model, GradientBoostingClassifier):
+        stopped = _fit_boosting(model, X_fit, y[train_idx], deadline)
+    else:
+        model.fit(X_fit, y[train_idx])
+        stopped = None
+    fit_seconds = time.perf_counter() - started
+    accuracy = accuracy_score(y[test_idx], model.predict(pd.DataFrame(X[test_idx], columns=FEATURE_COLUMNS)))
+    return {
+        "name": name,
+        "model": model,
+        "accuracy": float(accuracy),
+        "fit_seconds": round(fit_seconds, 4),
+        "n_estimators": getattr(model, "n_estimators_", getattr(model, "n_estimators", None)),
+        "stopped": stopped,
+    }
+
+
+def select_model(X: np.ndarray, y: np.ndarray, train_idx: np.ndarray, test_idx: np.ndarray,
+                 n_jobs: int = TRAIN_N_JOBS, folds: int = TRAIN_CV_FOLDS,
+                 time_budget: float = TRAIN_TIME_BUDGET) -> tuple[str, object, dict]:
+    """
+    Cross-validate every candidate on the training split and fit each on the
+    whole training split, all in parallel. Returns (name, hold-out model, report).
+    """
+    started = time.time()
+    deadline = started + time_budget if time_budget else None
+    y_train = y[train_idx]
+    # Stratify when every class has enough rows for it; tiny datasets fall back to plain folds.
+    counts = np.bincount(y_train)
+    splitter = StratifiedKFold if counts[counts > 0].min() >= folds else KFold
+    splits = [(train_idx[a], train_idx[b]) for a, b in splitter(folds, shuffle=True, random_state=42).split(train_idx, y_train)]
+
+    tasks = []
+    for name in candidate_models():
+        for fold, (fit_idx, val_idx) in enumerate(splits):
+            tasks.append((name, fold, fit_idx, val_idx))
+        tasks.append((name, "holdout", train_idx, test_idx))
+    # joblib caps the forest's own n_jobs inside pool workers, so the two levels don't oversubscribe.
+    runs = Parallel(n_jobs=n_jobs)(
+        delayed(fit_candidate)(name, candidate_models(n_jobs)[name], X, y, fit_idx, val_idx, deadline)
+        for name, _fold, fit_idx, val_idx in tasks
+    )
+
+    candidates = {}
+    for (name, fold, _, _), run in zip(tasks, runs):
+        entry = candidates.setdefault(name, {"cv_scores": [], "fit_seconds": [], "stopped": []})
+        entry["fit_seconds"].append(run["fit_seconds"])
+        if run["stopped"]:
+            entry["stopped"].append(f"{fold}: {run['stopped']}")
+        if fold == "holdout":
+            entry.update(holdout_accuracy=round(run["accuracy"], 4), n_estimators=run["n_estimators"],
+                         model=run["model"])
+        else:
+            entry["cv_scores"].append(round(run["accuracy"], 4))
+    for entry in candidates.values():
+        entry["cv_mean"] = round(float(np.mean(entry["cv_scores"])), 4)
+        entry["total_fit_seconds"] = round(float(sum(entry["fit_seconds"])), 4)
+
+    best_name = max(candidates, key=lambda n: (candidates[n]["cv_mean"], candidates[n]["holdout_accuracy"]))
+    best_model = candidates[best_name]["model"]
+    report = {
+        "selected": best_name,
+        "selection_metric": f"mean accuracy over {folds}-fold CV",
+        "n_jobs": n_jobs,
+        "cpu_count": os.cpu_count(),
+        "time_budget_seconds": time_budget or None,
+        "wall_seconds": round(time.time() - started, 4),
+        "candidates": {n: {k: v for k, v in c.items() if k != "model"} for n, c in candidates.items()},
+    }
+    return best_name, best_model, report
+
+
+def train(
+    students: pd.DataFrame,
+    companies: pd.DataFrame,
+    chunk_size: int | None = None,
+    keep_data: bool = False,
+) -> dict:
+    """
+    Run the full training pipeline and return everything the bundle needs:
+    the selected model, the fitted encoders and some metadata about the run.
+    With `keep_data`, the labelled pairs come back too (as "data": (X, y)),
+    so the feature store can be rebuilt without labelling twice.
+    """
+    # Encode categorical features
+    le_dept = LabelEncoder().fit(students['department'])
+    le_company = LabelEncoder().fit(companies['company'])
+
+    # Features + Target
+    X, y = build_training_matrix(students, companies, le_dept, chunk_size)
+
+    # Split
+    train_idx, test_idx = train_test_split(np.arange(len(y)), test_size=0.2, random_state=42)
+
+    best_name, best_model, report = select_model(X.to_numpy(), y, train_idx, test_idx)
+    report["memory"] = memory_report(students=students, companies=companies, X=X, y=y)
+    best_acc = report["candidates"][best_name]["holdout_accuracy"]
+    scores = {n: c["holdout_accuracy"] for n, c in report["candidates"].items()}
+
+    result = {
+        "model": best_model,
+        "encoders": {"dept": le_dept, "company": le_company},
+        "metadata": {
+            "model_name": best_name,
+            "model_class": type(best_model).__name__,
+            "accuracy": round(float(best_acc), 4),
+            "candidate_scores": scores,
+            "cv_scores": {n: c["cv_mean"] for n, c in report["candidates"].items()},
+            "training_seconds": report["wall_seconds"],
+            "n_students": int(len(students)),
+            "n_companies": int(len(companies)),
+            "n_pairs": int(len(y)),
+            "positive_rate": round(float(y.mean()), 4),
+            "training_mode": "full",
+        },
+        "report": report,
+    }
+    if keep_data:
+        result["data"] = (X.to_numpy(), y)
+    return result
@@ -0,0 +1,297 @@
+"""
+Static asset pipeline for the Flask frontend (frontend/assets).
+
+    python static_assets.py            # build frontend/assets/_build/ + manifest.json
+    python static_assets.py --prune    # ... and delete outputs the new manifest no longer uses
+
+Build step, for every file under frontend/assets:
+  - a content-fingerprinted copy, e.g. css/style-1.3f9c2a71d0.css; url(...)
+    references inside CSS are rewritten to the fingerprinted files
+  - .gz and .br siblings for text assets (css, js, svg), kept when smaller
+    (.br needs the `brotli` package)
+  - PNG/JPEG images: WebP and AVIF variants at VARIANT_WIDTHS (and the
+    original width), for <picture> in templates and image-set() in CSS
+    (needs Pillow; AVIF needs Pillow >= 11.2 or pillow-avif-plugin)
+Old outputs are kept by default, so workers still running on the previous
+manifest keep serving their files until they restart.
+
+Serving, with init_app(app):
+  - url_for('static', filename=...) points at the fingerprinted copy when the
+    manifest has one (no manifest -> the plain files, as before)
+  - fingerprinted files go out with `Cache-Control: public, max-age=1 year,
+    immutable`, and as the .br/.gz sibling when the client accepts it;
+    unfingerprinted files get STATIC_MAX_AGE (default one day)
+  - templates get picture_sources('images/x.png') for the WebP/AVIF <source>s
+"""
+import argparse
+import gzip
+import hashlib
+import io
+import json
+import mimetypes
+import os
+import posixpath
+import re
+import shutil
+from pathlib import Path
+
+from markupsafe import Markup, escape
+
+ASSETS_DIR = Path(__file__).resolve().parent / "frontend" / "assets"
+BUILD_DIR = "_build"
+MANIFEST_FILE = "manifest.json"
+SKIP_FILES = {".DS_Store", "Thumbs.db"}
+COMPRESSIBLE = {".css", ".js", ".svg", ".json", ".txt"}
+RASTER = {".png", ".jpg", ".jpeg"}
+VARIANT_WIDTHS = (480, 960, 1600)
+# format -> (Pillow format name, mimetype, save options); preferred first.
+VARIANT_FORMATS = {
+    "avif": ("AVIF", "image/avif", {"quality": 55, "speed": 8}),
+    "webp": ("WEBP", "image/webp", {"quality": 80, "method": 6}),
+}
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+STATIC_MAX_AGE = int(os.getenv("STATIC_MAX_AGE", str(24 * 3600)))
+
+CSS_URL = re.compile(r"""url\(\s*(['"]?)([^'")]+)\1\s*\)""")
+CSS_BACKGROUND = re.compile(r"""background-image:\s*url\(\s*(['"]?)([^'")]+)\1\s*\)\s*;""")
+
+
+# ------------------------------
+# BUILD
+# ------------------------------
+def fingerprinted(rel, data, tag=""):
+    """'images/a.png' -> 'images/a.<tag.><hash>.png' (hash of the final bytes)."""
+    path = posixpath.split(rel)
+    stem, suffix = posixpath.splitext(path[1])
+    digest = hashlib.sha256(data).hexdigest()[:10]
+    return posixpath.join(path[0], f"{stem}.{tag + '.' if tag else ''}{digest}{suffix}")
+
+
+def _is_local(ref):
+    return not re.match(r"^(data:|[a-z]+:|//|#)", ref, re.IGNORECASE)
+
+
+class Builder:
+    def __init__(self, assets_dir=ASSETS_DIR):
+        self.assets_dir = Path(assets_dir)
+        self.out_dir = self.assets_dir / BUILD_DIR
+        self.manifest = {"assets": {}, "variants": {}}
+        self.written = set()
+        self.stats = {"files": 0, "source_bytes": 0, "gzip": 0, "brotli": 0, "variants": 0, "skipped": []}
+        try:
+            import brotli
+        except ImportError:
+            brotli = None
+            self.stats["skipped"].append("brotli (pip install brotli)")
+        self.brotli = brotli
+        try:
+            from PIL import Image, features
+        except ImportError:
+            Image = None
+            self.stats["skipped"].append("image variants (pip install pillow)")
+        self.Image = Image
+        self.image_formats = {}
+        if Image is not None:
+            try:
+                import pillow_avif  # noqa: F401  (registers AVIF on Pillow < 11.2)
+            except ImportError:
+                pass
+            for name, spec in VARIANT_FORMATS.items():
+                if features.check(name):
+                    self.image_formats[name] = spec
+                else:
+                    self.stats["skipped"].append(f"{name} variants (not supported by this Pillow)")
+
+    def _write(self, rel, data):
+        target = self.out_dir / rel
+        target.parent.mkdir(parents=True, exist_ok=True)
+        if not target.exists():
+            target.write_bytes(data)
+        self.written.add(rel)
+
+    def _sources(self):
+        files = [
+            p for p in sorted(self.assets_dir.rglob("*"))
+            if p.is_file() and p.name not in SKIP_FILES and BUILD_DIR not in p.relative_to(self.assets_dir).parts
+        ]
+        # CSS last: its url(...) references need the other files' fingerprints.
+        return sorted(files, key=lambda p: p.suffix.lower() == ".css")
+
+    def _variants(self, rel, data):
+        image = self.Image.open(io.BytesIO(data))
+        image.load()
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA" if "transparency" in image.info or image.mode in ("LA", "P") else "RGB")
+        # Skip steps within 20% of the original width; they would barely save bytes.
+        widths = sorted({w for w in VARIANT_WIDTHS if w < image.width * 0.8} | {image.width})
+        found = {}
+        for name, (pil_format, _mime, options) in self.image_formats.items():
+            for width in widths:
+                resized = image if width == image.width else image.resize(
+                    (width, max(1, round(image.height * width / image.width))), self.Image.LANCZOS
+                )
+                buffer = io.BytesIO()
+                resized.save(buffer, pil_format, **options)
+                encoded = buffer.getvalue()
+                if len(encoded) >= len(data):
+                    continue  # no smaller than the source file: not worth a <source>
+                out = fingerprinted(posixpath.splitext(rel)[0] + f".{name}", encoded, f"{width}w")
+                self._write(out, encoded)
+                found.setdefault(name, []).append([width, out])
+                self.stats["variants"] += 1
+        if found:
+            self.manifest["variants"][rel] = found
+
+    def _rewrite_css(self, rel, text):
+        base = posixpath.dirname(rel) or "."
+
+        def resolve(ref):
+            return posixpath.normpath(posixpath.join(base, ref.split("?")[0].split("#")[0]))
+
+        def add_image_set(match):
+            variants = self.manifest["variants"].get(resolve(match.group(2))) if _is_local(match.group(2)) else None
+            if not variants:
+                return match.group(0)
+            # Largest variant per format, the original as the last candidate.
+            options = [f'url("{posixpath.relpath(v[-1][1], base)}") type("{VARIANT_FORMATS[n][1]}")'
+                       for n, v in variants.items()]
+            mime = mimetypes.guess_type(match.group(2))[0] or "image/png"
+            options.append(f'url("{match.group(2)}") type("{mime}")')
+            return f"{match.group(0)} background-image: image-set({', '.join(options)});"
+
+        def fingerprint_url(match):
+            quote, ref = match.groups()
+            hashed = self.manifest["assets"].get(resolve(ref)) if _is_local(ref) else None
+            if hashed is None:
+                return match.group(0)
+            return f"url({quote}{posixpath.relpath(hashed, base)}{quote})"
+
+        # Fingerprinted CSS lands in the same relative directory, so relative refs still line up.
+        return CSS_URL.sub(fingerprint_url, CSS_BACKGROUND.sub(add_image_set, text))
+
+    def build(self):
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        for path in self._sources():
+            rel = path.relative_to(self.assets_dir).as_posix()
+            data = path.read_bytes()
+            suffix = path.suffix.lower()
+            if suffix == ".css":
+                data = self._rewrite_css(rel, data.decode("utf-8")).encode("utf-8")
+            hashed = fingerprinted(rel, data)
+            self._write(hashed, data)
+            self.manifest["assets"][rel] = hashed
+            self.stats["files"] += 1
+            self.stats["source_bytes"] += len(data)
+            if suffix in COMPRESSIBLE:
+                packed = gzip.compress(data, compresslevel=9, mtime=0)
+                if len(packed) < len(data):
+                    self._write(hashed + ".gz", packed)
+                    self.stats["gzip"] += 1
+                if self.brotli is not None:
+                    packed = self.brotli.compress(data, quality=11)
+                    if len(packed) < len(data):
+                        self._write(hashed + ".br", packed)
+                        self.stats["brotli"] += 1
+            if suffix in RASTER and self.image_formats:
+                self._variants(rel, data)
+        tmp = self.out_dir / (MANIFEST_FILE + ".tmp")
+        tmp.write_text(json.dumps(self.manifest, indent=2, sort_keys=True), encoding="utf-8")
+        os.replace(tmp, self.out_dir / MANIFEST_FILE)
+        return self.manifest
+
+    def prune(self):
+        """Delete build outputs the current manifest doesn't reference."""
+        removed = 0
+        for path in self.out_dir.rglob("*"):
+            rel = path.relative_to(self.out_dir).as_posix()
+            if path.is_file() and rel != MANIFEST_FILE and rel not in self.written:
+                path.unlink()
+                removed += 1
+        return removed
+
+
+def load_manifest(assets_dir=ASSETS_DIR):
+    path = Path(assets_dir) / BUILD_DIR / MANIFEST_FILE
+    if not path.exists():
+        return {"assets": {}, "variants": {}}
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+# ------------------------------
+# FLASK HOOKS
+# ------------------------------
+def init_app(app):
+    from flask import request, send_from_directory, url_for
+    from werkzeug.security import safe_join
+
+    static_dir = app.static_folder
+    manifest = load_manifest(static_dir)
+    app.extensions["static_assets"] = manifest
+    build_prefix = BUILD_DIR + "/"
+
+    @app.url_defaults
+    def fingerprint_static(endpoint, values):
+        if endpoint == "static" and "filename" in values:
+            hashed = manifest["assets"].get(values["filename"])
+            if hashed is not None:
+                values["filename"] = build_prefix + hashed
+
+    def send_static(filename):
+        if not filename.startswith(build_prefix):
+            response = send_from_directory(static_dir, filename, max_age=STATIC_MAX_AGE)
+            response.cache_control.public = True
+            return response
+        # Content-addressed: the URL changes whenever the bytes do.
+        response = None
+        mimetype = mimetypes.guess_type(filename)[0]
+        for encoding, suffix in (("br", ".br"), ("gzip", ".gz")):
+            packed = safe_join(static_dir, filename + suffix)
+            if request.accept_encodings[encoding] and packed and os.path.isfile(packed):
+                response = send_from_directory(static_dir, filename + suffix, mimetype=mimetype,
+                                               max_age=IMMUTABLE_MAX_AGE)
+                response.headers["Content-Encoding"] = encoding
+                break
+        if response is None:
+            response = send_from_directory(static_dir, filename, max_age=IMMUTABLE_MAX_AGE)
+        if any(os.path.isfile(safe_join(static_dir, filename + s) or "") for s in (".br", ".gz")):
+            response.vary.add("Accept-Encoding")
+        response.cache_control.public = True
+        response.cache_control.immutable = True
+        return response
+
+    app.view_functions["static"] = send_static
+
+    def picture_sources(filename, sizes="100vw"):
+        """<source> tags for the built WebP/AVIF variants of an image (empty without a build)."""
+        tags = []
+        for name, variants in manifest["variants"].get(filename, {}).items():
+            srcset = ", ".join(f"{url_for('static', filename=build_prefix + path)} {width}w" for width, path in variants)
+            tags.append(f'<source type="{VARIANT_FORMATS[name][1]}" srcset="{escape(srcset)}" sizes="{escape(sizes)}">')
+        return Markup("\n".join(tags))
+
+    app.jinja_env.globals["picture_sources"] = picture_sources
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fingerprint, pre-compress and convert the frontend assets.")
+    parser.add_argument("--assets", type=Path, default=ASSETS_DIR)
+    parser.add_argument("--prune", action="store_true", help="delete outputs not in the new manifest")
+    parser.add_argument("--clean", action="store_true", help="remove the whole build directory first")
+    args = parser.parse_args(argv)
+
+    builder = Builder(args.assets)
+    if args.clean:
+        shutil.rmtree(builder.out_dir, ignore_errors=True)
+    builder.build()
+    stats = builder.stats
+    print(f"✅ {stats['files']} assets fingerprinted ({stats['source_bytes'] / 1024:.0f} KiB), "
+          f"{stats['gzip']} gzip, {stats['brotli']} brotli, {stats['variants']} image variants")
+    if args.prune:
+        print(f"🧹 Removed {builder.prune()} stale build files")
+    for skipped in stats["skipped"]:
+        print(f"⚠️  Skipped {skipped}")
+    print(f"📦 Manifest written to {builder.out_dir / MANIFEST_FILE}")
+
+
+if __name__ == "__main__":
+    main()
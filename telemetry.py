@@ -0,0 +1,139 @@
+"""
+Request timing for the Flask app, on top of the telemetry core shared with
+the FastAPI service (backend/telemetry_core.py: registry, spans, X-Profile
+captures and their settings).
+
+init_app(app) times every request per route and splits it into time spent in
+MySQL (cursors handed out by get_db_connection are wrapped in TimedCursor)
+and everything else ("python" time: templates, model inference, ...). The
+histograms are served as Prometheus text by GET /metrics, and each response
+carries a `Server-Timing` header with the same split plus any spans.
+
+    @span("model_inference")          # or: with span("model_inference"): ...
+    def recommend_for_students(...): ...
+
+    curl -H "X-Profile: cprofile" -H "X-Profile-Token: $PROFILE_TOKEN" .../recommend
+"""
+import importlib.util
+import sys
+import time
+from pathlib import Path
+
+
+def _load_core():
+    """
+    The core lives with the FastAPI service (which has to stay importable on
+    its own). Load it by path instead of putting backend/ on sys.path, and
+    register it under its own name so a process that also imports the
+    backend shares one registry.
+    """
+    module = sys.modules.get("telemetry_core")
+    if module is None:
+        path = Path(__file__).resolve().parent / "backend" / "telemetry_core.py"
+        spec = importlib.util.spec_from_file_location("telemetry_core", path)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules["telemetry_core"] = module
+        spec.loader.exec_module(module)
+    return module
+
+
+_core = _load_core()
+CONTENT_TYPE = _core.CONTENT_TYPE
+METRIC_HELP = _core.METRIC_HELP
+RequestStats = _core.RequestStats
+capture = _core.capture
+current = _core.current
+registry = _core.registry
+requested_profiler = _core.requested_profiler
+span = _core.span
+
+METRIC_HELP.update({
+    "recommend_candidates_total": (
+        "counter",
+        "Companies per recommended profile: catalog size, removed by each eligibility filter, and scored.",
+    ),
+    "recommend_profiles_total": ("counter", "Profiles that went through the eligibility filters."),
+})
+
+
+# ------------------------------
+# MYSQL TIME
+# ------------------------------
+class TimedCursor:
+    """Cursor proxy that books execute/fetch time to the current request."""
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def _timed(self, method, *args, query=False):
+        started = time.perf_counter()
+        try:
+            return method(*args)
+        finally:
+            stats = current.get()
+            if stats is not None:
+                stats.db_seconds += time.perf_counter() - started
+                stats.db_queries += query
+
+    def execute(self, *args):
+        return self._timed(self._cursor.execute, *args, query=True)
+
+    def executemany(self, *args):
+        return self._timed(self._cursor.executemany, *args, query=True)
+
+    def fetchone(self):
+        return self._timed(self._cursor.fetchone)
+
+    def fetchmany(self, *args):
+        return self._timed(self._cursor.fetchmany, *args)
+
+    def fetchall(self):
+        return self._timed(self._cursor.fetchall)
+
+
+# ------------------------------
+# FLASK HOOKS
+# ------------------------------
+def init_app(app):
+    from flask import g, request
+
+    def route():
+        # The rule template, never the raw path (ids would explode the series count).
+        return request.url_rule.rule if request.url_rule else "unmatched"
+
+    @app.before_request
+    def start_timing():
+        g.request_stats = stats = RequestStats(requested_profiler(request.headers))
+        current.set(stats)
+        if stats.profiler:
+            g.profile = capture(stats.profiler, route())
+            g.profile_written = g.profile.__enter__()
+
+    @app.after_request
+    def add_timing_headers(response):
+        stats = g.get("request_stats")
+        if stats is None:
+            return response
+        profile = g.pop("profile", None)
+        if profile is not None:
+            profile.__exit__(None, None, None)
+            if g.profile_written:
+                response.headers["X-Profile-File"] = g.profile_written[0]
+        response.headers["Server-Timing"] = stats.server_timing()
+        g.response_status = response.status_code
+        return response
+
+    @app.teardown_request
+    def finish_timing(exception):
+        # Runs after a streamed body is fully sent, so exports are timed in full.
+        stats = g.pop("request_stats", None)
+        profile = g.pop("profile", None)
+        if profile is not None:  # the view raised before after_request
+            profile.__exit__(None, None, None)
+        if stats is not None:
+            status = g.pop("response_status", 500)
+            stats.finish(request.method, route(), status)
+        current.set(None)
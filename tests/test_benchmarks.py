@@ -0,0 +1,20 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def test_suite_runs_every_benchmark(tmp_path):
+    """Recommend (imports model + telemetry) before matching/http (imports the backend `app` package)."""
+    out = tmp_path / "bench.json"
+    subprocess.run(
+        [sys.executable, "-m", "benchmarks.suite", "--scales", "200", "--repeat", "2",
+         "--max-train-pairs", "1000", "--only", "train", "recommend", "matching", "http", "--out", str(out)],
+        cwd=ROOT, check=True, capture_output=True, text=True, timeout=600,
+    )
+    results = json.loads(out.read_text())["results"]
+    names = {r["name"] for r in results}
+    assert {"recommend_single", "match_batch", "http_match"} <= names
+    assert all(r.get("skipped") or r["samples"] for r in results)
@@ -0,0 +1,93 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.preprocessing import LabelEncoder
+
+from recommender import compiled
+from recommender.compiled import (
+    COMPILED_FILE,
+    PARITY_ATOL,
+    TREE_MAX_ROWS,
+    AutoPredictor,
+    CompiledModel,
+    check_parity,
+    export,
+    load_compiled,
+    parity_inputs,
+    save_compiled,
+)
+from recommender.features import COMPANY_FEATURE_COLUMNS, FEATURE_COLUMNS
+from recommender.training import build_training_matrix, candidate_models, load_datasets
+
+MODEL_NAMES = list(candidate_models(n_jobs=1))
+
+
+@pytest.fixture(scope="module")
+def shipped():
+    students, companies = load_datasets()
+    le_dept = LabelEncoder().fit(students["department"])
+    X, y = build_training_matrix(students, companies, le_dept)
+    company_features = companies[COMPANY_FEATURE_COLUMNS].to_numpy(dtype=float)
+    return X, y, le_dept, company_features
+
+
+@pytest.fixture(scope="module", params=MODEL_NAMES)
+def fitted(request, shipped):
+    X, y, _, _ = shipped
+    return candidate_models(n_jobs=1)[request.param].fit(X, y)
+
+
+def _sklearn_positive(model, X):
+    return model.predict_proba(pd.DataFrame(X, columns=FEATURE_COLUMNS))[:, 1]
+
+
+def test_check_parity(fitted, shipped):
+    X, _, le_dept, company_features = shipped
+    model = CompiledModel(export(fitted))
+    for rows in (parity_inputs(le_dept, company_features), X.to_numpy(dtype=np.float64)):
+        report = check_parity(fitted, model, rows)
+        assert report["ok"], report
+        assert report["decision_mismatches"] == 0
+
+
+@pytest.mark.parametrize("rows", [1, TREE_MAX_ROWS, TREE_MAX_ROWS + 1, 5000])
+def test_predictions_match(fitted, shipped, rows):
+    _, _, le_dept, company_features = shipped
+    X = parity_inputs(le_dept, company_features, n=rows, seed=3)
+    expected = _sklearn_positive(fitted, X)
+    model = CompiledModel(export(fitted))
+    auto = AutoPredictor(model, lambda: fitted)
+
+    np.testing.assert_array_equal(model.predict(X), fitted.predict(pd.DataFrame(X, columns=FEATURE_COLUMNS)))
+    np.testing.assert_allclose(model.predict_positive(X), expected, rtol=0, atol=PARITY_ATOL)
+
+    got = auto.predict_positive(X)
+    if model.kind in ("forest", "boosted") and rows > TREE_MAX_ROWS:
+        np.testing.assert_array_equal(got, expected)  # handed to sklearn
+    else:
+        np.testing.assert_array_equal(got, model.predict_positive(X))
+    np.testing.assert_array_equal(got > 0.5, expected > 0.5)
+
+
+def test_save_compiled_round_trip(fitted, shipped, tmp_path):
+    _, _, le_dept, company_features = shipped
+    report = save_compiled(tmp_path, fitted, le_dept, company_features)
+    assert report["ok"]
+    model, classes = load_compiled(tmp_path)
+    X = parity_inputs(le_dept, company_features, n=500, seed=4)
+    np.testing.assert_allclose(model.predict_positive(X), _sklearn_positive(fitted, X), rtol=0, atol=PARITY_ATOL)
+    np.testing.assert_array_equal(classes.classes_, le_dept.classes_)
+
+
+def test_save_compiled_refuses_tampered_model(fitted, shipped, tmp_path, monkeypatch):
+    _, _, le_dept, company_features = shipped
+    arrays = export(fitted)
+    if arrays["kind"] == "linear":
+        arrays["intercept"] = np.float64(arrays["intercept"] + 0.5)
+    else:
+        arrays["value"] = arrays["value"][::-1].copy()
+    monkeypatch.setattr(compiled, "export", lambda model: arrays)
+
+    with pytest.raises(ValueError, match="disagrees with sklearn"):
+        save_compiled(tmp_path, fitted, le_dept, company_features)
+    assert not (tmp_path / COMPILED_FILE).exists()
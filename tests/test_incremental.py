@@ -0,0 +1,18 @@
+from sklearn.preprocessing import LabelEncoder
+
+from recommender.incremental import INCREMENTAL_EXTRA_TREES, fitted_trees, warm_start
+from recommender.training import build_training_matrix, candidate_models, load_datasets
+
+
+def test_warm_start_grows_from_the_fitted_trees():
+    students, companies = load_datasets()
+    le_dept = LabelEncoder().fit(students["department"])
+    X, y = build_training_matrix(students, companies, le_dept)
+    for name in ("Random Forest", "Gradient Boosting"):
+        model = candidate_models(n_jobs=1)[name].fit(X, y)
+        trees = fitted_trees(model)
+        assert trees <= model.n_estimators
+        updated = warm_start(model, X.to_numpy(), y)
+        assert fitted_trees(updated) <= trees + INCREMENTAL_EXTRA_TREES
+        assert updated.n_estimators == trees + INCREMENTAL_EXTRA_TREES
+        assert fitted_trees(model) == trees  # the serving model is left alone
@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+
+from recommender.labels import iter_label_blocks, label_matrix
+from recommender.training import build_training_frame, load_datasets, qualifies
+
+
+def _reference(students, companies):
+    return build_training_frame(students, companies).apply(qualifies, axis=1).to_numpy()
+
+
+def _assert_parity(students, companies):
+    labels = label_matrix(students, companies)
+    np.testing.assert_array_equal(labels.ravel(), _reference(students, companies))
+    blocks = np.vstack([block for _, _, block in iter_label_blocks(students, companies, chunk_size=3)])
+    np.testing.assert_array_equal(blocks, labels)
+
+
+def test_shipped_datasets():
+    _assert_parity(*load_datasets())
+
+
+EDGE_STUDENTS = pd.DataFrame({
+    "student_id": [f"S{i}" for i in range(8)],
+    "department": ["CSE"] * 8,
+    "cgpa": [7.5, 7.5, 7.49, 8.0, 9.0, 6.0, 7.5, 7.5],
+    "projects": [2, 2, 2, 1, 3, 0, 2, 2],
+    "skills": [
+        "python,sql",
+        " Python , SQL ",     # padded student tokens are not stripped
+        "python,sql",
+        "Python,SQL",
+        "",
+        np.nan,
+        "python,,sql",
+        "sql,python,python",
+    ],
+})
+EDGE_COMPANIES = pd.DataFrame({
+    "company": ["A", "B", "C", "D", "E", "F"],
+    "skills_required": ["python,sql", " PYTHON , sql ", "", "python", np.nan, "sql,sql"],
+    "min_cgpa": [7.5, 7.5, 0.0, 6.0, 0.0, 7.5],
+    "min_projects": [2, 2, 0, 0, 0, 2],
+})
+
+
+def test_edge_cases():
+    _assert_parity(EDGE_STUDENTS, EDGE_COMPANIES)
+
+
+def test_equal_thresholds_qualify():
+    labels = label_matrix(EDGE_STUDENTS.iloc[[0]], EDGE_COMPANIES.iloc[[0]])
+    assert labels.tolist() == [[1]]